@@ -0,0 +1,264 @@
+import numpy as np
+
+# Un arco tiene que reemplazar al menos estos segmentos de la polilínea para valer la pena
+MIN_SEGMENTOS_ARCO = 3
+# Un contorno entero se emite como círculo si tiene al menos estos vértices
+MIN_VERTICES_CIRCULO = 8
+
+
+def _centro_3p(a, b, c):
+    """Centro de la circunferencia que pasa por a, b y c; None si están (casi) alineados."""
+    ax, ay = a
+    bx, by = b
+    cx, cy = c
+    d = 2.0 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+    escala = max(abs(bx - ax), abs(by - ay), abs(cx - ax), abs(cy - ay), 1e-12)
+    if abs(d) < 1e-9 * escala * escala:
+        return None
+    a2, b2, c2 = ax * ax + ay * ay, bx * bx + by * by, cx * cx + cy * cy
+    return np.array([(a2 * (by - cy) + b2 * (cy - ay) + c2 * (ay - by)) / d,
+                     (a2 * (cx - bx) + b2 * (ax - cx) + c2 * (bx - ax)) / d])
+
+
+def _desviacion_maxima(puntos, centro, radio):
+    """Máxima distancia de la polilínea 'puntos' (vértices Y segmentos) a la circunferencia.
+
+    Hacia afuera el máximo está en un vértice; hacia adentro, en el punto de
+    cada segmento más cercano al centro (la flecha de la cuerda).
+    """
+    rel = puntos - centro
+    afuera = np.abs(np.hypot(rel[:, 0], rel[:, 1]) - radio).max()
+
+    seg = rel[1:] - rel[:-1]
+    largo2 = np.maximum((seg * seg).sum(axis=1), 1e-300)
+    t = np.clip(-(rel[:-1] * seg).sum(axis=1) / largo2, 0.0, 1.0)
+    cercano = rel[:-1] + t[:, None] * seg
+    adentro = (radio - np.hypot(cercano[:, 0], cercano[:, 1])).max()
+    return max(afuera, adentro)
+
+
+def _pasos_angulares(puntos, centro):
+    """Ángulo (con signo) que avanza cada segmento visto desde el centro."""
+    rel = puntos - centro
+    cruz = rel[:-1, 0] * rel[1:, 1] - rel[:-1, 1] * rel[1:, 0]
+    punto = (rel[:-1] * rel[1:]).sum(axis=1)
+    return np.arctan2(cruz, punto)
+
+
+def _arco(v, i, j, tolerancia, original=None, indices=None):
+    """Ángulo total del arco que cubre v[i..j] a menos de 'tolerancia', o None si no hay.
+
+    Con 'original' la desviación se mide contra los puntos del contorno sin
+    simplificar que hay entre v[i] y v[j] (indices[k] es la posición de v[k] en él).
+    """
+    centro = _centro_3p(v[i], v[(i + j) // 2], v[j])
+    if centro is None:
+        return None
+    tramo = v[i:j + 1]
+    pasos = _pasos_angulares(tramo, centro)
+    # Los vértices deben avanzar siempre en el mismo sentido y sin dar la vuelta completa
+    if not ((pasos > 0).all() or (pasos < 0).all()):
+        return None
+    total = pasos.sum()
+    if abs(total) >= 1.9 * np.pi:
+        return None
+    if original is not None:
+        tramo = original[np.arange(indices[i], indices[j] + 1) % len(original)]
+    if _desviacion_maxima(tramo, centro, np.hypot(*(v[i] - centro))) > tolerancia:
+        return None
+    return total
+
+
+def _arcos_minimos(v, tolerancia, solo_vertices=False):
+    """Para todo i a la vez: ¿v[i..i + MIN_SEGMENTOS_ARCO] cabe en un arco? (mismas pruebas que _arco).
+
+    Descarta de un golpe los vértices donde no empieza ningún arco, que en
+    contornos con rectas y esquinas son la mayoría. Con 'solo_vertices' no
+    se miden las cuerdas: cuando la prueba de verdad es contra el contorno
+    sin simplificar, una cuerda larga puede alejarse del arco más que él.
+    """
+    k = MIN_SEGMENTOS_ARCO
+    m = len(v) - k
+    a, b, c = v[:m], v[k // 2:m + k // 2], v[k:]
+    d = 2.0 * (a[:, 0] * (b[:, 1] - c[:, 1]) + b[:, 0] * (c[:, 1] - a[:, 1]) + c[:, 0] * (a[:, 1] - b[:, 1]))
+    escala = np.maximum(np.abs(np.concatenate([b - a, c - a], axis=1)).max(axis=1), 1e-12)
+    valido = np.abs(d) >= 1e-9 * escala * escala
+    d = np.where(valido, d, 1.0)
+    a2, b2, c2 = (a * a).sum(axis=1), (b * b).sum(axis=1), (c * c).sum(axis=1)
+    centro = np.stack([(a2 * (b[:, 1] - c[:, 1]) + b2 * (c[:, 1] - a[:, 1]) + c2 * (a[:, 1] - b[:, 1])) / d,
+                       (a2 * (c[:, 0] - b[:, 0]) + b2 * (a[:, 0] - c[:, 0]) + c2 * (b[:, 0] - a[:, 0])) / d], axis=1)
+    radio = np.hypot(*(a - centro).T)
+
+    positivos = np.ones(m, dtype=bool)
+    negativos = np.ones(m, dtype=bool)
+    desviacion = np.zeros(m)
+    for s in range(k):
+        p, q = v[s:m + s] - centro, v[s + 1:m + s + 1] - centro
+        cruz = p[:, 0] * q[:, 1] - p[:, 1] * q[:, 0]
+        positivos &= cruz > 0
+        negativos &= cruz < 0
+        if not solo_vertices:
+            seg = q - p
+            t = np.clip(-(p * seg).sum(axis=1) / np.maximum((seg * seg).sum(axis=1), 1e-300), 0.0, 1.0)
+            cercano = p + t[:, None] * seg
+            desviacion = np.maximum(desviacion, radio - np.hypot(*cercano.T))
+        desviacion = np.maximum(desviacion, np.abs(np.hypot(*q.T) - radio))
+    return valido & (positivos | negativos) & (desviacion <= tolerancia)
+
+
+def circulo_completo(puntos, tolerancia, original=None):
+    """(centro, radio) si el contorno cerrado entero es un círculo a menos de 'tolerancia'; si no, None.
+
+    Con 'original' (el contorno sin simplificar) el ajuste y la desviación se hacen sobre él.
+    """
+    v = np.asarray(puntos, dtype=np.float64).reshape(-1, 2)
+    if len(v) < MIN_VERTICES_CIRCULO:
+        return None
+    if original is not None:
+        v = np.asarray(original, dtype=np.float64).reshape(-1, 2)
+
+    # Ajuste algebraico (x² + y² + Dx + Ey + F = 0) por mínimos cuadrados
+    a = np.column_stack([v, np.ones(len(v))])
+    b = -(v * v).sum(axis=1)
+    (d, e, f), *_ = np.linalg.lstsq(a, b, rcond=None)
+    centro = np.array([-d / 2, -e / 2])
+    radio2 = centro @ centro - f
+    if radio2 <= 0:
+        return None
+    radio = float(np.sqrt(radio2))
+
+    cerrado = np.vstack([v, v[:1]])
+    pasos = _pasos_angulares(cerrado, centro)
+    if not ((pasos > 0).all() or (pasos < 0).all()):
+        return None
+    if _desviacion_maxima(cerrado, centro, radio) > tolerancia:
+        return None
+    return centro, radio
+
+
+def _indices_en(original, v):
+    """Posición de cada vértice de v en 'original' (approxPolyDP se queda con puntos del contorno).
+
+    Las posiciones crecen y dan a lo sumo una vuelta (pueden pasar de
+    len(original): se leen módulo ese largo). Un contorno de Canny pasa dos
+    veces por cada píxel de un trazo fino, así que se prueban todas las
+    apariciones del primer vértice. None si v no sale del contorno en orden.
+    """
+    n = len(original)
+    posiciones = {}
+    for k, punto in enumerate(map(tuple, original.tolist())):
+        posiciones.setdefault(punto, []).append(k)
+    apariciones = [posiciones.get(punto) for punto in map(tuple, v.tolist())]
+    if any(a is None for a in apariciones):
+        return None
+
+    for inicio in apariciones[0]:
+        indices, anterior = [0], 0
+        for candidatas in apariciones[1:]:
+            siguiente = min(((k - inicio) % n for k in candidatas if (k - inicio) % n > anterior), default=None)
+            if siguiente is None:
+                break
+            indices.append(siguiente)
+            anterior = siguiente
+        else:
+            return np.array(indices, dtype=np.int64) + inicio
+    return None
+
+
+def ajustar_arcos(puntos, tolerancia, original=None):
+    """Reemplaza tramos de un contorno cerrado por arcos: (vertices (M, 2), bulges (M,)).
+
+    bulges[k] es el del segmento vertices[k] -> vertices[k + 1] (el último cierra
+    el contorno): 0 para una recta, tan(ángulo/4) para un arco, positivo en sentido
+    antihorario en las coordenadas dadas (la convención de LWPOLYLINE en DXF).
+
+    Cada arco se verifica contra todos los vértices y segmentos que reemplaza:
+    la polilínea original queda a menos de 'tolerancia' del resultado. Si se
+    da 'original' (el contorno sin simplificar del que salió 'puntos'), los
+    arcos se verifican contra sus puntos y no contra las cuerdas de 'puntos':
+    así el simplificado puede usar su epsilon de siempre y los arcos solo
+    reemplazan vértices, nunca agregan. El tramo más largo desde cada vértice
+    se busca duplicando y luego bisecando, así que un contorno de n vértices
+    cuesta O(n log n).
+    """
+    v = np.asarray(puntos, dtype=np.float64).reshape(-1, 2)
+    n = len(v)
+    if n < MIN_SEGMENTOS_ARCO + 1:
+        return v, np.zeros(n)
+
+    indices = None
+    if original is not None:
+        original = np.asarray(original, dtype=np.float64).reshape(-1, 2)
+        indices = _indices_en(original, v)
+        if indices is None:
+            # No sale del contorno (no debería pasar): se queda como polilínea
+            return v, np.zeros(n)
+
+    # Empezamos en la esquina más marcada, para que ningún arco quede partido por el cierre
+    entrante = v - np.roll(v, 1, axis=0)
+    saliente = np.roll(v, -1, axis=0) - v
+    giro = np.abs(np.arctan2(entrante[:, 0] * saliente[:, 1] - entrante[:, 1] * saliente[:, 0],
+                             (entrante * saliente).sum(axis=1)))
+    inicio = int(np.argmax(giro))
+    v = np.vstack([v[inicio:], v[:inicio], v[inicio:inicio + 1]])  # Cerrado: v[n] == v[0]
+    if indices is not None:
+        vuelta = len(original)
+        indices = np.concatenate([indices[inicio:], indices[:inicio] + vuelta, indices[inicio:inicio + 1] + vuelta])
+
+    candidatos = _arcos_minimos(v, tolerancia, solo_vertices=original is not None).tolist()
+    referencia = {'original': original, 'indices': indices}
+
+    vertices, bulges = [], []
+    i = 0
+    while i < n:
+        j = i + MIN_SEGMENTOS_ARCO
+        total = _arco(v, i, j, tolerancia, **referencia) if j <= n and candidatos[i] else None
+        if total is None:
+            vertices.append(i)
+            bulges.append(0.0)
+            i += 1
+            continue
+
+        # Duplicar el tramo mientras siga siendo un arco...
+        bueno, malo, paso = j, None, MIN_SEGMENTOS_ARCO
+        while bueno < n:
+            paso *= 2
+            candidato = min(i + paso, n)
+            t = _arco(v, i, candidato, tolerancia, **referencia)
+            if t is None:
+                malo = candidato
+                break
+            bueno, total = candidato, t
+        # ...y bisecar entre el último que sirvió y el primero que no
+        while malo is not None and malo - bueno > 1:
+            medio = (bueno + malo) // 2
+            t = _arco(v, i, medio, tolerancia, **referencia)
+            if t is None:
+                malo = medio
+            else:
+                bueno, total = medio, t
+
+        vertices.append(i)
+        bulges.append(np.tan(total / 4.0))
+        i = bueno
+
+    return v[vertices], np.array(bulges)
+
+
+def ajustar_contorno(puntos, tolerancia, original=None):
+    """('circulo', centro, radio) si el contorno entero es un círculo; si no, ('polilinea', vertices, bulges).
+
+    Con 'original' los arcos y el círculo se miden contra el contorno sin simplificar (ver ajustar_arcos).
+    """
+    circulo = circulo_completo(puntos, tolerancia, original)
+    if circulo is not None:
+        return ('circulo', *circulo)
+    return ('polilinea', *ajustar_arcos(puntos, tolerancia, original))
+
+
+def arco_de_bulge(a, b, bulge):
+    """(radio, arco_grande, sentido_positivo) del arco de a a b con ese bulge (para SVG 'A')."""
+    cuerda = float(np.hypot(*(np.asarray(b) - np.asarray(a))))
+    angulo = 4.0 * np.arctan(abs(bulge))
+    radio = cuerda / (2.0 * np.sin(angulo / 2.0))
+    return radio, angulo > np.pi, bulge > 0
@@ -0,0 +1,116 @@
+import asyncio
+import io
+import os
+
+MOTORES_POR_DEFECTO = {'dxf': 'ezdxf', 'svg': 'svgwrite', 'stl': 'trimesh'}
+
+
+def convertir_en_memoria(datos, formatos=('dxf',), altura_mm=4.0, escala=0.1, motores=None, decimales=2):
+    """Imagen codificada -> {formato: bytes}, trazando UNA vez para todos los formatos pedidos.
+
+    Es síncrona y no toca el event loop: es lo que las variantes async mandan al executor
+    (y como es una función de módulo, también sirve con un ProcessPoolExecutor).
+    """
+    from trazado import Trazado
+
+    motores = {**MOTORES_POR_DEFECTO, **(motores or {})}
+
+    trazado = Trazado.desde_bytes(datos)
+    if trazado is None:
+        raise ValueError("No se pudo decodificar la imagen.")
+
+    salidas = {}
+    for formato in formatos:
+        # Cada exportador escribe directo en memoria: nada pasa por el disco
+        salida = io.BytesIO()
+        if formato == 'dxf':
+            from limpiodxf import dxf_desde_trazado
+            dxf_desde_trazado(trazado, salida, motor=motores['dxf'])
+        elif formato == 'svg':
+            from limpieza import svg_desde_trazado
+            svg_desde_trazado(trazado, salida, motor=motores['svg'], decimales=decimales)
+        elif formato == 'stl':
+            from stl import stl_desde_trazado
+            stl_desde_trazado(trazado, salida, altura_mm=altura_mm, escala=escala, motor=motores['stl'])
+        else:
+            raise ValueError(f"Formato no soportado: {formato}")
+
+        # Sin contornos válidos los exportadores no escriben nada
+        if salida.tell():
+            salidas[formato] = salida.getvalue()
+    return salidas
+
+
+async def _escribir(ruta, contenido):
+    def escribir():
+        with open(ruta, 'wb') as f:
+            f.write(contenido)
+    await asyncio.to_thread(escribir)
+
+
+async def leer_imagen(ruta):
+    """Lee los bytes de una imagen sin bloquear el event loop."""
+    def leer():
+        with open(ruta, 'rb') as f:
+            return f.read()
+    return await asyncio.to_thread(leer)
+
+
+async def convertir_async(datos, formatos=('dxf',), altura_mm=4.0, escala=0.1, motores=None,
+                          decimales=2, rutas=None, executor=None):
+    """Versión async de Trazado.exportar: decodifica, traza y exporta en 'executor'.
+
+    Devuelve {formato: bytes}. Si se pasa rutas={'dxf': 'x.dxf', ...}, además
+    escribe cada salida al disco en un hilo aparte. Con executor=None se usa el
+    pool de hilos del loop (OpenCV suelta el GIL en las etapas pesadas); para
+    mucho trabajo de shapely/trimesh conviene un ProcessPoolExecutor.
+    """
+    loop = asyncio.get_running_loop()
+    salidas = await loop.run_in_executor(
+        executor, convertir_en_memoria, datos, tuple(formatos), altura_mm, escala, motores, decimales)
+
+    if rutas:
+        await asyncio.gather(*(_escribir(rutas[f], contenido)
+                               for f, contenido in salidas.items() if rutas.get(f)))
+    return salidas
+
+
+async def dxf_async(datos, motor='ezdxf', ruta_salida_dxf=None, executor=None):
+    """Bytes del DXF limpio (misma lógica que generar_dxf_limpio), o None si no hay contornos."""
+    salidas = await convertir_async(datos, ('dxf',), motores={'dxf': motor},
+                                    rutas={'dxf': ruta_salida_dxf}, executor=executor)
+    return salidas.get('dxf')
+
+
+async def svg_async(datos, motor='svgwrite', decimales=2, ruta_salida_svg=None, executor=None):
+    """Bytes del SVG limpio (misma lógica que generar_svg_limpio), o None si no hay contornos."""
+    salidas = await convertir_async(datos, ('svg',), motores={'svg': motor}, decimales=decimales,
+                                    rutas={'svg': ruta_salida_svg}, executor=executor)
+    return salidas.get('svg')
+
+
+async def stl_async(datos, altura_mm=4.0, escala=0.1, motor='trimesh', ruta_salida_stl=None, executor=None):
+    """Bytes del STL extruido (misma lógica que generar_stl_extruido), o None si no hay formas."""
+    salidas = await convertir_async(datos, ('stl',), altura_mm=altura_mm, escala=escala,
+                                    motores={'stl': motor}, rutas={'stl': ruta_salida_stl},
+                                    executor=executor)
+    return salidas.get('stl')
+
+
+# --- Ejecución ---
+if __name__ == '__main__':
+    archivo_entrada = r'ChatGPT Image 11 dic 2025, 11_43_56.png'
+
+    async def demo():
+        datos = await leer_imagen(archivo_entrada)
+        # Las tres conversiones quedan en vuelo a la vez sobre el mismo loop
+        dxf, svg, stl = await asyncio.gather(
+            dxf_async(datos, ruta_salida_dxf='resultado_async.dxf'),
+            svg_async(datos, ruta_salida_svg='resultado_async.svg'),
+            stl_async(datos, escala=0.15, ruta_salida_stl='modelo_async.stl'))
+        print(f"¡Listo! DXF {len(dxf)} bytes, SVG {len(svg)} bytes, STL {len(stl)} bytes")
+
+    if os.path.exists(archivo_entrada):
+        asyncio.run(demo())
+    else:
+        print(f"Archivo no encontrado: {archivo_entrada}")
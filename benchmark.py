@@ -0,0 +1,815 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from transformacion import transformar_contornos
+
+try:
+    import resource  # Solo Unix; en Windows no se reporta la memoria pico
+except ImportError:
+    resource = None
+
+
+def _cronometrar(funcion, repeticiones):
+    """Mejor tiempo (s) de varias repeticiones: menos sensible al ruido del sistema."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def _contornos_aleatorios(n_contornos, puntos_por_contorno, semilla=0):
+    """Contornos con el mismo formato que devuelve cv2.findContours: (N, 1, 2) int32."""
+    rng = np.random.default_rng(semilla)
+    return [rng.integers(0, 8000, size=(puntos_por_contorno, 1, 2), dtype=np.int32)
+            for _ in range(n_contornos)]
+
+
+def bench_transformacion(n_contornos=2000, puntos_por_contorno=1000, escala=0.15, repeticiones=3):
+    """Compara la construcción punto a punto de tuplas contra transformar_contornos."""
+    contornos = _contornos_aleatorios(n_contornos, puntos_por_contorno)
+
+    def por_punto():
+        # Lo que hacían los exportadores: una tupla de Python por cada punto
+        return [[(pt[0][0] * escala, -pt[0][1] * escala) for pt in cnt] for cnt in contornos]
+
+    def vectorizado():
+        return transformar_contornos(contornos, escala=escala)
+
+    t_punto = _cronometrar(por_punto, repeticiones)
+    t_vector = _cronometrar(vectorizado, repeticiones)
+
+    return {
+        'bench': 'transformacion',
+        'puntos': n_contornos * puntos_por_contorno,
+        'por_punto_s': round(t_punto, 4),
+        'vectorizado_s': round(t_vector, 4),
+        'aceleracion': round(t_punto / t_vector, 1),
+    }
+
+
+def bench_escritores_dxf(n_contornos=5000, puntos_por_contorno=200, repeticiones=3):
+    """ezdxf contra EscritorDXF; relee el archivo directo con ezdxf y falla si no coincide o no pasa audit()."""
+    import ezdxf
+    from dxf_directo import EscritorDXF
+
+    polilineas = transformar_contornos(_contornos_aleatorios(n_contornos, puntos_por_contorno))
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta_ezdxf = os.path.join(carpeta, 'ezdxf.dxf')
+        ruta_directo = os.path.join(carpeta, 'directo.dxf')
+
+        def con_ezdxf():
+            doc = ezdxf.new('R2010')
+            msp = doc.modelspace()
+            for puntos in polilineas:
+                msp.add_lwpolyline(puntos.tolist(), close=True, dxfattribs={'layer': 'CORTE', 'color': 1})
+            doc.saveas(ruta_ezdxf)
+
+        def directo():
+            with EscritorDXF(ruta_directo) as dxf:
+                for puntos in polilineas:
+                    dxf.agregar_polilinea(puntos)
+
+        t_ezdxf = _cronometrar(con_ezdxf, repeticiones)
+        t_directo = _cronometrar(directo, repeticiones)
+
+        # Ida y vuelta: el archivo directo debe leerse con ezdxf, pasar la auditoría y dar los mismos puntos
+        doc = ezdxf.readfile(ruta_directo)
+        auditoria = doc.audit()
+        assert not auditoria.has_errors, f"audit() del DXF directo: {len(auditoria.errors)} errores"
+        leidas = doc.modelspace().query('LWPOLYLINE')
+        assert len(leidas) == len(polilineas), f"{len(leidas)} LWPOLYLINE leídas de {len(polilineas)}"
+        for e, puntos in zip(leidas, polilineas):
+            assert e.closed and np.array_equal(np.array(e.get_points('xy')), puntos), \
+                f"La polilínea {e.dxf.handle} no coincide al releerla"
+
+    return {
+        'bench': 'escritores_dxf',
+        'polilineas': n_contornos,
+        'ezdxf_s': round(t_ezdxf, 4),
+        'directo_s': round(t_directo, 4),
+        'aceleracion': round(t_ezdxf / t_directo, 1),
+    }
+
+
+def bench_jerarquia(anillos=250, repeticiones=3):
+    """Anidamiento profundo (anillos concéntricos): recorrido padre-activo contra resolver_par_impar.
+
+    El recorrido es el que hacía el editor al exportar, con un dict por
+    contorno; pierde las islas dentro de agujeros, así que también se
+    reportan los cuerpos que encuentra cada uno (lo correcto es uno por anillo).
+    """
+    import cv2
+    from metricas import _profundidades, agrupar_agujeros, resolver_par_impar
+
+    contornos, jerarquia = cv2.findContours(imagen_anillos(anillos), cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    jerarquia = jerarquia[0]
+
+    def padre_activo():
+        seleccionados = [{'activo': True, 'jerarquia': h} for h in jerarquia]
+        cuerpos = []
+        for item in seleccionados:
+            padre_idx = item['jerarquia'][3]
+            if padre_idx != -1 and seleccionados[padre_idx]['activo']:
+                continue  # Agujero de su padre (o isla perdida)
+            holes = []
+            child_idx = item['jerarquia'][2]
+            while child_idx != -1:
+                if seleccionados[child_idx]['activo']:
+                    holes.append(child_idx)
+                child_idx = seleccionados[child_idx]['jerarquia'][0]
+            cuerpos.append(holes)
+        return cuerpos
+
+    def par_impar():
+        return agrupar_agujeros(resolver_par_impar(jerarquia[:, 3], np.ones(len(jerarquia), dtype=bool)))
+
+    t_recorrido = _cronometrar(padre_activo, repeticiones)
+    t_par_impar = _cronometrar(par_impar, repeticiones)
+    cascarones, agujeros, _ = par_impar()
+
+    return {
+        'bench': 'jerarquia',
+        'anillos': anillos,
+        'contornos': len(contornos),
+        'profundidad_max': int(_profundidades(jerarquia[:, 3].astype(np.int64)).max()),
+        'padre_activo_s': round(t_recorrido, 4),
+        'padre_activo_cuerpos': len(padre_activo()),
+        'par_impar_s': round(t_par_impar, 4),
+        'par_impar_cuerpos': len(cascarones),
+        'par_impar_agujeros': len(agujeros),
+    }
+
+
+def bench_poligonos(piezas=20, agujeros_por_pieza=400, repeticiones=3):
+    """Paneles perforados: Polygon + is_valid + buffer(0) uno por uno contra geometria.poligonos_en_lote."""
+    from shapely.geometry import Polygon
+    from geometria import poligonos_en_lote
+
+    # Cada panel es un cuadrado con una grilla de agujeros octogonales (contornos como los de OpenCV)
+    lado_grilla = math.ceil(math.sqrt(agujeros_por_pieza))
+    angulos = np.linspace(0, 2 * np.pi, 8, endpoint=False)
+    octogono = np.stack([np.cos(angulos), np.sin(angulos)], axis=1) * 3.0
+    contornos, cascarones, agujeros, desde = [], [], [], []
+    for p in range(piezas):
+        x0 = p * (lado_grilla * 10 + 20)
+        desde.append(len(agujeros))
+        cascarones.append(len(contornos))
+        contornos.append(np.array([[x0, 0], [x0 + lado_grilla * 10 + 10, 0],
+                                   [x0 + lado_grilla * 10 + 10, lado_grilla * 10 + 10], [x0, lado_grilla * 10 + 10]],
+                                  dtype=np.float64))
+        for k in range(agujeros_por_pieza):
+            centro = (x0 + 10 + (k % lado_grilla) * 10, 10 + (k // lado_grilla) * 10)
+            agujeros.append(len(contornos))
+            contornos.append(octogono + centro)
+    hasta = desde[1:] + [len(agujeros)]
+
+    inicio = np.concatenate([[0], np.cumsum([len(c) for c in contornos])])
+    puntos = np.concatenate(contornos)
+    cascarones, agujeros = np.array(cascarones), np.array(agujeros)
+
+    def uno_por_uno():
+        poligonos = []
+        for k, shell in enumerate(cascarones.tolist()):
+            poly = Polygon(shell=contornos[shell], holes=[contornos[h] for h in agujeros[desde[k]:hasta[k]]])
+            if not poly.is_valid:
+                poly = poly.buffer(0)
+            poligonos.append(poly)
+        return poligonos
+
+    def en_lote():
+        return poligonos_en_lote(puntos, inicio, cascarones, agujeros, desde, hasta)[0]
+
+    t_uno = _cronometrar(uno_por_uno, repeticiones)
+    t_lote = _cronometrar(en_lote, repeticiones)
+    import shapely
+    iguales = all(shapely.equals_exact(a, b, 0) for a, b in zip(uno_por_uno(), en_lote()))
+
+    return {
+        'bench': 'poligonos',
+        'piezas': piezas,
+        'agujeros': len(agujeros),
+        'uno_por_uno_s': round(t_uno, 4),
+        'en_lote_s': round(t_lote, 4),
+        'aceleracion': round(t_uno / t_lote, 1),
+        'iguales': iguales,
+    }
+
+
+# Escaneo real incluido en el repositorio (dibujo con curvas y trazos a mano)
+IMAGEN_MUESTRA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ChatGPT Image 11 dic 2025, 11_29_31.png')
+
+
+def bench_arcos(ancho=2000, alto=2000, piezas=100, tolerancia=1.0, repeticiones=1, imagen=None):
+    """DXF Canny con y sin ajuste de arcos: vértices, tamaño, tiempo de escritura y de lectura con ezdxf.
+
+    Por defecto usa la placa sintética; 'imagen' mide un escaneo real (los
+    dibujos de muestra del repositorio), que es donde el ajuste tiene que
+    ganarle a la polilínea de siempre.
+    """
+    import cv2
+    import ezdxf
+    from dxf import imagen_a_dxf
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        if imagen:
+            entrada = imagen
+            alto, ancho = cv2.imread(imagen, cv2.IMREAD_GRAYSCALE).shape
+            resultado = {'bench': 'arcos', 'imagen': os.path.basename(imagen), 'resolucion': f'{ancho}x{alto}'}
+        else:
+            entrada = os.path.join(carpeta, 'entrada.png')
+            cv2.imwrite(entrada, imagen_sintetica(ancho, alto, piezas))
+            resultado = {'bench': 'arcos', 'resolucion': f'{ancho}x{alto}', 'piezas': piezas}
+        resultado['tolerancia'] = tolerancia
+
+        for nombre, tol in (('polilineas', None), ('arcos', tolerancia)):
+            salida = os.path.join(carpeta, f'{nombre}.dxf')
+            with contextlib.redirect_stdout(io.StringIO()):
+                t_escritura = _cronometrar(lambda: imagen_a_dxf(entrada, salida, motor='directo',
+                                                                tolerancia_arcos=tol), repeticiones)
+            documentos = []
+            t_lectura = _cronometrar(lambda: documentos.append(ezdxf.readfile(salida)), repeticiones)
+            msp = documentos[-1].modelspace()
+            resultado.update({
+                f'{nombre}_vertices': sum(len(e) for e in msp.query('LWPOLYLINE')) + len(msp.query('CIRCLE')),
+                f'{nombre}_circulos': len(msp.query('CIRCLE')),
+                f'{nombre}_kb': round(os.path.getsize(salida) / 1024, 1),
+                f'{nombre}_escritura_s': round(t_escritura, 4),
+                f'{nombre}_lectura_s': round(t_lectura, 4),
+            })
+
+    # Los arcos solo reemplazan vértices: nunca puede salir más que sin ellos
+    assert resultado['arcos_vertices'] <= resultado['polilineas_vertices'], resultado
+    return resultado
+
+
+def imagen_circulos(lado=2000, por_lado=8, semilla=0, supermuestreo=8):
+    """Discos negros antialiasados en grilla, con centro y radio exactos conocidos: (imagen gris, [(cx, cy, r)])."""
+    import cv2
+
+    rng = np.random.default_rng(semilla)
+    celda = lado / por_lado
+    grande = np.full((lado * supermuestreo, lado * supermuestreo), 255, dtype=np.uint8)
+    circulos = []
+    for i in range(por_lado):
+        for j in range(por_lado):
+            cx = (i + 0.5) * celda + rng.uniform(-0.1, 0.1) * celda
+            cy = (j + 0.5) * celda + rng.uniform(-0.1, 0.1) * celda
+            r = rng.uniform(0.15, 0.3) * celda
+            # shift=4: el círculo se dibuja con 1/16 de píxel de precisión en la imagen grande
+            cv2.circle(grande, (round(cx * supermuestreo * 16), round(cy * supermuestreo * 16)),
+                       round(r * supermuestreo * 16), 0, -1, cv2.LINE_8, shift=4)
+            # Centros de píxel en coordenadas enteras, en la imagen grande y en la final
+            circulos.append(((cx * supermuestreo + 0.5) / supermuestreo - 0.5,
+                             (cy * supermuestreo + 0.5) / supermuestreo - 0.5, r))
+    img = cv2.resize(grande, (lado, lado), interpolation=cv2.INTER_AREA)
+    return img, circulos
+
+
+def _png_circulos(ruta_png, lado):
+    import cv2
+    img, circulos = imagen_circulos(lado)
+    cv2.imwrite(ruta_png, img)
+    return circulos
+
+
+def _medir_subpixel(ruta_png, circulos, metodo, repeticiones):
+    """Traza los discos con un método y mide tiempo, memoria pico y error radial (en un proceso nuevo)."""
+    import cv2
+    from trazado import Trazado
+
+    def trazar():
+        if metodo == 'escalado_4x':
+            # El atajo de siempre: trazar la imagen 4 veces más grande y dividir las coordenadas
+            img = cv2.resize(cv2.imread(ruta_png, cv2.IMREAD_GRAYSCALE), None, fx=4, fy=4,
+                             interpolation=cv2.INTER_CUBIC)
+            trazado = Trazado(img, area_minima=50 * 16)
+            return [(c.reshape(-1, 2) + 0.5) / 4 - 0.5 for c in trazado.contornos_validos]
+        trazado = Trazado(cv2.imread(ruta_png, cv2.IMREAD_GRAYSCALE), subpixel=(metodo == 'subpixel'))
+        return [c.reshape(-1, 2) for c in trazado.contornos_validos]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        tiempo = _cronometrar(trazar, repeticiones)
+        contornos = trazar()
+
+    centros = np.array(circulos)
+    errores, vertices = [], 0
+    for c in contornos:
+        c = np.asarray(c, dtype=np.float64)
+        cx, cy, r = centros[np.argmin(np.hypot(*(centros[:, :2] - c.mean(axis=0)).T))]
+        errores.append(np.hypot(c[:, 0] - cx, c[:, 1] - cy) - r)
+        vertices += len(cv2.approxPolyDP(c.astype(np.float32), 0.001 * cv2.arcLength(c.astype(np.float32), True), True))
+    errores = np.abs(np.concatenate(errores))
+
+    return {
+        's': round(tiempo, 4),
+        'rss_pico_mb': _rss_pico_mb(),
+        'contornos': len(contornos),
+        'vertices_simplificados': vertices,
+        'error_medio_px': round(float(errores.mean()), 4),
+        'error_max_px': round(float(errores.max()), 4),
+    }
+
+
+def bench_subpixel(lado=2000, repeticiones=1):
+    """Precisión sub-píxel: trazado entero, Trazado(subpixel=True) y escalar 4x antes de trazar.
+
+    El error es la distancia de cada punto del contorno a la circunferencia
+    verdadera; cada método corre en un proceso nuevo para que el pico de
+    memoria sea el suyo.
+    """
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta_png = os.path.join(carpeta, 'discos.png')
+        # La imagen supermuestreada es grande: se dibuja en otro proceso para no inflar el pico de los demás
+        circulos = _en_proceso_nuevo(_png_circulos, ruta_png, lado)
+        resultado = {'bench': 'subpixel', 'lado': lado, 'discos': len(circulos)}
+        for metodo in ('entero', 'subpixel', 'escalado_4x'):
+            resultado[metodo] = _en_proceso_nuevo(_medir_subpixel, ruta_png, circulos, metodo, repeticiones)
+    return resultado
+
+
+def bench_capas(ancho=4000, alto=3000, piezas=200, capas=3, repeticiones=1):
+    """Un DXF multicapa en una pasada (capas.generar_por_capas) contra una corrida de generar_dxf_limpio por capa."""
+    import cv2
+    from capas import Banda, generar_por_capas
+    from limpiodxf import generar_dxf_limpio
+
+    # Piezas negras con marcas grises encima: cada banda agarra un nivel de gris
+    img = cv2.cvtColor(imagen_sintetica(ancho, alto, piezas), cv2.COLOR_BGR2GRAY)
+    rng = np.random.default_rng(0)
+    niveles = np.linspace(0, 200, capas).astype(int)
+    for nivel in niveles[1:]:
+        for x, y in rng.integers(0, [ancho - 60, alto - 30], size=(piezas, 2)).tolist():
+            cv2.rectangle(img, (x, y), (x + 60, y + 30), int(nivel), -1)
+    bandas = [Banda(f'CAPA{k}', k + 1, max(0, int(n) - 30), min(255, int(n) + 30)) for k, n in enumerate(niveles)]
+
+    with tempfile.TemporaryDirectory() as carpeta, contextlib.redirect_stdout(io.StringIO()):
+        entrada = os.path.join(carpeta, 'entrada.png')
+        cv2.imwrite(entrada, img)
+        t_separadas = _cronometrar(lambda: [generar_dxf_limpio(entrada, os.path.join(carpeta, f'{b.nombre}.dxf'),
+                                                               motor='directo') for b in bandas], repeticiones)
+        t_capas = _cronometrar(lambda: generar_por_capas(entrada, bandas, ruta_dxf=os.path.join(carpeta, 'capas.dxf'),
+                                                         motor_dxf='directo'), repeticiones)
+
+    return {
+        'bench': 'capas',
+        'resolucion': f'{ancho}x{alto}',
+        'capas': capas,
+        'corridas_separadas_s': round(t_separadas, 4),
+        'una_pasada_s': round(t_capas, 4),
+        'aceleracion': round(t_separadas / t_capas, 1),
+    }
+
+
+def video_cinta(ruta, cuadros=300, ancho=1280, alto=720, velocidad=6, semilla=0):
+    """Video sintético de una cinta: piezas oscuras que cruzan de izquierda a derecha, con tramos sin piezas."""
+    import cv2
+
+    rng = np.random.default_rng(semilla)
+    escritor = cv2.VideoWriter(ruta, cv2.VideoWriter_fourcc(*'MJPG'), 30, (ancho, alto))
+    # Piezas (x inicial, y, ancho, alto), separadas por huecos de cinta vacía
+    piezas, x = [], 0
+    while x > -velocidad * cuadros:
+        w, h = (int(v) for v in rng.integers(80, 220, size=2))
+        piezas.append((x - w, int(rng.integers(20, alto - h - 20)), w, h))
+        x -= w + int(rng.integers(100, 600))
+    for k in range(cuadros):
+        cuadro = np.full((alto, ancho, 3), 235, dtype=np.uint8)
+        for x0, y, w, h in piezas:
+            x1 = x0 + k * velocidad
+            if -w < x1 < ancho:
+                cv2.rectangle(cuadro, (x1, y), (x1 + w, y + h), (40, 40, 40), -1)
+                cv2.circle(cuadro, (x1 + w // 2, y + h // 2), min(w, h) // 5, (235, 235, 235), -1)
+        escritor.write(cuadro)
+    escritor.release()
+
+
+def bench_video(cuadros=300, ancho=1280, alto=720):
+    """Ritmo sostenido de video.trazar_video: sin reutilizar (trazar todo) contra reutilizando contornos."""
+    from video import trazar_video
+
+    resultado = {'bench': 'video', 'resolucion': f'{ancho}x{alto}', 'cuadros': cuadros}
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, 'cinta.avi')
+        video_cinta(ruta, cuadros, ancho, alto)
+        for nombre, umbral in (('todo', 0.0), ('reutilizando', 0.01)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                resumen = trazar_video(ruta, os.path.join(carpeta, nombre), ('dxf',), umbral_cambio=umbral)
+            resultado[f'{nombre}_fps'] = resumen['fps']
+            resultado[f'{nombre}_trazados'] = resumen['trazados']
+            resultado[f'{nombre}_exportados'] = resumen['exportados']
+    return resultado
+
+
+def bench_contenedor(ancho=4000, alto=4000, piezas=200, repeticiones=3):
+    """Entrada cruda con mmap contra PNG, y releer el trazado del contenedor .contornos contra retrazar o un .npz."""
+    import cv2
+    from contenedor import cargar_contornos, guardar_trazado
+    from entrada_salida import cargar_crudo
+    from trazado import Trazado
+
+    gris = cv2.cvtColor(imagen_sintetica(ancho, alto, piezas), cv2.COLOR_BGR2GRAY)
+    with tempfile.TemporaryDirectory() as carpeta, contextlib.redirect_stdout(io.StringIO()):
+        ruta_png, ruta_crudo = os.path.join(carpeta, 'e.png'), os.path.join(carpeta, 'e.raw')
+        ruta_contornos, ruta_npz = os.path.join(carpeta, 't.contornos'), os.path.join(carpeta, 't.npz')
+        cv2.imwrite(ruta_png, gris)
+        gris.tofile(ruta_crudo)
+
+        def trazar(fuente):
+            trazado = Trazado.desde_archivo(fuente)
+            return trazado, trazado.indices_validos
+
+        t_png = _cronometrar(lambda: trazar(ruta_png), repeticiones)
+        t_crudo = _cronometrar(lambda: trazar(cargar_crudo(ruta_crudo, (alto, ancho))), repeticiones)
+
+        trazado, _ = trazar(ruta_png)
+        guardar_trazado(ruta_contornos, trazado)
+        # El formato anterior de la caché: npz con puntos int32, offsets y jerarquía
+        inicio = np.concatenate([[0], np.cumsum([len(c) for c in trazado.contornos])])
+        np.savez(ruta_npz, puntos=np.concatenate([c.reshape(-1, 2) for c in trazado.contornos]),
+                 offsets=inicio, jerarquia=trazado.jerarquia)
+
+        def desde_npz():
+            with np.load(ruta_npz) as datos:
+                puntos, offsets, jerarquia = datos['puntos'], datos['offsets'], datos['jerarquia']
+            contornos = [puntos[a:b].reshape(-1, 1, 2) for a, b in zip(offsets[:-1], offsets[1:])]
+            return Trazado.desde_contornos(contornos, jerarquia, alto, ancho).indices_validos
+
+        t_npz = _cronometrar(desde_npz, repeticiones)
+        t_contenedor = _cronometrar(lambda: cargar_contornos(ruta_contornos).trazado().indices_validos,
+                                    repeticiones)
+        tamanos = {'png_kb': os.path.getsize(ruta_png), 'contornos_kb': os.path.getsize(ruta_contornos),
+                   'npz_kb': os.path.getsize(ruta_npz)}
+
+    return {
+        'bench': 'contenedor',
+        'resolucion': f'{ancho}x{alto}',
+        'contornos': len(trazado.contornos),
+        'trazar_desde_png_s': round(t_png, 4),
+        'trazar_desde_crudo_s': round(t_crudo, 4),
+        'releer_npz_s': round(t_npz, 4),
+        'releer_contenedor_s': round(t_contenedor, 4),
+        **{k: round(v / 1024, 1) for k, v in tamanos.items()},
+    }
+
+
+# Módulos que cada subcomando NO debe cargar (arranque en frío de trabajos sin servidor)
+PROHIBIDOS_POR_SUBCOMANDO = {
+    'dxf': ('trimesh', 'matplotlib', 'shapely'),
+    'svg': ('trimesh', 'matplotlib', 'shapely', 'ezdxf'),
+}
+
+
+def bench_arranque(subcomando='dxf', ancho=1000, alto=1000, piezas=20, repeticiones=3):
+    """Arranque en frío de 'python -m generador <subcomando>' y módulos pesados que llegó a importar.
+
+    'ok' es False si el subcomando importó alguno de PROHIBIDOS_POR_SUBCOMANDO.
+    """
+    import subprocess
+    import cv2
+
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    prohibidos = PROHIBIDOS_POR_SUBCOMANDO.get(subcomando, ())
+    sonda = ("import sys, json, runpy; sys.argv = ['generador'] + sys.argv[1:]\n"
+             "try:\n    runpy.run_module('generador', run_name='__main__')\n"
+             "except SystemExit:\n    pass\n"
+             f"print(json.dumps([m for m in {list(prohibidos)!r} if m in sys.modules]), file=sys.stderr)")
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        entrada = os.path.join(carpeta, 'entrada.png')
+        cv2.imwrite(entrada, imagen_sintetica(ancho, alto, piezas))
+        salida = os.path.join(carpeta, f'salida.{subcomando}')
+
+        mejor, importados = float('inf'), []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            proceso = subprocess.run([sys.executable, '-c', sonda, subcomando, entrada, salida],
+                                     cwd=directorio, capture_output=True, text=True, check=True)
+            mejor = min(mejor, time.perf_counter() - inicio)
+            importados = json.loads(proceso.stderr.strip().splitlines()[-1])
+
+    return {
+        'bench': 'arranque',
+        'subcomando': subcomando,
+        'segundos': round(mejor, 4),
+        'importados_prohibidos': importados,
+        'ok': not importados,
+    }
+
+
+# --- Imágenes sintéticas ---
+
+def imagen_sintetica(ancho=2000, alto=2000, piezas=100, agujeros_por_pieza=1.0, ruido=0.0, semilla=0):
+    """Placa de prueba: piezas oscuras sobre fondo blanco, como los dibujos que se escanean.
+
+    Las piezas (círculos, rectángulos, elipses y estrellas) se reparten en una
+    rejilla para que no se toquen. Cada una lleva en promedio 'agujeros_por_pieza'
+    agujeros (Poisson) y 'ruido' es la desviación del ruido gaussiano en niveles de gris.
+    """
+    import cv2
+
+    rng = np.random.default_rng(semilla)
+    img = np.full((alto, ancho), 255, dtype=np.uint8)
+
+    columnas = max(1, math.ceil(math.sqrt(piezas * ancho / alto)))
+    filas = max(1, math.ceil(piezas / columnas))
+    celda_x, celda_y = ancho / columnas, alto / filas
+
+    for n in range(piezas):
+        cx = int((n % columnas + 0.5) * celda_x)
+        cy = int((n // columnas + 0.5) * celda_y)
+        r = 0.4 * min(celda_x, celda_y) * rng.uniform(0.7, 1.0)
+        if r < 4:
+            continue
+
+        forma = n % 4
+        if forma == 0:
+            cv2.circle(img, (cx, cy), int(r), 0, -1, cv2.LINE_AA)
+        elif forma == 1:
+            lado = int(r / math.sqrt(2) * 1.3)
+            cv2.rectangle(img, (cx - lado, cy - lado), (cx + lado, cy + lado), 0, -1, cv2.LINE_AA)
+        elif forma == 2:
+            angulo = float(rng.uniform(0, 180))
+            cv2.ellipse(img, (cx, cy), (int(r), int(r * 0.7)), angulo, 0, 360, 0, -1, cv2.LINE_AA)
+        else:
+            puntas = int(rng.integers(5, 9))
+            t = np.linspace(0, 2 * np.pi, 2 * puntas, endpoint=False)
+            radios = np.where(np.arange(2 * puntas) % 2, r * 0.6, r)
+            estrella = np.stack([cx + radios * np.cos(t), cy + radios * np.sin(t)], axis=1)
+            cv2.fillPoly(img, [np.rint(estrella).astype(np.int32)], 0, cv2.LINE_AA)
+
+        # Agujeros en anillo alrededor del centro, sin tocarse entre ellos ni con el borde
+        k = int(rng.poisson(agujeros_por_pieza))
+        if k:
+            distancia = 0 if k == 1 else 0.35 * r
+            radio_hueco = 0.12 * r if k == 1 else min(0.12 * r, 0.8 * distancia * math.sin(math.pi / k))
+            for j in range(k):
+                a = 2 * math.pi * j / k
+                centro = (int(cx + distancia * math.cos(a)), int(cy + distancia * math.sin(a)))
+                if radio_hueco >= 2:
+                    cv2.circle(img, centro, int(radio_hueco), 255, -1, cv2.LINE_AA)
+
+    if ruido > 0:
+        ruidosa = img.astype(np.float32) + rng.normal(0, ruido, img.shape).astype(np.float32)
+        img = np.clip(ruidosa, 0, 255).astype(np.uint8)
+
+    return cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+
+
+def imagen_anillos(anillos=250, ancho_anillo=3, separacion=3):
+    """Máscara binaria de anillos concéntricos: 2 contornos por anillo, todos anidados en una sola cadena."""
+    import cv2
+
+    paso = ancho_anillo + separacion
+    lado = 2 * anillos * paso + 20
+    centro = (lado // 2, lado // 2)
+    img = np.zeros((lado, lado), dtype=np.uint8)
+    # Discos rellenos de afuera hacia adentro, alternando blanco (anillo) y negro (separación)
+    for k in range(anillos):
+        radio = lado // 2 - 10 - k * paso
+        cv2.circle(img, centro, radio, 255, -1)
+        cv2.circle(img, centro, radio - ancho_anillo, 0, -1)
+    return img
+
+
+def _rss_pico_mb():
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KiB, macOS en bytes
+    return round(pico / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def _png_sintetico(escenario):
+    import cv2
+    ok, png = cv2.imencode('.png', imagen_sintetica(**escenario))
+    return png.tobytes()
+
+
+def _medir_etapas(escenario, repeticiones, motor):
+    """Tiempo de cada etapa del Trazado compartido + cada exportador (se ejecuta en un proceso nuevo)."""
+    from trazado import Trazado
+    from limpiodxf import dxf_desde_trazado
+    from limpieza import svg_desde_trazado
+    from stl import stl_desde_trazado
+
+    png = _png_sintetico(escenario)
+    motores = {'dxf': 'ezdxf', 'svg': 'svgwrite', 'stl': 'trimesh'}
+    if motor == 'directo':
+        motores = dict.fromkeys(motores, 'directo')
+
+    tiempos, rss, conteos = {}, {}, {}
+
+    def etapa(nombre, funcion):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos[nombre] = min(tiempos.get(nombre, float('inf')), time.perf_counter() - inicio)
+        rss[nombre] = _rss_pico_mb()
+        return resultado
+
+    with tempfile.TemporaryDirectory() as carpeta, contextlib.redirect_stdout(io.StringIO()):
+        # Las etapas son cached_property: cada repetición necesita un Trazado nuevo
+        for _ in range(repeticiones):
+            trazado = etapa('decodificar', lambda: Trazado.desde_bytes(png))
+            etapa('preprocesar', lambda: trazado.binaria)
+            etapa('contornos', lambda: trazado._contornos_y_jerarquia)
+            etapa('filtrar', lambda: trazado.indices_validos)
+            etapa('simplificar', lambda: [trazado.aproximado(i, 0.001) for i in trazado.indices_validos])
+            etapa('exportar_dxf', lambda: dxf_desde_trazado(
+                trazado, os.path.join(carpeta, 'b.dxf'), motor=motores['dxf']))
+            etapa('exportar_svg', lambda: svg_desde_trazado(
+                trazado, os.path.join(carpeta, 'b.svg'), motor=motores['svg']))
+            etapa('exportar_stl', lambda: stl_desde_trazado(
+                trazado, os.path.join(carpeta, 'b.stl'), motor=motores['stl']))
+
+        conteos['contornos_brutos'] = len(trazado.contornos)
+        conteos['contornos_validos'] = len(trazado.indices_validos)
+        conteos['vertices_simplificados'] = sum(
+            len(trazado.aproximado(i, 0.001)) for i in trazado.indices_validos)
+        conteos['bytes_salida'] = {f: os.path.getsize(os.path.join(carpeta, f'b.{f}'))
+                                   for f in ('dxf', 'svg', 'stl')
+                                   if os.path.exists(os.path.join(carpeta, f'b.{f}'))}
+
+    return {
+        'etapas_s': {k: round(v, 4) for k, v in tiempos.items()},
+        'rss_tras_etapa_mb': rss,
+        'rss_pico_mb': _rss_pico_mb(),
+        **conteos,
+    }
+
+
+# Puntos de entrada públicos: (módulo, función, extensión de salida)
+PUNTOS_DE_ENTRADA = [
+    ('dxf', 'imagen_a_dxf', 'dxf'),
+    ('contornos_HC', 'contornos_alta_precision', 'svg'),
+    ('limpieza', 'generar_svg_limpio', 'svg'),
+    ('limpiodxf', 'generar_dxf_limpio', 'dxf'),
+    ('stl', 'generar_stl_extruido', 'stl'),
+]
+
+
+def _medir_punto_de_entrada(escenario, modulo, funcion, extension, repeticiones, motor):
+    """Conversión completa desde archivo, como la usa un script (se ejecuta en un proceso nuevo)."""
+    import importlib
+
+    convertir = getattr(importlib.import_module(modulo), funcion)
+    parametros = {'motor': 'directo'} if motor == 'directo' else {}
+
+    with tempfile.TemporaryDirectory() as carpeta, contextlib.redirect_stdout(io.StringIO()):
+        entrada = os.path.join(carpeta, 'entrada.png')
+        with open(entrada, 'wb') as f:
+            f.write(_png_sintetico(escenario))
+        salida = os.path.join(carpeta, f'salida.{extension}')
+
+        tiempo = _cronometrar(lambda: convertir(entrada, salida, **parametros), repeticiones)
+
+    return {'s': round(tiempo, 4), 'rss_pico_mb': _rss_pico_mb()}
+
+
+def _en_proceso_nuevo(funcion, *args):
+    # 'spawn': el pico de memoria de cada medición no arrastra el de las anteriores
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as pool:
+        return pool.submit(funcion, *args).result()
+
+
+def bench_imagen(ancho=2000, alto=2000, piezas=100, agujeros_por_pieza=1.0, ruido=0.0,
+                 repeticiones=1, motor='defecto', semilla=0):
+    """Un escenario sintético: etapas del Trazado y todos los puntos de entrada, con memoria pico."""
+    escenario = {'ancho': ancho, 'alto': alto, 'piezas': piezas,
+                 'agujeros_por_pieza': agujeros_por_pieza, 'ruido': ruido, 'semilla': semilla}
+
+    resultado = {'bench': 'imagen', **escenario, 'motor': motor, 'repeticiones': repeticiones}
+    resultado.update(_en_proceso_nuevo(_medir_etapas, escenario, repeticiones, motor))
+    resultado['puntos_de_entrada'] = {
+        f'{modulo}.{funcion}': _en_proceso_nuevo(_medir_punto_de_entrada, escenario, modulo,
+                                                 funcion, extension, repeticiones, motor)
+        for modulo, funcion, extension in PUNTOS_DE_ENTRADA
+    }
+    return resultado
+
+
+def _clave_escenario(r):
+    return tuple(r.get(k) for k in ('bench', 'ancho', 'alto', 'piezas', 'agujeros_por_pieza',
+                                    'ruido', 'motor', 'semilla'))
+
+
+def _tiempos_planos(r):
+    tiempos = {f'etapa.{k}': v for k, v in r.get('etapas_s', {}).items()}
+    tiempos.update({f'entrada.{k}': v['s'] for k, v in r.get('puntos_de_entrada', {}).items()})
+    return tiempos
+
+
+def comparar_resultados(base, actual, tolerancia=0.2, minimo_s=0.005):
+    """Regresiones: tiempos que crecieron más de 'tolerancia' (20%) respecto a la corrida base.
+
+    Se ignoran tiempos por debajo de 'minimo_s', donde el ruido del sistema manda.
+    """
+    por_escenario = {_clave_escenario(r): r for r in base if r.get('bench') == 'imagen'}
+    regresiones = []
+
+    for r in actual:
+        anterior = por_escenario.get(_clave_escenario(r))
+        if r.get('bench') != 'imagen' or anterior is None:
+            continue
+        t_antes = _tiempos_planos(anterior)
+        for nombre, t in _tiempos_planos(r).items():
+            antes = t_antes.get(nombre)
+            if antes is None or max(antes, t) < minimo_s:
+                continue
+            if t > antes * (1 + tolerancia):
+                regresiones.append({
+                    'escenario': dict(zip(('ancho', 'alto', 'piezas', 'agujeros_por_pieza', 'ruido'),
+                                          _clave_escenario(r)[1:6])),
+                    'medida': nombre, 'antes_s': antes, 'ahora_s': t,
+                    'cambio': round(t / antes - 1, 3) if antes else None,
+                })
+    return regresiones
+
+
+def _leer_jsonl(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return [json.loads(linea) for linea in f if linea.strip()]
+
+
+def _resolucion(texto):
+    ancho, alto = texto.lower().split('x')
+    return int(ancho), int(alto)
+
+
+# --- Ejecución ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks del generador DXF/SVG/STL (una línea JSON por medición)")
+    parser.add_argument('--suite', choices=['micro', 'imagenes', 'arranque', 'todo'], default='todo')
+    parser.add_argument('--contornos', type=int, default=2000)
+    parser.add_argument('--puntos', type=int, default=1000, help="Puntos por contorno")
+    parser.add_argument('--anillos', type=int, default=250, help="Anillos concéntricos del bench de jerarquía")
+    parser.add_argument('--resoluciones', type=_resolucion, nargs='+', default=[(1000, 1000), (4000, 3000)],
+                        help="Tamaños de imagen sintética, p.ej. 2000x2000")
+    parser.add_argument('--piezas', type=int, nargs='+', default=[20, 200])
+    parser.add_argument('--agujeros', type=float, nargs='+', default=[1.0], help="Agujeros promedio por pieza")
+    parser.add_argument('--ruido', type=float, nargs='+', default=[0.0, 12.0], help="Desviación del ruido gaussiano")
+    parser.add_argument('--motor', choices=['defecto', 'directo'], default='defecto')
+    parser.add_argument('--repeticiones', type=int, default=1)
+    parser.add_argument('--salida', help="Además de imprimir, guarda los resultados en este .jsonl")
+    parser.add_argument('--comparar', help="Corrida base (.jsonl) contra la que buscar regresiones")
+    parser.add_argument('--tolerancia', type=float, default=0.2, help="Crecimiento permitido (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    resultados = []
+
+    def reportar(resultado):
+        resultados.append(resultado)
+        print(json.dumps(resultado), flush=True)
+
+    if args.suite in ('micro', 'todo'):
+        reportar(bench_transformacion(args.contornos, args.puntos))
+        reportar(bench_escritores_dxf())
+        reportar(bench_jerarquia(args.anillos))
+        reportar(bench_poligonos())
+        reportar(bench_arcos())
+        for tolerancia in (0.5, 1.0, 2.0):
+            if os.path.exists(IMAGEN_MUESTRA):
+                reportar(bench_arcos(tolerancia=tolerancia, imagen=IMAGEN_MUESTRA))
+        reportar(bench_subpixel())
+        reportar(bench_capas())
+        reportar(bench_video())
+        reportar(bench_contenedor())
+
+    if args.suite in ('arranque', 'todo'):
+        for subcomando in PROHIBIDOS_POR_SUBCOMANDO:
+            reportar(bench_arranque(subcomando))
+
+    if args.suite in ('imagenes', 'todo'):
+        for (ancho, alto), piezas, agujeros, ruido in itertools.product(
+                args.resoluciones, args.piezas, args.agujeros, args.ruido):
+            reportar(bench_imagen(ancho, alto, piezas, agujeros, ruido,
+                                  repeticiones=args.repeticiones, motor=args.motor))
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(r) + '\n' for r in resultados)
+
+    arranque_roto = any(r.get('bench') == 'arranque' and not r['ok'] for r in resultados)
+
+    if args.comparar:
+        regresiones = comparar_resultados(_leer_jsonl(args.comparar), resultados, args.tolerancia)
+        for regresion in regresiones:
+            print(json.dumps({'regresion': regresion}), file=sys.stderr)
+        sys.exit(1 if regresiones or arranque_roto else 0)
+
+    sys.exit(1 if arranque_roto else 0)
@@ -0,0 +1,184 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+
+import contenedor
+from trazado import Trazado
+
+# Cambiar cuando cambie la lógica de trazado/exportación: invalida todo lo guardado
+VERSION_CACHE = 2
+
+
+def clave_cache(datos_imagen, **parametros):
+    """SHA-256 de los bytes de la imagen + TODOS los parámetros que afectan a la salida."""
+    h = hashlib.sha256()
+    h.update(datos_imagen)
+    h.update(json.dumps({'version': VERSION_CACHE, **parametros}, sort_keys=True).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _parametros_trazado(**parametros):
+    """Parámetros de Trazado con sus valores por defecto, para que también entren en la clave."""
+    firma = inspect.signature(Trazado.__init__)
+    valores = {nombre: p.default for nombre, p in firma.parameters.items()
+               if p.default is not inspect.Parameter.empty}
+    valores.update(parametros)
+    return {k: list(v) if isinstance(v, tuple) else v for k, v in valores.items()}
+
+
+class CacheResultados:
+    """Caché en disco direccionada por contenido, con límite de tamaño y expulsión LRU.
+
+    Guarda los contornos trazados (para no repetir blur/Otsu/findContours) y los
+    DXF/SVG/STL finales. El "último uso" de cada entrada es su mtime, que se
+    actualiza en cada acierto; al pasar el límite se borran las más viejas.
+    """
+
+    def __init__(self, directorio, limite_bytes=2 * 1024 ** 3):
+        self.directorio = directorio
+        self.limite_bytes = limite_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(directorio, exist_ok=True)
+        self._bytes_totales = sum(os.path.getsize(r) for r, _ in self._entradas())
+
+    def _ruta(self, clave, extension):
+        return os.path.join(self.directorio, clave[:2], f"{clave}.{extension}")
+
+    def _entradas(self):
+        for raiz, _, archivos in os.walk(self.directorio):
+            for nombre in archivos:
+                if not nombre.startswith('.'):
+                    ruta = os.path.join(raiz, nombre)
+                    yield ruta, os.path.getmtime(ruta)
+
+    def buscar(self, clave, extension):
+        """Ruta de la entrada si existe (cuenta acierto/fallo y la marca como recién usada)."""
+        ruta = self._ruta(clave, extension)
+        if os.path.exists(ruta):
+            os.utime(ruta)
+            self.aciertos += 1
+            return ruta
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave, extension, ruta_origen):
+        """Copia un archivo a la caché de forma atómica y aplica el límite de tamaño."""
+        destino = self._ruta(clave, extension)
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+
+        fd, temporal = tempfile.mkstemp(dir=os.path.dirname(destino), prefix='.')
+        os.close(fd)
+        shutil.copyfile(ruta_origen, temporal)
+        anterior = os.path.getsize(destino) if os.path.exists(destino) else 0
+        os.replace(temporal, destino)
+
+        self._bytes_totales += os.path.getsize(destino) - anterior
+        self._expulsar()
+        return destino
+
+    def _expulsar(self):
+        if self._bytes_totales <= self.limite_bytes:
+            return
+        # LRU: primero las que llevan más tiempo sin usarse
+        for ruta, _ in sorted(self._entradas(), key=lambda e: e[1]):
+            if self._bytes_totales <= self.limite_bytes:
+                break
+            self._bytes_totales -= os.path.getsize(ruta)
+            os.remove(ruta)
+
+    def estadisticas(self):
+        total = self.aciertos + self.fallos
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': round(self.aciertos / total, 3) if total else 0.0,
+            'bytes': self._bytes_totales,
+            'limite_bytes': self.limite_bytes,
+        }
+
+    # --- Contornos trazados ---
+
+    def cargar_trazado(self, clave, **parametros):
+        ruta = self.buscar(clave, 'contornos')
+        if ruta is None:
+            return None
+        # Contenedor binario con mmap: solo se leen las páginas que se usan
+        return contenedor.cargar_contornos(ruta).trazado(**parametros)
+
+    def guardar_trazado(self, clave, trazado):
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, 'trazado.contornos')
+            contenedor.guardar_trazado(ruta, trazado)
+            self.guardar(clave, 'contornos', ruta)
+
+    # --- Conversión completa ---
+
+    def convertir(self, ruta_imagen_entrada, ruta_dxf=None, ruta_svg=None, ruta_stl=None,
+                  altura_mm=4.0, escala=0.1, motor_dxf='ezdxf', motor_svg='svgwrite',
+                  motor_stl='trimesh', **parametros_trazado):
+        """Como Trazado.exportar, pero reutilizando contornos y salidas ya calculados.
+
+        Devuelve True solo si se obtuvieron TODAS las salidas pedidas. Cada
+        exportación se escribe primero a un temporal dentro de la caché, así
+        nunca se guarda un archivo que estaba en el destino de antes.
+        """
+        with open(ruta_imagen_entrada, 'rb') as f:
+            datos = f.read()
+
+        clave_trazo = clave_cache(datos, **_parametros_trazado(**parametros_trazado))
+
+        pedidos = {
+            'dxf': (ruta_dxf, {'motor': motor_dxf, 'factor_epsilon': 0.001}),
+            'svg': (ruta_svg, {'motor': motor_svg, 'factor_epsilon': 0.001}),
+            'stl': (ruta_stl, {'motor': motor_stl, 'factor_epsilon': 0.001,
+                               'altura_mm': altura_mm, 'escala': escala, 'area_shell': 500}),
+        }
+
+        trazado = None
+        completo = True
+        for formato, (destino, opciones) in pedidos.items():
+            if not destino:
+                continue
+
+            clave = clave_cache(clave_trazo.encode('ascii'), formato=formato, **opciones)
+            ruta = self.buscar(clave, formato)
+
+            if ruta is None:
+                if trazado is None:
+                    trazado = self.cargar_trazado(clave_trazo, **parametros_trazado)
+                if trazado is None:
+                    trazado = Trazado.desde_bytes(datos, **parametros_trazado)
+                    if trazado is None:
+                        return False
+                    self.guardar_trazado(clave_trazo, trazado)
+
+                if self._exportar(trazado, formato, clave, destino, altura_mm=altura_mm, escala=escala,
+                                  motor_dxf=motor_dxf, motor_svg=motor_svg, motor_stl=motor_stl):
+                    continue
+                completo = False
+            else:
+                print(f"Caché: {formato.upper()} reutilizado para {ruta_imagen_entrada}")
+                shutil.copyfile(ruta, destino)
+
+        return completo
+
+    def _exportar(self, trazado, formato, clave, destino, **opciones):
+        """Exporta a un temporal (que NO existe antes); si se escribió, lo guarda y lo lleva al destino."""
+        fd, temporal = tempfile.mkstemp(dir=self.directorio, prefix='.', suffix=f'.{formato}')
+        os.close(fd)
+        os.remove(temporal)
+        try:
+            trazado.exportar(**{f'ruta_{formato}': temporal}, **opciones)
+            if not os.path.exists(temporal):
+                # Sin contornos válidos el exportador no escribe nada
+                return False
+            self.guardar(clave, formato, temporal)
+            shutil.move(temporal, destino)
+            return True
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
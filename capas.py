@@ -0,0 +1,168 @@
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from trazado import Trazado
+from transformacion import transformar_contornos
+from dxf_directo import EscritorDXF
+from svg_directo import EscritorSVG
+from entrada_salida import cargar_imagen, abrir_salida, describir
+from instrumentacion import tramo, contar
+
+# Una capa de salida: los píxeles con gris (ya suavizado) entre 'minimo' y 'maximo', ambos incluidos
+Banda = namedtuple('Banda', ['nombre', 'color', 'minimo', 'maximo'])
+
+# Color ACI del DXF -> color del trazo en SVG
+COLORES_SVG = {1: 'red', 2: 'yellow', 3: 'green', 4: 'cyan', 5: 'blue', 6: 'magenta', 7: 'black'}
+
+
+def banda_desde_texto(texto):
+    """'GRABADO:5:100:180' -> Banda('GRABADO', 5, 100, 180) (formato de la línea de comandos)."""
+    nombre, color, minimo, maximo = texto.split(':')
+    return Banda(nombre, int(color), int(minimo), int(maximo))
+
+
+def validar_bandas(bandas):
+    """ValueError si no hay bandas o si dos comparten nombre (cada nombre es una capa del DXF / <g> del SVG)."""
+    if not bandas:
+        raise ValueError("Hace falta al menos una banda.")
+    vistos = set()
+    for banda in bandas:
+        if banda.nombre in vistos:
+            raise ValueError(f"Nombre de banda repetido: {banda.nombre!r} (cada banda es una capa aparte).")
+        vistos.add(banda.nombre)
+
+
+def _trazar(trazado):
+    # Cada hilo hace findContours + filtros + approxPolyDP de su capa (OpenCV suelta el GIL)
+    return [trazado.aproximado(i, 0.001) for i in trazado.indices_validos]
+
+
+def _mascara(blurred, banda, apertura):
+    mascara = cv2.inRange(blurred, banda.minimo, banda.maximo)
+    if apertura and banda.minimo > 0 and banda.maximo < 255:
+        # Una banda intermedia también atrapa la rampa del blur en cada borde negro/blanco:
+        # son anillos de 1-2 px que la apertura borra sin tocar las zonas de verdad
+        mascara = cv2.morphologyEx(mascara, cv2.MORPH_OPEN, np.ones((apertura, apertura), np.uint8))
+    return mascara
+
+
+def trazar_capas(img, bandas, kernel_blur=(7, 7), apertura=3, trabajadores=None, **parametros):
+    """Traza todas las bandas con UN solo gris + blur: [(banda, contornos aproximados)].
+
+    Cada máscara es un cv2.inRange sobre el mismo blur y se traza con un
+    Trazado propio (misma jerarquía, filtro de área y filtro 0.85 que el
+    modo normal), repartiendo las capas entre hilos. Las bandas intermedias
+    pasan antes por una apertura de 'apertura' px (0 = sin apertura).
+    """
+    validar_bandas(bandas)
+    with tramo('capas.blur', ancho=img.shape[1], alto=img.shape[0]):
+        gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        blurred = cv2.GaussianBlur(gray, kernel_blur, 0)
+
+    with tramo('capas.mascaras', capas=len(bandas)):
+        trazados = [Trazado.desde_binaria(_mascara(blurred, b, apertura), kernel_blur=kernel_blur, **parametros)
+                    for b in bandas]
+
+    trabajadores = trabajadores or min(len(bandas), os.cpu_count() or 1)
+    with tramo('capas.trazar', capas=len(bandas), trabajadores=trabajadores):
+        if trabajadores == 1:
+            aproximados = [_trazar(t) for t in trazados]
+        else:
+            with ThreadPoolExecutor(max_workers=trabajadores) as pool:
+                aproximados = list(pool.map(_trazar, trazados))
+
+    for banda, contornos in zip(bandas, aproximados):
+        contar(f'capas.{banda.nombre}.contornos', len(contornos))
+    return list(zip(bandas, aproximados))
+
+
+def dxf_por_capas(capas, ruta_salida_dxf, motor='ezdxf'):
+    """Un solo DXF con una capa (nombre y color) por banda."""
+    validar_bandas([banda for banda, _ in capas])
+    polilineas = [(banda, [p for p in transformar_contornos(aproximados, invertir_y=True) if len(p) > 2])
+                  for banda, aproximados in capas]
+
+    with tramo('capas.escribir_dxf', motor=motor):
+        if motor == 'directo':
+            primera = capas[0][0]
+            with EscritorDXF(ruta_salida_dxf, capa=primera.nombre, color=primera.color,
+                             capas={b.nombre: b.color for b, _ in capas}) as dxf:
+                for banda, puntos in polilineas:
+                    for puntos_dxf in puntos:
+                        dxf.agregar_polilinea(puntos_dxf, capa=banda.nombre, color=banda.color)
+        else:
+            import ezdxf
+            doc = ezdxf.new('R2010')
+            msp = doc.modelspace()
+            for banda, puntos in polilineas:
+                doc.layers.add(banda.nombre, color=banda.color)
+                for puntos_dxf in puntos:
+                    msp.add_lwpolyline(puntos_dxf.tolist(), close=True,
+                                       dxfattribs={'layer': banda.nombre, 'color': banda.color})
+            with abrir_salida(ruta_salida_dxf, texto=True, encoding=doc.output_encoding,
+                              errors='dxfreplace') as f:
+                doc.write(f)
+    print(f"¡Listo! DXF de {len(capas)} capas guardado en: {describir(ruta_salida_dxf)}")
+
+
+def svg_por_capas(capas, ruta_salida_svg, ancho, alto, motor='svgwrite', decimales=2):
+    """Un solo SVG con un <g> por banda (id = nombre de la capa, trazo = su color)."""
+    validar_bandas([banda for banda, _ in capas])
+    with tramo('capas.escribir_svg', motor=motor):
+        if motor == 'directo':
+            with EscritorSVG(ruta_salida_svg, ancho, alto, decimales=decimales) as svg:
+                for banda, aproximados in capas:
+                    svg.nuevo_grupo(COLORES_SVG.get(banda.color, 'black'), banda.nombre)
+                    for approx in aproximados:
+                        svg.agregar_contorno(approx)
+        else:
+            import svgwrite
+            from limpieza import datos_path_svg
+            dwg = svgwrite.Drawing(profile='full', size=(ancho, alto))
+            for banda, aproximados in capas:
+                grupo = dwg.g(id=banda.nombre, stroke=COLORES_SVG.get(banda.color, 'black'),
+                              stroke_width=1, fill="none")
+                for points in transformar_contornos(aproximados, invertir_y=False):
+                    if len(points) > 2:
+                        grupo.add(dwg.path(d=datos_path_svg(points)))
+                dwg.add(grupo)
+            with abrir_salida(ruta_salida_svg, texto=True) as f:
+                dwg.write(f)
+    print(f"¡Listo! SVG de {len(capas)} capas guardado en: {describir(ruta_salida_svg)}")
+
+
+def generar_por_capas(ruta_imagen_entrada, bandas, ruta_dxf=None, ruta_svg=None, motor_dxf='ezdxf',
+                      motor_svg='svgwrite', decimales=2, trabajadores=None):
+    """Lee la imagen una vez, traza todas las bandas y escribe el DXF y/o SVG multicapa."""
+    validar_bandas(bandas)
+    print(f"Trazando {len(bandas)} capas: {describir(ruta_imagen_entrada)}...")
+
+    with tramo('capas.decodificar'):
+        img = cargar_imagen(ruta_imagen_entrada)
+    if img is None:
+        print("Error: No se carga la imagen.")
+        return
+
+    capas = trazar_capas(img, bandas, trabajadores=trabajadores)
+    for banda, aproximados in capas:
+        print(f"  {banda.nombre} [{banda.minimo}-{banda.maximo}]: {len(aproximados)} contornos")
+
+    if ruta_dxf:
+        dxf_por_capas(capas, ruta_dxf, motor=motor_dxf)
+    if ruta_svg:
+        svg_por_capas(capas, ruta_svg, img.shape[1], img.shape[0], motor=motor_svg, decimales=decimales)
+
+
+# --- Ejecución ---
+if __name__ == '__main__':
+    archivo_entrada = r'ChatGPT Image 11 dic 2025, 11_29_31.png'
+    bandas = [Banda('CORTE', 1, 0, 90), Banda('GRABADO', 5, 91, 200)]
+
+    if os.path.exists(archivo_entrada):
+        generar_por_capas(archivo_entrada, bandas, ruta_dxf='resultado_capas.dxf', ruta_svg='resultado_capas.svg')
+    else:
+        print(f"Archivo no encontrado: {archivo_entrada}")
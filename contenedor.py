@@ -0,0 +1,118 @@
+import os
+import struct
+
+import numpy as np
+
+from entrada_salida import abrir_salida
+
+EXTENSION = '.contornos'
+_MAGICO = b'CONTORNO'
+_VERSION = 1
+# magico, versión, banderas, n_contornos, n_puntos, alto, ancho
+_CABECERA = struct.Struct('<8sIIqqqq')
+# Cada sección empieza alineada a esto, así las vistas sobre el mmap quedan alineadas
+_ALINEACION = 64
+_CON_JERARQUIA = 1
+
+
+def _alinear(n):
+    return -(-n // _ALINEACION) * _ALINEACION
+
+
+def _secciones(n_contornos, n_puntos, con_jerarquia):
+    """Desplazamiento y tamaño en bytes de cada arreglo dentro del archivo."""
+    secciones = {}
+    posicion = _alinear(_CABECERA.size)
+    for nombre, tam in (('puntos', n_puntos * 2 * 4), ('inicio', (n_contornos + 1) * 8),
+                        ('jerarquia', n_contornos * 4 * 4 if con_jerarquia else 0)):
+        secciones[nombre] = (posicion, tam)
+        posicion = _alinear(posicion + tam)
+    return secciones
+
+
+def guardar_contornos(destino, contornos, jerarquia, alto, ancho):
+    """Escribe los contornos en el contenedor binario (ruta o flujo binario).
+
+    Formato: cabecera fija y tres arreglos little-endian alineados a 64 bytes:
+    coordenadas float32 (N, 2) de TODOS los contornos seguidas, offsets int64
+    (el contorno i es puntos[inicio[i]:inicio[i + 1]]) y la jerarquía
+    RETR_TREE int32 (n, 4) tal como la da findContours.
+    """
+    n = len(contornos)
+    inicio = np.zeros(n + 1, dtype='<i8')
+    inicio[1:] = np.cumsum([len(c) for c in contornos])
+    puntos = (np.concatenate([np.asarray(c).reshape(-1, 2) for c in contornos]).astype('<f4')
+              if n else np.empty((0, 2), dtype='<f4'))
+    con_jerarquia = jerarquia is not None and n > 0
+    secciones = _secciones(n, int(inicio[-1]), con_jerarquia)
+
+    with abrir_salida(destino) as f:
+        f.write(_CABECERA.pack(_MAGICO, _VERSION, _CON_JERARQUIA if con_jerarquia else 0,
+                               n, int(inicio[-1]), int(alto), int(ancho)))
+        posicion = _CABECERA.size
+        for nombre, arreglo in (('puntos', puntos), ('inicio', inicio),
+                                ('jerarquia', np.asarray(jerarquia, dtype='<i4') if con_jerarquia else None)):
+            desde, tam = secciones[nombre]
+            f.write(b'\0' * (desde - posicion))
+            if tam:
+                f.write(np.ascontiguousarray(arreglo).data)
+            posicion = desde + tam
+
+
+def guardar_trazado(destino, trazado):
+    """Contenedor con los contornos y la jerarquía de un Trazado (sin filtrar: los filtros se rehacen al cargar)."""
+    guardar_contornos(destino, trazado.contornos, trazado.jerarquia, trazado.alto, trazado.ancho)
+
+
+class ContornosMapeados:
+    """Contornos leídos del contenedor: vistas sobre UN mmap, sin copiar ni parsear texto.
+
+    puntos (N, 2) float32, inicio (n + 1,) int64 y jerarquia (n, 4) int32 (o
+    None) son vistas de solo lectura del archivo; el sistema operativo trae
+    del disco solo las páginas que se tocan.
+    """
+
+    def __init__(self, buffer):
+        magico, version, banderas, n, n_puntos, self.alto, self.ancho = _CABECERA.unpack_from(buffer, 0)
+        if magico != _MAGICO:
+            raise ValueError("No es un contenedor de contornos.")
+        if version != _VERSION:
+            raise ValueError(f"Versión de contenedor no soportada: {version}")
+
+        secciones = _secciones(n, n_puntos, banderas & _CON_JERARQUIA)
+        vista = np.frombuffer(buffer, dtype=np.uint8) if not isinstance(buffer, np.ndarray) else buffer
+
+        def arreglo(nombre, dtype, forma):
+            desde, tam = secciones[nombre]
+            return vista[desde:desde + tam].view(dtype).reshape(forma)
+
+        self.puntos = arreglo('puntos', '<f4', (n_puntos, 2))
+        self.inicio = arreglo('inicio', '<i8', (n + 1,))
+        self.jerarquia = arreglo('jerarquia', '<i4', (n, 4)) if banderas & _CON_JERARQUIA else None
+
+    def __len__(self):
+        return len(self.inicio) - 1
+
+    def contorno(self, i):
+        """Contorno i como (N, 1, 2) float32, igual que los de findContours (vista, sin copia)."""
+        return self.puntos[self.inicio[i]:self.inicio[i + 1]].reshape(-1, 1, 2)
+
+    @property
+    def contornos(self):
+        return [self.contorno(i) for i in range(len(self))]
+
+    def trazado(self, **parametros):
+        """Trazado listo para exportar (filtros, aproximación, DXF/SVG/STL) sin volver a trazar."""
+        from trazado import Trazado
+        return Trazado.desde_contornos(self.contornos, self.jerarquia, self.alto, self.ancho, **parametros)
+
+
+def cargar_contornos(fuente):
+    """Abre un contenedor: una ruta se mapea en memoria (np.memmap); bytes/memoryview se usan tal cual."""
+    if isinstance(fuente, (str, os.PathLike)):
+        return ContornosMapeados(np.memmap(os.fspath(fuente), dtype=np.uint8, mode='r'))
+    return ContornosMapeados(fuente)
+
+
+def es_contenedor(fuente):
+    return isinstance(fuente, (str, os.PathLike)) and os.fspath(fuente).lower().endswith(EXTENSION)
@@ -3,68 +3,113 @@ import numpy as np
 import svgwrite
 import os
 
-def contornos_alta_precision(ruta_imagen_entrada, ruta_salida_svg):
-    print(f"Procesando con alta precisión: {ruta_imagen_entrada}...")
+from limpieza import datos_path_svg
+from svg_directo import EscritorSVG, datos_path_arcos
+from entrada_salida import cargar_imagen, abrir_salida, describir
+from metricas import IndiceContornos
+from instrumentacion import tramo, contar
+from arcos import ajustar_contorno
+
+def contornos_alta_precision(ruta_imagen_entrada, ruta_salida_svg, motor='svgwrite', decimales=2,
+                              tolerancia_arcos=None):
+    """tolerancia_arcos (px): si se da, los tramos redondos salen como arcos 'a' o <circle>."""
+    print(f"Procesando con alta precisión: {describir(ruta_imagen_entrada)}...")
     
-    img = cv2.imread(ruta_imagen_entrada)
+    with tramo('svg_canny.decodificar'):
+        img = cargar_imagen(ruta_imagen_entrada)
     if img is None:
         print("Error: No se encuentra la imagen.")
         return
 
     # 1. Escala de grises
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    with tramo('svg_canny.bordes'):
+        gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
-    # 2. Detección de bordes con Canny (El estándar para detalles finos)
-    # Ajusta estos dos números si ves mucho ruido o faltan líneas.
-    # 50, 150 es un rango estándar. Para imágenes claras, 100, 200 funciona bien.
-    edges = cv2.Canny(gray, 100, 200)
+        # 2. Detección de bordes con Canny (El estándar para detalles finos)
+        # Ajusta estos dos números si ves mucho ruido o faltan líneas.
+        # 50, 150 es un rango estándar. Para imágenes claras, 100, 200 funciona bien.
+        edges = cv2.Canny(gray, 100, 200)
 
     # 3. Encontrar contornos sobre los bordes detectados
     # RETR_CCOMP es bueno para obtener contornos internos y externos
     # CHAIN_APPROX_NONE guarda TODOS los puntos (sin comprimir), máxima fidelidad.
-    contours, hierarchy = cv2.findContours(edges, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_NONE)
+    with tramo('svg_canny.contornos'):
+        contours, hierarchy = cv2.findContours(edges, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_NONE)
 
     print(f"Detalles detectados: {len(contours)}")
+    contar('svg_canny.contornos_brutos', len(contours))
 
     # 4. Configurar SVG
     height, width = img.shape[:2]
-    dwg = svgwrite.Drawing(ruta_salida_svg, profile='full', size=(width, height))
 
-    # GRUPO IMPORTANTE:
-    # stroke='black': Dibuja la línea negra.
-    # stroke_width=1: Línea muy fina para precisión.
-    # fill='none': NO rellena, para que no se haga una mancha.
-    main_group = dwg.g(stroke="black", stroke_width=1, fill="none")
+    if motor == 'directo':
+        # Cada path va directo al disco en cuanto se aproxima: la memoria no
+        # crece con la cantidad de contornos (Canny + CHAIN_APPROX_NONE en 8K)
+        with tramo('svg_canny.simplificar_y_escribir', motor=motor), \
+                EscritorSVG(ruta_salida_svg, width, height, stroke="black", decimales=decimales) as svg:
+            for approx, original in _contornos_suavizados(contours):
+                if not tolerancia_arcos:
+                    svg.agregar_contorno(approx)
+                    continue
+                tipo, *datos = ajustar_contorno(approx.reshape(-1, 2), tolerancia_arcos, original.reshape(-1, 2))
+                if tipo == 'circulo':
+                    svg.agregar_circulo(*datos)
+                elif len(datos[0]) > 2 or datos[1].any():
+                    svg.agregar_arcos(*datos)
+        print(f"¡Listo! SVG de alta precisión guardado en: {describir(ruta_salida_svg)}")
+        return
+
+    with tramo('svg_canny.simplificar_y_escribir', motor=motor):
+        dwg = svgwrite.Drawing(profile='full', size=(width, height))
+
+        # GRUPO IMPORTANTE:
+        # stroke='black': Dibuja la línea negra.
+        # stroke_width=1: Línea muy fina para precisión.
+        # fill='none': NO rellena, para que no se haga una mancha.
+        main_group = dwg.g(stroke="black", stroke_width=1, fill="none")
+
+        for approx, original in _contornos_suavizados(contours):
+            # Coordenadas de imagen tal cual (SVG también tiene el eje Y hacia abajo)
+            points = approx.reshape(-1, 2)
+
+            if tolerancia_arcos:
+                tipo, *datos = ajustar_contorno(points, tolerancia_arcos, original.reshape(-1, 2))
+                if tipo == 'circulo':
+                    centro, radio = datos
+                    main_group.add(dwg.circle(center=(round(centro[0], 2), round(centro[1], 2)), r=round(radio, 2)))
+                elif len(datos[0]) > 2 or datos[1].any():
+                    main_group.add(dwg.path(d=datos_path_arcos(*datos)))
+            elif len(points) > 2:
+                main_group.add(dwg.path(d=datos_path_svg(points)))
+
+        dwg.add(main_group)
+        with abrir_salida(ruta_salida_svg, texto=True) as f:
+            dwg.write(f)
+    print(f"¡Listo! SVG de alta precisión guardado en: {describir(ruta_salida_svg)}")
+
+def _contornos_suavizados(contours):
+    """Genera (contorno suavizado, contorno original) uno a uno, sin acumularlos.
+
+    El original sirve para medir los arcos contra el trazo sin simplificar.
+    """
+    indice = IndiceContornos(contours)
 
-    for i, cnt in enumerate(contours):
-        # Filtro de ruido: eliminamos cosas microscópicas (menores a 10px de área)
-        if cv2.contourArea(cnt) < 10 and cv2.arcLength(cnt, True) < 15:
-            continue
+    # Filtro de ruido: eliminamos cosas microscópicas (menores a 10px de área)
+    ruido = (indice.area < 10) & (indice.perimetro < 15)
+    contar('svg_canny.descartados_ruido', int(ruido.sum()))
 
+    for i in np.flatnonzero(~ruido):
         # 5. Suavizado MÍNIMO (Para que no se vea pixelado pero respete la forma)
         # Un epsilon muy bajo (0.0005) mantiene la fidelidad casi al 100%
-        epsilon = 0.0005 * cv2.arcLength(cnt, True)
-        approx = cv2.approxPolyDP(cnt, epsilon, True)
-
-        points = [tuple(pt[0]) for pt in approx]
-        
-        if len(points) > 2:
-            path_data = ["M", f"{points[0][0]},{points[0][1]}"]
-            for p in points[1:]:
-                path_data.append(f"L {p[0]},{p[1]}")
-            path_data.append("Z")
-            
-            main_group.add(dwg.path(d=" ".join(path_data)))
-
-    dwg.add(main_group)
-    dwg.save()
-    print(f"¡Listo! SVG de alta precisión guardado en: {ruta_salida_svg}")
+        epsilon = 0.0005 * indice.perimetro[i]
+        yield cv2.approxPolyDP(contours[i], epsilon, True), contours[i]
 
 # --- Ejecución ---
-archivo_entrada = r'C:\Users\jaqueline.tinoco\Documents\generador de contornos\ChatGPT Image 11 dic 2025, 11_29_31.png'
-archivo_salida = 'resultado_fino_canny2.svg'
+if __name__ == '__main__':
+    archivo_entrada = r'C:\Users\jaqueline.tinoco\Documents\generador de contornos\ChatGPT Image 11 dic 2025, 11_29_31.png'
+    archivo_salida = 'resultado_fino_canny2.svg'
 
-if os.path.exists(archivo_entrada):
-    contornos_alta_precision(archivo_entrada, archivo_salida)
-else:
-    print(f"No encuentro el archivo: {archivo_entrada}")
\ No newline at end of file
+    if os.path.exists(archivo_entrada):
+        contornos_alta_precision(archivo_entrada, archivo_salida)
+    else:
+        print(f"No encuentro el archivo: {archivo_entrada}")
@@ -3,64 +3,117 @@ import ezdxf
 import numpy as np
 import os
 
-def imagen_a_dxf(ruta_imagen_entrada, ruta_salida_dxf):
-    print(f"Iniciando conversión a DXF: {ruta_imagen_entrada}...")
+from transformacion import transformar_contornos
+from dxf_directo import EscritorDXF
+from entrada_salida import cargar_imagen, abrir_salida, describir
+from metricas import IndiceContornos
+from instrumentacion import tramo, contar
+from arcos import ajustar_contorno
+
+def imagen_a_dxf(ruta_imagen_entrada, ruta_salida_dxf, motor='ezdxf', tolerancia_arcos=None):
+    """tolerancia_arcos (px): si se da, los tramos redondos salen como arcos (bulges) o CIRCLE,
+    sin alejarse más que eso del contorno trazado; las rectas quedan como sin arcos."""
+    print(f"Iniciando conversión a DXF: {describir(ruta_imagen_entrada)}...")
     
-    img = cv2.imread(ruta_imagen_entrada)
+    with tramo('dxf_canny.decodificar'):
+        img = cargar_imagen(ruta_imagen_entrada)
     if img is None:
         print("Error: No se encuentra la imagen.")
         return
 
     # 1. Procesamiento de imagen (Usando Canny para bordes finos)
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    
-    # Ajuste de Canny: 
-    # Umbrales 50-150 son un buen punto de partida para detectar bordes estructurales
-    edges = cv2.Canny(gray, 50, 150)
+    with tramo('dxf_canny.bordes'):
+        gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+        # Ajuste de Canny: 
+        # Umbrales 50-150 son un buen punto de partida para detectar bordes estructurales
+        edges = cv2.Canny(gray, 50, 150)
 
     # 2. Encontrar contornos
     # RETR_LIST: Obtiene todos los contornos sin jerarquía (más simple para DXF plano)
     # CHAIN_APPROX_NONE: Sin compresión, máxima fidelidad de puntos
-    contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_NONE)
+    with tramo('dxf_canny.contornos'):
+        contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_NONE)
 
     print(f"Entidades detectadas: {len(contours)}")
-
-    # 3. Configurar documento DXF (Versión R2010 es muy compatible)
-    doc = ezdxf.new('R2010')
-    msp = doc.modelspace() # Aquí es donde se "dibuja"
+    contar('dxf_canny.contornos_brutos', len(contours))
 
     # Convertir contornos a Polilíneas DXF
-    contador_entidades = 0
-    
-    for cnt in contours:
+    with tramo('dxf_canny.simplificar'):
+        indice = IndiceContornos(contours)
         # Filtro de ruido: ignorar motas de polvo (menores a 15px de longitud)
-        if cv2.arcLength(cnt, True) < 15:
-            continue
+        conservados = np.flatnonzero(indice.perimetro >= 15)
+        aproximados = []
+        for i in conservados:
+            # Suavizado ligero para que la máquina no "vibre" con miles de micropuntos
+            # epsilon bajo = alta precisión. 
+            epsilon = 0.0005 * indice.perimetro[i]
+            aproximados.append(cv2.approxPolyDP(contours[i], epsilon, True))
+    contar('dxf_canny.descartados_ruido', len(contours) - len(aproximados))
+
+    # Preparar puntos para ezdxf (todos los contornos en un solo arreglo)
+    # IMPORTANTE: Invertimos Y para que el dibujo no salga de cabeza
+    # debido a la diferencia de coordenadas entre Imágenes (Top-Left) y CAD (Bottom-Left)
+    polilineas = transformar_contornos(aproximados, invertir_y=True)
 
-        # Suavizado ligero para que la máquina no "vibre" con miles de micropuntos
-        # epsilon bajo = alta precisión. 
-        epsilon = 0.0005 * cv2.arcLength(cnt, True)
-        approx = cv2.approxPolyDP(cnt, epsilon, True)
+    # Ajuste de arcos ya en coordenadas CAD (el signo de los bulges depende del eje Y).
+    # Los arcos se miden contra el contorno SIN simplificar: solo reemplazan vértices
+    # de la polilínea de siempre, así que nunca salen más vértices que sin --arcos
+    if tolerancia_arcos:
+        with tramo('dxf_canny.arcos'):
+            originales = transformar_contornos([contours[i] for i in conservados], invertir_y=True)
+            curvas = [ajustar_contorno(p, tolerancia_arcos, original)
+                      for p, original in zip(polilineas, originales)]
+        vertices = sum(1 if c[0] == 'circulo' else len(c[1]) for c in curvas)
+        print(f"Arcos: {sum(len(p) for p in polilineas)} -> {vertices} vértices")
+        contar('dxf_canny.vertices_salida', vertices)
+    else:
+        curvas = [('polilinea', p, None) for p in polilineas]
 
-        # Preparar puntos para ezdxf
-        # IMPORTANTE: Invertimos Y (-pt[0][1]) para que el dibujo no salga de cabeza
-        # debido a la diferencia de coordenadas entre Imágenes (Top-Left) y CAD (Bottom-Left)
-        puntos_dxf = [(float(pt[0][0]), -float(pt[0][1])) for pt in approx]
+    if motor == 'directo':
+        # Streaming: las polilíneas van directo al archivo, sin objetos ezdxf
+        with tramo('dxf_canny.escribir', motor=motor), \
+                EscritorDXF(ruta_salida_dxf, capa='CORTE', color=1) as dxf:
+            for tipo, *datos in curvas:
+                if tipo == 'circulo':
+                    dxf.agregar_circulo(*datos)
+                else:
+                    dxf.agregar_polilinea(datos[0], bulges=datos[1])
+        print(f"¡Éxito! Se generaron {dxf.polilineas_escritas + dxf.circulos_escritos} entidades en: "
+              f"{describir(ruta_salida_dxf)}")
+        return
+
+    # 3. Configurar documento DXF (Versión R2010 es muy compatible)
+    with tramo('dxf_canny.escribir', motor=motor):
+        doc = ezdxf.new('R2010')
+        msp = doc.modelspace() # Aquí es donde se "dibuja"
 
-        # Añadir LWPOLYLINE (Lightweight Polyline)
-        # Es la entidad más eficiente para contornos 2D
-        msp.add_lwpolyline(puntos_dxf, close=True, dxfattribs={'layer': 'CORTE', 'color': 1})
-        contador_entidades += 1
+        contador_entidades = 0
+        for tipo, *datos in curvas:
+            if tipo == 'circulo':
+                msp.add_circle(datos[0].tolist(), datos[1], dxfattribs={'layer': 'CORTE', 'color': 1})
+            elif datos[1] is None:
+                # Añadir LWPOLYLINE (Lightweight Polyline)
+                # Es la entidad más eficiente para contornos 2D
+                msp.add_lwpolyline(datos[0].tolist(), close=True, dxfattribs={'layer': 'CORTE', 'color': 1})
+            else:
+                # Con arcos: cada vértice lleva el bulge del segmento que sale de él
+                msp.add_lwpolyline(np.column_stack(datos).tolist(), format='xyb', close=True,
+                                   dxfattribs={'layer': 'CORTE', 'color': 1})
+            contador_entidades += 1
 
-    # Guardar
-    doc.saveas(ruta_salida_dxf)
-    print(f"¡Éxito! Se generaron {contador_entidades} polilíneas en: {ruta_salida_dxf}")
+        # Guardar
+        with abrir_salida(ruta_salida_dxf, texto=True, encoding=doc.output_encoding,
+                          errors='dxfreplace') as f:
+            doc.write(f)
+    print(f"¡Éxito! Se generaron {contador_entidades} entidades en: {describir(ruta_salida_dxf)}")
 
 # --- Ejecución ---
-archivo_entrada = r'ChatGPT Image 11 dic 2025, 11_29_31.png'
-archivo_salida = 'diseño_corte2.dxf'
+if __name__ == '__main__':
+    archivo_entrada = r'ChatGPT Image 11 dic 2025, 11_29_31.png'
+    archivo_salida = 'diseño_corte2.dxf'
 
-if os.path.exists(archivo_entrada):
-    imagen_a_dxf(archivo_entrada, archivo_salida)
-else:
-    print(f"No encuentro el archivo: {archivo_entrada}")
\ No newline at end of file
+    if os.path.exists(archivo_entrada):
+        imagen_a_dxf(archivo_entrada, archivo_salida)
+    else:
+        print(f"No encuentro el archivo: {archivo_entrada}")
@@ -0,0 +1,124 @@
+import io
+import re
+from contextlib import ExitStack
+from functools import lru_cache
+
+import numpy as np
+
+from entrada_salida import abrir_salida, posicion_salida, descartar_salida
+
+# Las entidades que escribimos arrancan en un handle alto para no chocar nunca
+# con los de las tablas/objetos de la plantilla, y $HANDSEED queda por encima
+# de cualquier cantidad realista de polilíneas.
+_PRIMER_HANDLE = 0x10000
+_HANDSEED = 'FFFFFFFF'
+_RE_HANDSEED = re.compile(r'(  9\n\$HANDSEED\n  5\n)[0-9A-Fa-f]+\n')
+
+_INICIO_ENTITIES = '  0\nSECTION\n  2\nENTITIES\n'
+_FIN_ENTITIES = '  0\nENDSEC\n  0\nSECTION\n  2\nOBJECTS\n'
+
+
+@lru_cache(maxsize=8)
+def _plantilla_r2010(capas):
+    """Cabecera, tablas y objetos de un DXF R2010 vacío generados UNA vez con ezdxf.
+
+    Devuelve (prefijo, sufijo, handle_modelspace). Las entidades se escriben
+    entre ambos sin pasar por el modelo de objetos de ezdxf.
+    """
+    import ezdxf
+
+    doc = ezdxf.new('R2010')
+    for nombre, color in capas:
+        doc.layers.add(nombre, color=color)
+
+    texto = io.StringIO()
+    doc.write(texto)
+    texto = texto.getvalue()
+
+    inicio = texto.index(_INICIO_ENTITIES) + len(_INICIO_ENTITIES)
+    fin = texto.index(_FIN_ENTITIES)
+    prefijo, sufijo = texto[:inicio], texto[fin:]
+
+    # $HANDSEED debe quedar por encima de todos los handles que vamos a emitir
+    prefijo = _RE_HANDSEED.sub(lambda m: f"{m.group(1)}{_HANDSEED}\n", prefijo, count=1)
+
+    return prefijo, sufijo, doc.modelspace().layout_key
+
+
+class EscritorDXF:
+    """Escribe LWPOLYLINEs (y CIRCLEs) directo al disco dentro de una plantilla R2010 válida.
+
+    Pensado para salidas de CNC que son solo polilíneas en la capa CORTE: evita
+    crear un objeto ezdxf por contorno. Acepta ruta o flujo y se usa igual que EscritorSVG:
+
+        with EscritorDXF('salida.dxf') as dxf:
+            for puntos in contornos:
+                dxf.agregar_polilinea(puntos)
+    """
+
+    def __init__(self, ruta_salida_dxf, capa='CORTE', color=1, capas=None):
+        self.ruta_salida_dxf = ruta_salida_dxf
+        self.capa = capa
+        self.color = color
+        # Capas extra a declarar en la tabla LAYER: {nombre: color}
+        self.capas = dict(capas or {})
+        self.capas.setdefault(capa, color)
+        self.polilineas_escritas = 0
+        self.circulos_escritos = 0
+        self._archivo = None
+        self._siguiente_handle = _PRIMER_HANDLE
+        self._pila = None
+        self._inicio = None
+
+    def __enter__(self):
+        prefijo, self._sufijo, self._handle_msp = _plantilla_r2010(tuple(sorted(self.capas.items())))
+        self._pila = ExitStack()
+        self._inicio = posicion_salida(self.ruta_salida_dxf)
+        self._archivo = self._pila.enter_context(abrir_salida(self.ruta_salida_dxf, texto=True))
+        self._archivo.write(prefijo)
+        return self
+
+    def _cabecera(self, tipo, capa, color):
+        return (f"  0\n{tipo}\n  5\n{self._siguiente_handle:X}\n330\n{self._handle_msp}\n"
+                f"100\nAcDbEntity\n  8\n{capa or self.capa}\n 62\n{self.color if color is None else color}\n")
+
+    def agregar_polilinea(self, puntos, cerrada=True, capa=None, color=None, bulges=None):
+        """Escribe una LWPOLYLINE con los puntos (N, 2) ya en coordenadas CAD.
+
+        'bulges' (N,) convierte en arco el segmento que sale de cada vértice
+        (código 42, tan(ángulo/4)); los ceros no se escriben.
+        """
+        puntos = np.asarray(puntos, dtype=np.float64).reshape(-1, 2)
+        n = len(puntos)
+
+        cabecera = (self._cabecera('LWPOLYLINE', capa, color) +
+                    f"100\nAcDbPolyline\n 90\n{n}\n 70\n{1 if cerrada else 0}\n")
+        if bulges is None or not np.any(bulges):
+            vertices = (" 10\n%r\n 20\n%r\n" * n) % tuple(puntos.ravel().tolist())
+        else:
+            vertices = "".join(
+                f" 10\n{x!r}\n 20\n{y!r}\n" + (f" 42\n{b!r}\n" if b else "")
+                for (x, y), b in zip(puntos.tolist(), np.asarray(bulges, dtype=np.float64).tolist()))
+
+        self._archivo.write(cabecera)
+        self._archivo.write(vertices)
+        self._siguiente_handle += 1
+        self.polilineas_escritas += 1
+
+    def agregar_circulo(self, centro, radio, capa=None, color=None):
+        """Escribe un CIRCLE (centro ya en coordenadas CAD)."""
+        x, y = (float(c) for c in centro)
+        self._archivo.write(self._cabecera('CIRCLE', capa, color) +
+                            f"100\nAcDbCircle\n 10\n{x!r}\n 20\n{y!r}\n 30\n0.0\n 40\n{float(radio)!r}\n")
+        self._siguiente_handle += 1
+        self.circulos_escritos += 1
+
+    def __exit__(self, tipo_exc, exc, tb):
+        if tipo_exc is None:
+            self._archivo.write(self._sufijo)
+        self._pila.close()
+        self._archivo = self._pila = None
+        if tipo_exc is not None:
+            # Sin el sufijo el DXF igual se leería (y pasaría audit()): no debe quedar nada
+            descartar_salida(self.ruta_salida_dxf, self._inicio)
+
@@ -1,187 +1,366 @@
 import cv2
 import numpy as np
-import trimesh
-from shapely.geometry import Polygon
-import matplotlib.pyplot as plt
-from matplotlib.patches import Polygon as MplPolygon
 import os
 
-# Variable global para almacenar el estado de selección
-seleccionados = []
+from transformacion import transformar_contornos
+from metricas import IndiceContornos, agrupar_agujeros
+from entrada_salida import cargar_imagen, abrir_salida, describir
+from instrumentacion import tramo, contar
 
-def on_pick(event):
-    """Manejador de eventos de clic en los polígonos"""
-    artista = event.artist
-    indice = artista.get_label() # Usamos la etiqueta para guardar el índice
-    indice = int(indice)
-    
-    # Toggle (Alternar estado)
-    if seleccionados[indice]['activo']:
-        seleccionados[indice]['activo'] = False
-        artista.set_facecolor('gray')
-        artista.set_alpha(0.3)
-    else:
-        seleccionados[indice]['activo'] = True
-        artista.set_facecolor('#00ff00') # Verde brillante
-        artista.set_alpha(0.7)
-    
-    event.canvas.draw()
+COLOR_ACTIVO = (0.0, 1.0, 0.0, 0.7)    # Verde brillante
+COLOR_INACTIVO = (0.5, 0.5, 0.5, 0.3)  # Gris translúcido
+
+
+class SelectorContornos:
+    """Dibuja todos los contornos en UNA PolyCollection y resuelve los clics con un STRtree.
+
+    Con miles de contornos, un patch por contorno con picker=True obliga a
+    matplotlib a probar cada patch en cada clic y a redibujar todo el lienzo.
+    Aquí el clic consulta el árbol de bounding boxes, confirma con
+    cv2.pointPolygonTest solo los candidatos y se repinta con blitting solo el
+    rectángulo del contorno cambiado: se restaura ahí el fondo guardado y se
+    dibujan únicamente los polígonos que lo tocan.
+    """
+
+    def __init__(self, ax, poligonos, indices, areas, activos, al_alternar=None):
+        import shapely
+        from matplotlib.collections import PolyCollection
+
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.poligonos = poligonos                  # (N, 2) por contorno dibujado
+        self.indices = np.asarray(indices)          # Índice de contorno de cada polígono
+        self.areas = np.asarray(areas, dtype=np.float64)
+        self.activos = np.asarray(activos, dtype=bool)
+        self.al_alternar = al_alternar
+        self._fondo = None
+
+        with tramo('editor.coleccion', poligonos=len(poligonos)):
+            self.coleccion = PolyCollection(poligonos, closed=True, edgecolors='black',
+                                            linewidths=0.5, animated=True, snap=False)
+            self._pintar()
+            ax.add_collection(self.coleccion)
+
+        # Índice espacial de las bounding boxes de los contornos
+        with tramo('editor.indice_espacial', poligonos=len(poligonos)):
+            self._minimos = np.array([p.min(axis=0) for p in poligonos]).reshape(-1, 2)
+            self._maximos = np.array([p.max(axis=0) for p in poligonos]).reshape(-1, 2)
+            self._arbol = shapely.STRtree(shapely.box(self._minimos[:, 0], self._minimos[:, 1],
+                                                      self._maximos[:, 0], self._maximos[:, 1]))
+            self._contornos_cv = [p.reshape(-1, 1, 2).astype(np.float32) for p in poligonos]
+
+        self.canvas.mpl_connect('draw_event', self._al_dibujar)
+        self.canvas.mpl_connect('button_press_event', self._al_clic)
+
+    def _colores(self, posiciones=slice(None)):
+        return np.where(self.activos[posiciones, None], COLOR_ACTIVO, COLOR_INACTIVO)
+
+    def _pintar(self):
+        self.coleccion.set_facecolors(self._colores())
+
+    def contorno_en(self, x, y):
+        """Posición (en la colección) del contorno más pequeño que contiene (x, y), o None."""
+        import shapely
+
+        with tramo('editor.clic'):
+            candidatos = self._arbol.query(shapely.Point(x, y))
+            dentro = [k for k in candidatos
+                      if cv2.pointPolygonTest(self._contornos_cv[k], (float(x), float(y)), False) >= 0]
+        contar('editor.candidatos_clic', len(candidatos))
+        if not dentro:
+            return None
+        # Un clic dentro de un agujero toca también a su cascarón: gana el más interno
+        return min(dentro, key=lambda k: self.areas[k])
+
+    def alternar(self, k):
+        self.activos[k] = not self.activos[k]
+        self._pintar()
+        if self.al_alternar is not None:
+            self.al_alternar(int(self.indices[k]), bool(self.activos[k]))
+        self._repintar(k)
+
+    def _al_dibujar(self, event):
+        # Tras un redibujado completo (abrir, zoom, pan) guardamos el fondo sin la colección
+        self._fondo = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.ax.draw_artist(self.coleccion)
+
+    def _repintar(self, k):
+        if self._fondo is None:
+            self.canvas.draw_idle()
+            return
+        from matplotlib.collections import PolyCollection
+        from matplotlib.transforms import Bbox
+        import shapely
+
+        # Rectángulo (en píxeles) del contorno cambiado, con margen para el borde
+        esquinas = self.ax.transData.transform([self._minimos[k], self._maximos[k]])
+        x0, y0 = np.floor(esquinas.min(axis=0)) - 2
+        x1, y1 = np.ceil(esquinas.max(axis=0)) + 2
+        region = Bbox.intersection(Bbox([[x0, y0], [x1, y1]]), self.ax.bbox)
+        if region is None:
+            return
+
+        # Los polígonos que tocan ese rectángulo (el trazo de un vecino puede asomar un par de
+        # píxeles más allá de su bounding box), en el mismo orden de dibujo que la colección
+        margen = region.get_points() + [[-2, -2], [2, 2]]
+        zona = shapely.box(*self.ax.transData.inverted().transform(margen).ravel())
+        vecinos = np.sort(self._arbol.query(zona))
+        contar('editor.poligonos_repintados', len(vecinos))
+        parche = PolyCollection([self.poligonos[v] for v in vecinos], closed=True,
+                                facecolors=self._colores(vecinos), edgecolors='black',
+                                linewidths=0.5, transform=self.ax.transData, snap=False)
+        parche.set_figure(self.ax.figure)
+        # Recorte: el rectángulo sin salirse del marco de los ejes (igual que la colección).
+        # restore_region incluye la última columna y la fila inferior, así que se agranda
+        # un píxel hacia esos lados para repintarlas también
+        rx0, ry0, rx1, ry1 = region.extents
+        parche.set_clip_box(Bbox.intersection(Bbox([[rx0, ry0 - 1], [rx1 + 1, ry1]]), self.ax.bbox))
+
+        # restore_region trabaja con el origen arriba a la izquierda (filas del buffer)
+        alto = self.canvas.figure.bbox.height
+        self.canvas.restore_region(self._fondo, bbox=(rx0, alto - ry1, rx1, alto - ry0),
+                                   xy=(self._fondo.get_extents()[0], self._fondo.get_extents()[1]))
+        with tramo('editor.repintar', poligonos=len(vecinos)):
+            self.ax.draw_artist(parche)
+            self.canvas.blit(region)
+
+    def _al_clic(self, event):
+        barra = getattr(self.canvas, 'toolbar', None)
+        if event.inaxes is not self.ax or event.button != 1 or (barra is not None and barra.mode):
+            return  # Fuera de los ejes, otro botón o modo zoom/pan activo
+        k = self.contorno_en(event.xdata, event.ydata)
+        if k is not None:
+            self.alternar(k)
+
+class CacheExtrusion:
+    """Estado del editor en arreglos y mallas extruidas por cuerpo.
+
+    Las coordenadas (ya escaladas para el STL) de todos los contornos van en
+    un solo arreglo 'puntos', y las del contorno i son puntos[inicio[i]:inicio[i + 1]].
+    'activo' es la selección. Qué es cascarón y qué agujero lo decide la
+    regla par-impar sobre los activos (metricas.resolver_par_impar), que se
+    resuelve entera en cada cambio; solo se vuelven a extruir los cuerpos
+    cuyo cascarón o agujeros cambiaron. 'piezas[i]' guarda las piezas
+    (vertices, faces) del cuerpo cuyo cascarón es el contorno i.
+    """
+
+    def __init__(self, puntos, inicio, indice, activo, altura_mm):
+        self.puntos = puntos
+        self.inicio = inicio
+        self.indice = indice
+        self.activo = np.asarray(activo, dtype=bool)
+        self.altura_mm = altura_mm
+        self.cuerpo = np.full(len(activo), -1, dtype=np.int64)
+        self.piezas = {}
+
+    def _extruir(self, cascarones, agujeros, desde, hasta, trabajadores=1):
+        """Cascarón cascarones[k] con agujeros[desde[k]:hasta[k]]: polígonos en lote y extrusión."""
+        from extrusion import extruir_agrupadas
+        from geometria import poligonos_en_lote
+
+        with tramo('editor.construir_poligonos', piezas=len(cascarones)):
+            poligonos, reparados = poligonos_en_lote(self.puntos, self.inicio, cascarones, agujeros, desde, hasta)
+        if reparados:
+            contar('editor.reparaciones_buffer0', reparados)
+        validos = [(i, poly) for i, poly in zip(cascarones.tolist(), poligonos) if poly is not None]
+        # Un clic re-extruye pocos cuerpos: en el mismo proceso
+        with tramo('editor.extruir', poligonos=len(validos)):
+            grupos = extruir_agrupadas([poly for _, poly in validos], self.altura_mm, trabajadores)
+        contar('editor.cuerpos_extruidos', len(validos))
+        for (i, _), piezas in zip(validos, grupos):
+            if piezas:
+                self.piezas[i] = piezas
+
+    def construir(self):
+        """Extrusión inicial de todos los cuerpos, repartida entre procesos (el editor es el punto de entrada)."""
+        self.cuerpo = self.indice.cuerpos(self.activo)
+        self.piezas = {}
+        cascarones, agujeros, inicio = agrupar_agujeros(self.cuerpo)
+        self._extruir(cascarones, agujeros, inicio[:-1], inicio[1:], trabajadores=None)
 
-def editor_y_extrusion(ruta_imagen_entrada, ruta_salida_stl, altura_mm=4.0, escala=0.15):
-    global seleccionados
-    print(f"Cargando editor para: {ruta_imagen_entrada}...")
+    def alternar(self, i, activo):
+        """Cambia la selección del contorno i y vuelve a extruir solo los cuerpos afectados.
+
+        Devuelve los índices de los cascarones tocados.
+        """
+        self.activo[i] = activo
+        anterior, self.cuerpo = self.cuerpo, self.indice.cuerpos(self.activo)
+
+        # Un cuerpo cambia si alguno de sus contornos entró, salió o cambió de cuerpo
+        cambiados = np.flatnonzero(anterior != self.cuerpo)
+        afectados = np.union1d(anterior[cambiados], self.cuerpo[cambiados])
+        afectados = afectados[afectados != -1]
+        for j in afectados.tolist():
+            self.piezas.pop(j, None)
+
+        cascarones, agujeros, inicio = agrupar_agujeros(self.cuerpo)
+        k = np.flatnonzero(np.isin(cascarones, afectados))
+        self._extruir(cascarones[k], agujeros, inicio[k], inicio[k + 1])
+        return afectados
+
+    def malla(self):
+        """Malla final con las piezas cacheadas, en el orden de los contornos; None si no hay ninguna."""
+        from extrusion import ensamblar_malla
+
+        piezas = [pieza for i in sorted(self.piezas) for pieza in self.piezas[i]]
+        if not piezas:
+            return None
+        with tramo('editor.ensamblar', piezas=len(piezas)):
+            return ensamblar_malla(piezas)
+
+
+class VistaPrevia3D:
+    """Ventana aparte con la malla extruida, que se actualiza con cada cambio de selección.
+
+    Es otra figura: redibujarla no toca el lienzo del editor (que sigue usando blitting).
+    Con mallas muy grandes no se dibuja, porque mplot3d ordena todos los triángulos.
+    """
+
+    MAX_CARAS = 200_000
+
+    def __init__(self, cache):
+        import matplotlib.pyplot as plt
+        from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+        self.cache = cache
+        self.fig = plt.figure(figsize=(7, 7))
+        self.ax = self.fig.add_subplot(projection='3d')
+        self.coleccion = Poly3DCollection([], facecolors=(0.3, 0.7, 0.3, 1.0), edgecolors='none')
+        self.ax.add_collection3d(self.coleccion)
+        self.refrescar(encuadrar=True)
+
+    def refrescar(self, encuadrar=False):
+        # Contamos antes de ensamblar: si no se va a dibujar, tampoco hace falta la malla
+        caras = sum(len(f) for piezas in self.cache.piezas.values() for _, f in piezas)
+        malla = self.cache.malla() if caras <= self.MAX_CARAS else None
+        if malla is None:
+            self.coleccion.set_verts([])
+            self.ax.set_title(f"Vista previa desactivada: {caras} triángulos (máx. {self.MAX_CARAS})"
+                              if caras else "Vista previa: nada seleccionado")
+        else:
+            with tramo('editor.vista_previa', caras=caras):
+                self.coleccion.set_verts(malla.vertices[malla.faces])
+            self.ax.set_title(f"Vista previa: {len(self.cache.piezas)} cuerpos, {caras} triángulos")
+        if encuadrar and malla is not None:
+            minimos, maximos = malla.bounds
+            lado = (maximos - minimos).max()
+            centro = (minimos + maximos) / 2
+            self.ax.set_xlim(centro[0] - lado / 2, centro[0] + lado / 2)
+            self.ax.set_ylim(centro[1] - lado / 2, centro[1] + lado / 2)
+            self.ax.set_zlim(centro[2] - lado / 2, centro[2] + lado / 2)
+        self.fig.canvas.draw_idle()
+
+
+def editor_y_extrusion(ruta_imagen_entrada, ruta_salida_stl, altura_mm=4.0, escala=0.15, vista_previa=True):
+    # Las librerías de interfaz y 3D solo se cargan al abrir el editor:
+    # importar este módulo no debe arrastrar matplotlib/shapely/trimesh
+    import matplotlib.pyplot as plt
+
+    print(f"Cargando editor para: {describir(ruta_imagen_entrada)}...")
     
-    img = cv2.imread(ruta_imagen_entrada)
+    with tramo('editor.decodificar'):
+        img = cargar_imagen(ruta_imagen_entrada)
     if img is None: return
 
     # 1. Procesamiento (Binarización inteligente)
-    # Usamos canal verde para mejor contraste en objetos de color
-    canal = img[:, :, 1] if len(img.shape) == 3 else img
-    _, thresh = cv2.threshold(canal, 200, 255, cv2.THRESH_BINARY_INV)
-    
-    # Limpieza morfológica básica para unir líneas rotas antes de editar
-    kernel = np.ones((3,3), np.uint8)
-    mascara = cv2.dilate(thresh, kernel, iterations=1)
-    mascara = cv2.erode(mascara, kernel, iterations=1)
+    with tramo('editor.umbral', ancho=img.shape[1], alto=img.shape[0]):
+        # Usamos canal verde para mejor contraste en objetos de color
+        canal = img[:, :, 1] if len(img.shape) == 3 else img
+        _, thresh = cv2.threshold(canal, 200, 255, cv2.THRESH_BINARY_INV)
 
-    contours, hierarchy = cv2.findContours(mascara, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        # Limpieza morfológica básica para unir líneas rotas antes de editar
+        kernel = np.ones((3,3), np.uint8)
+        mascara = cv2.dilate(thresh, kernel, iterations=1)
+        mascara = cv2.erode(mascara, kernel, iterations=1)
+
+    with tramo('editor.contornos'):
+        contours, hierarchy = cv2.findContours(mascara, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    contar('editor.contornos_brutos', len(contours))
     
     if not contours: return
     hierarchy = hierarchy[0]
 
     # 2. Preparar datos para el Editor
     fig, ax = plt.subplots(figsize=(10, 10))
-    ax.set_title("EDITOR DE VECTORES\nClic: Activar/Desactivar | Cerrar ventana: Generar STL")
+    ax.set_title("EDITOR DE VECTORES\nClic: Activar/Desactivar | Cerrar ventanas: Generar STL")
     ax.set_aspect('equal')
     # Invertir eje Y para visualización correcta
     ax.invert_yaxis() 
 
-    seleccionados = [] # Reiniciar lista global
-
     print(f">> Se detectaron {len(contours)} contornos.")
     print(">> Selecciona en la ventana lo que quieras conservar.")
 
-    for i, cnt in enumerate(contours):
-        # Filtro inicial de basura muy pequeña
-        if cv2.contourArea(cnt) < 50:
-            seleccionados.append({'poly': None, 'activo': False, 'jerarquia': hierarchy[i]})
-            continue
-
-        epsilon = 0.002 * cv2.arcLength(cnt, True)
-        approx = cv2.approxPolyDP(cnt, epsilon, True)
-        
-        # Puntos para Matplotlib (x, y)
-        puntos_mpl = [tuple(pt[0]) for pt in approx]
-        
-        # Lógica inicial: Si tiene padre, es hueco (probablemente queremos mantenerlo si el padre está activo)
-        # Por defecto activamos todo lo que sea grande, el usuario decidirá
-        estado_inicial = True
-        color_inicial = '#00ff00' if estado_inicial else 'gray'
-        alpha_inicial = 0.7 if estado_inicial else 0.3
-
-        # Crear Polígono visual
-        poly_patch = MplPolygon(puntos_mpl, closed=True, 
-                                facecolor=color_inicial, edgecolor='black', 
-                                alpha=alpha_inicial, picker=True, label=str(i))
-        
-        ax.add_patch(poly_patch)
-        
-        # Guardar datos para procesamiento posterior
-        # Guardamos puntos escalados e invertidos para el STL final
-        puntos_shapely = [(pt[0][0] * escala, -pt[0][1] * escala) for pt in approx]
-        seleccionados.append({
-            'poly_pts': puntos_shapely, 
-            'activo': estado_inicial, 
-            'jerarquia': hierarchy[i]
-        })
+    indice = IndiceContornos(contours, hierarchy)
+
+    # Filtro inicial de basura muy pequeña: esos contornos no se dibujan ni se pueden activar
+    candidatos = np.flatnonzero(indice.area >= 50)
+    contar('editor.descartados_area', len(contours) - len(candidatos))
+    with tramo('editor.simplificar'):
+        aproximados = [cv2.approxPolyDP(contours[i], 0.002 * indice.perimetro[i], True)
+                       for i in candidatos.tolist()]
+    # Puntos para Matplotlib (x, y)
+    puntos_mpl = [approx.reshape(-1, 2) for approx in aproximados]
+
+    # Puntos escalados e invertidos para el STL, en una sola pasada y en un único arreglo:
+    # las coordenadas del contorno i son puntos[inicio[i]:inicio[i + 1]] (vacías si se filtró)
+    longitudes = np.zeros(len(contours), dtype=np.int64)
+    longitudes[candidatos] = [len(p) for p in puntos_mpl]
+    inicio = np.concatenate([[0], np.cumsum(longitudes)])
+    coords = transformar_contornos(aproximados, escala=escala)
+    puntos = np.concatenate(coords) if coords else np.empty((0, 2))
+
+    # Por defecto activamos todo lo que sea grande (y forme un polígono), el usuario decidirá.
+    # Cascarones y agujeros salen de la regla par-impar sobre los activos
+    activo = longitudes >= 3
+    dibujados = [k for k, i in enumerate(candidatos.tolist()) if activo[i]]
 
     # Ajustar límites del gráfico
     h, w = img.shape[:2]
     ax.set_xlim(0, w)
     ax.set_ylim(h, 0)
 
-    # Conectar evento de clic
-    fig.canvas.mpl_connect('pick_event', on_pick)
+    # 3. Extrusión inicial de la selección por defecto; después solo se rehace lo que cambia
+    cache = CacheExtrusion(puntos, inicio, indice, activo, altura_mm)
+    with tramo('editor.extrusion_inicial'):
+        cache.construir()
+    vista = VistaPrevia3D(cache) if vista_previa else None
+
+    # Todos los polígonos visuales en una sola colección, con clic por índice espacial
+    def al_alternar(i, activo):
+        cache.alternar(i, activo)
+        if vista is not None:
+            vista.refrescar()
+
+    # Guardamos la referencia: matplotlib solo tiene referencias débiles a los callbacks
+    selector = SelectorContornos(ax, [puntos_mpl[k] for k in dibujados], candidatos[dibujados],
+                                 indice.area[candidatos[dibujados]], np.ones(len(dibujados), dtype=bool),
+                                 al_alternar) if dibujados else None
     
-    # MOSTRAR EDITOR (El código se pausa aquí hasta cerrar la ventana)
+    # MOSTRAR EDITOR (El código se pausa aquí hasta cerrar las ventanas)
     plt.show()
 
-    print(">> Editor cerrado. Procesando selección...")
+    print(">> Editor cerrado. Ensamblando selección...")
 
-    # 3. Generación de Geometría basada en selección
-    poligonos_shapely = []
-    
-    # Recorremos la lista que el usuario modificó
-    for i, item in enumerate(seleccionados):
-        if not item.get('poly_pts') or not item['activo']:
-            continue
-            
-        # Jerarquia: [Next, Previous, First_Child, Parent]
-        padre_idx = item['jerarquia'][3]
-        
-        # Si tiene padre y el padre TAMBIÉN está activo, entonces este es un AGUJERO
-        # Si no tiene padre activo, lo tratamos como un sólido independiente
-        es_agujero = False
-        if padre_idx != -1:
-             # Verificamos si el padre está en la lista de activos
-             if seleccionados[padre_idx]['activo']:
-                 es_agujero = True
-        
-        # Para simplificar la extrusión con shapely/trimesh directo:
-        # Shapely necesita (Shell, Holes). Es difícil reconstruir eso dinámicamente si el usuario
-        # borra padres arbitrariamente.
-        # ESTRATEGIA ROBUSTA:
-        # Extruimos todo como sólido. Luego usamos operaciones booleanas o simplemente
-        # confiamos en que el usuario seleccionó bien.
-        
-        # MEJOR ESTRATEGIA:
-        # Si es un contorno externo (o decidimos tratarlo como sólido), creamos el poligono
-        # Y buscamos sus hijos ACTIVOS para hacerlos agujeros.
-        
-        if not es_agujero: # Es un cuerpo principal
-            shell = item['poly_pts']
-            holes = []
-            
-            # Buscar hijos directos en la estructura original que estén ACTIVOS
-            # (Iteración simple, podría optimizarse)
-            child_idx = item['jerarquia'][2]
-            while child_idx != -1:
-                child_item = seleccionados[child_idx]
-                if child_item['activo'] and child_item.get('poly_pts'):
-                    holes.append(child_item['poly_pts'])
-                child_idx = seleccionados[child_idx]['jerarquia'][0] # Siguiente hermano
-
-            # Crear objeto Shapely
-            try:
-                poly = Polygon(shell=shell, holes=holes)
-                if not poly.is_valid: poly = poly.buffer(0)
-                poligonos_shapely.append(poly)
-            except Exception as e:
-                print(f"Error en polígono {i}: {e}")
-
-    if not poligonos_shapely:
+    # 4. Las piezas ya están extruidas: solo se copian en una malla
+    mesh_final = cache.malla()
+    if mesh_final is None:
         print("No seleccionaste ningún polígono válido.")
         return
 
-    # 4. Extrusión
-    mallas = []
-    for poly in poligonos_shapely:
-        mesh = trimesh.creation.extrude_polygon(poly, height=altura_mm)
-        mallas.append(mesh)
-
-    if mallas:
-        mesh_final = trimesh.util.concatenate(mallas)
-        mesh_final.export(ruta_salida_stl)
-        print(f"¡STL Generado!: {ruta_salida_stl}")
+    with tramo('editor.escribir'):
+        with abrir_salida(ruta_salida_stl) as f:
+            mesh_final.export(file_obj=f, file_type='stl')
+    contar('editor.triangulos_salida', len(mesh_final.faces))
+    print(f"¡STL Generado!: {describir(ruta_salida_stl)}")
+    if vista is None:
         mesh_final.show() # Visualizar resultado final 3D
-    else:
-        print("Error al generar mallas.")
 
 # --- Ejecución ---
-archivo_entrada = r'ChatGPT Image 11 dic 2025, 11_43_56.png'
-archivo_salida = 'modelo_seleccionado.stl'
+if __name__ == '__main__':
+    archivo_entrada = r'ChatGPT Image 11 dic 2025, 11_43_56.png'
+    archivo_salida = 'modelo_seleccionado.stl'
 
-if os.path.exists(archivo_entrada):
-    editor_y_extrusion(archivo_entrada, archivo_salida, altura_mm=4.0, escala=0.15)
-else:
-    print("Archivo no encontrado")
\ No newline at end of file
+    if os.path.exists(archivo_entrada):
+        editor_y_extrusion(archivo_entrada, archivo_salida, altura_mm=4.0, escala=0.15)
+    else:
+        print("Archivo no encontrado")
@@ -0,0 +1,102 @@
+import io
+import os
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+
+def cargar_imagen(fuente, flags=cv2.IMREAD_COLOR):
+    """Imagen desde una ruta, bytes codificados (PNG, JPG...), un flujo binario o un arreglo numpy.
+
+    Los bytes y flujos se decodifican en memoria con cv2.imdecode, sin pasar
+    por un archivo temporal. Un .npy se abre con mmap tal como está guardado
+    (sin copiar ni aplicar 'flags'). Devuelve None si no se puede cargar, igual que cv2.imread.
+    """
+    if isinstance(fuente, np.ndarray):
+        return fuente
+    if isinstance(fuente, (str, os.PathLike)):
+        if os.fspath(fuente).lower().endswith('.npy'):
+            return np.load(os.fspath(fuente), mmap_mode='r') if os.path.exists(fuente) else None
+        return cv2.imread(os.fspath(fuente), flags)
+    if hasattr(fuente, 'read'):
+        fuente = fuente.read()
+    if isinstance(fuente, (bytes, bytearray, memoryview)):
+        if not len(fuente):
+            return None
+        return cv2.imdecode(np.frombuffer(fuente, dtype=np.uint8), flags)
+    raise TypeError(f"Fuente de imagen no soportada: {type(fuente).__name__}")
+
+
+def cargar_crudo(fuente, forma, dtype=np.uint8, desplazamiento=0):
+    """Buffer crudo de un escáner (sin cabecera ni compresión) como arreglo 'forma', SIN copiar.
+
+    'fuente' es una ruta (se abre con np.memmap en solo lectura) o bytes /
+    memoryview / mmap ya en memoria (se envuelven con np.frombuffer).
+    'desplazamiento' salta una cabecera propia del escáner. Las imágenes de
+    más de 8 bits se llevan a 8 bits recién en el Trazado.
+    """
+    forma = tuple(int(n) for n in forma)
+    if isinstance(fuente, (str, os.PathLike)):
+        return np.memmap(os.fspath(fuente), dtype=dtype, mode='r', offset=desplazamiento, shape=forma)
+    cantidad = int(np.prod(forma))
+    return np.frombuffer(fuente, dtype=dtype, count=cantidad, offset=desplazamiento).reshape(forma)
+
+
+def describir(fuente_o_destino):
+    """Texto corto para los mensajes de consola (no imprimir megas de bytes)."""
+    if isinstance(fuente_o_destino, (str, os.PathLike)):
+        return os.fspath(fuente_o_destino)
+    if isinstance(fuente_o_destino, np.ndarray):
+        return f"<arreglo {'x'.join(map(str, fuente_o_destino.shape))}>"
+    if isinstance(fuente_o_destino, (bytes, bytearray, memoryview)):
+        return f"<{len(fuente_o_destino)} bytes>"
+    return getattr(fuente_o_destino, 'name', None) or f"<{type(fuente_o_destino).__name__}>"
+
+
+@contextmanager
+def abrir_salida(destino, texto=False, encoding='utf-8', errors='strict'):
+    """Abre 'destino' para escribir: una ruta, o un flujo ya abierto (que NO se cierra al salir).
+
+    Con texto=True y un flujo binario (BytesIO, archivo 'wb', cuerpo de una
+    respuesta HTTP...) se envuelve en un TextIOWrapper que se suelta al final.
+    """
+    if isinstance(destino, (str, os.PathLike)):
+        with open(destino, 'w' if texto else 'wb',
+                  **({'encoding': encoding, 'errors': errors} if texto else {})) as archivo:
+            yield archivo
+        return
+
+    es_texto = isinstance(destino, io.TextIOBase)
+    if not texto:
+        if es_texto:
+            raise TypeError("La salida binaria necesita un flujo binario (p.ej. io.BytesIO).")
+        yield destino
+        return
+    if es_texto:
+        yield destino
+        return
+
+    envoltura = io.TextIOWrapper(destino, encoding=encoding, errors=errors)
+    try:
+        yield envoltura
+    finally:
+        envoltura.flush()
+        envoltura.detach()
+
+
+def posicion_salida(destino):
+    """Dónde empieza a escribir un escritor en un flujo con seek (None para rutas y pipes)."""
+    if isinstance(destino, (str, os.PathLike)):
+        return None
+    return destino.tell() if getattr(destino, 'seekable', lambda: False)() else None
+
+
+def descartar_salida(destino, inicio):
+    """Deshace una salida a medio escribir (ya cerrada): la ruta se borra y un flujo con seek vuelve a 'inicio'."""
+    if isinstance(destino, (str, os.PathLike)):
+        if os.path.exists(destino):
+            os.remove(destino)
+    elif inicio is not None:
+        destino.seek(inicio)
+        destino.truncate()
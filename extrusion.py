@@ -0,0 +1,104 @@
+import itertools
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import trimesh
+
+# Con pocas piezas no vale la pena levantar procesos: se extruye en el mismo
+MIN_PIEZAS_PARALELO = 32
+# Lotes pendientes por proceso: acota lo que se acumula si la triangulación va más rápido que quien consume
+LOTES_EN_VUELO_POR_TRABAJADOR = 2
+# Piezas por tarea: no se paga el envío entre procesos pieza por pieza
+PIEZAS_POR_LOTE = 8
+
+
+def extruir_pieza(poly, altura_mm):
+    """Triangula y extruye UN polígono; devuelve solo los arreglos (baratos de enviar entre procesos)."""
+    mesh = trimesh.creation.extrude_polygon(poly, height=altura_mm)
+    return np.asarray(mesh.vertices), np.asarray(mesh.faces)
+
+
+def _extruir_lote(args):
+    polys, altura_mm = args
+    return [extruir_pieza(poly, altura_mm) for poly in polys]
+
+
+def _piezas_simples(poligonos_shapely):
+    # buffer(0) puede devolver MultiPolygon: cada parte se extruye por separado
+    for poly in poligonos_shapely:
+        if poly.is_empty:
+            continue
+        yield from getattr(poly, 'geoms', [poly])
+
+
+def _en_proceso_hijo():
+    # Un trabajador de lote.py o servidor.py ya es un proceso del pool: no abre otro pool dentro
+    return multiprocessing.parent_process() is not None
+
+
+def extruir_piezas(poligonos_shapely, altura_mm, trabajadores=1):
+    """Genera (vertices, faces) de cada pieza EN ORDEN.
+
+    Por defecto extruye en el mismo proceso. Solo el punto de entrada decide
+    repartir: con 'trabajadores' > 1 (None = un proceso por núcleo) la
+    triangulación se reparte en lotes entre procesos, con a lo sumo
+    LOTES_EN_VUELO_POR_TRABAJADOR lotes pendientes por proceso, así la
+    memoria sigue acotada aunque quien consume (el escritor STL) sea más
+    lento. Dentro de un proceso hijo nunca se abre otro pool.
+    """
+    piezas = _piezas_simples(poligonos_shapely)
+    trabajadores = trabajadores or os.cpu_count() or 1
+    if _en_proceso_hijo():
+        trabajadores = 1
+
+    primeras = list(itertools.islice(piezas, MIN_PIEZAS_PARALELO))
+    if trabajadores == 1 or len(primeras) < MIN_PIEZAS_PARALELO:
+        for poly in itertools.chain(primeras, piezas):
+            yield extruir_pieza(poly, altura_mm)
+        return
+
+    todas = itertools.chain(primeras, piezas)
+    lotes = iter(lambda: list(itertools.islice(todas, PIEZAS_POR_LOTE)), [])
+
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        pendientes = deque(pool.submit(_extruir_lote, (lote, altura_mm))
+                           for lote in itertools.islice(lotes, trabajadores * LOTES_EN_VUELO_POR_TRABAJADOR))
+        while pendientes:
+            resultado = pendientes.popleft().result()
+            lote = next(lotes, None)
+            if lote is not None:
+                pendientes.append(pool.submit(_extruir_lote, (lote, altura_mm)))
+            yield from resultado
+
+
+def extruir_agrupadas(poligonos_shapely, altura_mm, trabajadores=1):
+    """Como extruir_piezas, pero devuelve una lista de piezas POR polígono de entrada.
+
+    Sirve para cachear la extrusión de cada polígono por separado (un
+    MultiPolygon reparado con buffer(0) aporta varias piezas, uno vacío ninguna).
+    """
+    partes = [list(_piezas_simples([poly])) for poly in poligonos_shapely]
+    planas = iter(list(extruir_piezas([p for grupo in partes for p in grupo], altura_mm, trabajadores)))
+    return [[next(planas) for _ in grupo] for grupo in partes]
+
+
+def ensamblar_malla(piezas):
+    """Copia los arreglos de cada pieza en UNA malla preasignada (sin trimesh.util.concatenate)."""
+    total_vertices = sum(len(v) for v, _ in piezas)
+    total_caras = sum(len(f) for _, f in piezas)
+
+    vertices = np.empty((total_vertices, 3), dtype=np.float64)
+    caras = np.empty((total_caras, 3), dtype=np.int64)
+
+    ov = of = 0
+    for v, f in piezas:
+        vertices[ov:ov + len(v)] = v
+        caras[of:of + len(f)] = f
+        caras[of:of + len(f)] += ov
+        ov += len(v)
+        of += len(f)
+
+    return trimesh.Trimesh(vertices=vertices, faces=caras, process=False)
@@ -0,0 +1,211 @@
+import argparse
+import os
+import sys
+
+
+def _forma_cruda(texto):
+    """'ANCHOxALTO' -> (alto, ancho), la forma del arreglo numpy."""
+    ancho, alto = (int(v) for v in texto.lower().split('x'))
+    return alto, ancho
+
+
+def _entrada(args):
+    # Un buffer crudo de escáner se mapea en memoria: los convertidores reciben el arreglo directamente
+    if getattr(args, 'crudo', None):
+        from entrada_salida import cargar_crudo
+        return cargar_crudo(args.entrada, args.crudo, dtype=args.tipo)
+    return args.entrada
+
+
+def _dxf(args):
+    entrada = _entrada(args)
+    if args.canny:
+        from dxf import imagen_a_dxf
+        imagen_a_dxf(entrada, args.salida, motor=args.motor, tolerancia_arcos=args.arcos)
+    elif args.franjas:
+        from mosaico import generar_dxf_por_franjas
+        generar_dxf_por_franjas(entrada, args.salida, alto_franja=args.franjas, motor=args.motor)
+    else:
+        from limpiodxf import generar_dxf_limpio
+        generar_dxf_limpio(entrada, args.salida, motor=args.motor, subpixel=args.subpixel)
+
+
+def _svg(args):
+    entrada = _entrada(args)
+    if args.canny:
+        from contornos_HC import contornos_alta_precision
+        contornos_alta_precision(entrada, args.salida, motor=args.motor, decimales=args.decimales,
+                                 tolerancia_arcos=args.arcos)
+    else:
+        from limpieza import generar_svg_limpio
+        generar_svg_limpio(entrada, args.salida, motor=args.motor, decimales=args.decimales,
+                           subpixel=args.subpixel)
+
+
+def _stl(args):
+    entrada = _entrada(args)
+    if args.visor:
+        from visor_stl import generar_stl_con_visor
+        generar_stl_con_visor(entrada, args.salida, altura_mm=args.altura, escala=args.escala)
+    else:
+        from stl import generar_stl_extruido
+        generar_stl_extruido(entrada, args.salida, altura_mm=args.altura, escala=args.escala,
+                             motor=args.motor, subpixel=args.subpixel, trabajadores=args.procesos)
+
+
+def _capas(args):
+    from capas import banda_desde_texto, generar_por_capas
+    salidas = [args.salida, *args.otras]
+    rutas = {os.path.splitext(r)[1].lower(): r for r in salidas}
+    directo = args.motor == 'directo'
+    generar_por_capas(args.entrada, [banda_desde_texto(b) for b in args.banda],
+                      ruta_dxf=rutas.get('.dxf'), ruta_svg=rutas.get('.svg'),
+                      motor_dxf='directo' if directo else 'ezdxf', motor_svg='directo' if directo else 'svgwrite',
+                      decimales=args.decimales, trabajadores=args.hilos)
+
+
+def _video(args):
+    from video import trazar_video
+    return trazar_video(args.entrada, args.salida, tuple(args.formatos), umbral_cambio=args.cambio,
+                        max_cuadros=args.max_cuadros, motor=args.motor)
+
+
+def _contornos(args):
+    from trazado import Trazado
+    from contenedor import guardar_trazado
+    trazado = Trazado.desde_archivo(_entrada(args), subpixel=args.subpixel)
+    if trazado is None:
+        return
+    guardar_trazado(args.salida, trazado)
+    print(f"¡Listo! {len(trazado.contornos)} contornos guardados en: {args.salida}")
+
+
+def _editar(args):
+    from entorno_editable import editor_y_extrusion
+    editor_y_extrusion(args.entrada, args.salida, altura_mm=args.altura, escala=args.escala,
+                       vista_previa=not args.sin_vista)
+
+
+def _argumentos_crudo(p):
+    p.add_argument('--crudo', type=_forma_cruda, metavar='ANCHOxALTO',
+                   help="La entrada es un buffer crudo de escáner (sin cabecera) de esta forma; se mapea sin copiar")
+    p.add_argument('--tipo', default='uint8', help="Tipo de cada píxel del buffer crudo (uint8, uint16...)")
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(prog='python -m generador',
+                                     description="Convierte imágenes en contornos DXF/SVG o piezas STL")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p = sub.add_parser('dxf', help="Contornos limpios en DXF (capa CORTE)")
+    p.add_argument('entrada')
+    p.add_argument('salida')
+    p.add_argument('--motor', choices=['ezdxf', 'directo'], default='ezdxf')
+    p.add_argument('--canny', action='store_true', help="Bordes Canny de alta fidelidad (dxf.py)")
+    p.add_argument('--arcos', type=float, metavar='TOL',
+                   help="Con --canny: ajustar arcos y círculos a menos de TOL px del contorno")
+    p.add_argument('--franjas', type=int, metavar='ALTO',
+                   help="Trazar por franjas de ALTO píxeles (escaneos gigantes, .npy con mmap)")
+    p.add_argument('--subpixel', action='store_true',
+                   help="Contornos sub-píxel sobre el blur, sin escalar la imagen (no aplica a --canny/--franjas)")
+    _argumentos_crudo(p)
+    p.set_defaults(funcion=_dxf)
+
+    p = sub.add_parser('svg', help="Contornos limpios en SVG")
+    p.add_argument('entrada')
+    p.add_argument('salida')
+    p.add_argument('--motor', choices=['svgwrite', 'directo'], default='svgwrite')
+    p.add_argument('--canny', action='store_true', help="Bordes Canny de alta precisión (contornos_HC.py)")
+    p.add_argument('--arcos', type=float, metavar='TOL',
+                   help="Con --canny: ajustar arcos y círculos a menos de TOL px del contorno")
+    p.add_argument('--decimales', type=int, default=2, help="Decimales del motor directo")
+    p.add_argument('--subpixel', action='store_true',
+                   help="Contornos sub-píxel sobre el blur, sin escalar la imagen (no aplica a --canny)")
+    _argumentos_crudo(p)
+    p.set_defaults(funcion=_svg)
+
+    p = sub.add_parser('stl', help="Piezas extruidas en STL")
+    p.add_argument('entrada')
+    p.add_argument('salida')
+    p.add_argument('--altura', type=float, default=4.0, help="Altura de extrusión en mm")
+    p.add_argument('--escala', type=float, default=0.1, help="mm por píxel")
+    p.add_argument('--motor', choices=['trimesh', 'directo'], default='trimesh')
+    p.add_argument('--subpixel', action='store_true',
+                   help="Contornos sub-píxel sobre el blur, sin escalar la imagen (no aplica a --visor)")
+    p.add_argument('--procesos', type=int, default=1,
+                   help="Procesos que triangulan las piezas (0 = uno por núcleo)")
+    p.add_argument('--visor', action='store_true', help="Mostrar la malla antes de guardar")
+    _argumentos_crudo(p)
+    p.set_defaults(funcion=_stl)
+
+    p = sub.add_parser('capas', help="Varias bandas de gris -> un DXF/SVG multicapa en una sola pasada")
+    p.add_argument('entrada')
+    p.add_argument('salida', help="Archivo .dxf o .svg")
+    p.add_argument('otras', nargs='*', help="Más salidas del mismo trazado (p.ej. el .svg además del .dxf)")
+    p.add_argument('--banda', action='append', required=True, metavar='NOMBRE:COLOR:MIN:MAX',
+                   help="Capa con los píxeles de gris MIN..MAX y color ACI COLOR (repetible)")
+    p.add_argument('--motor', choices=['defecto', 'directo'], default='defecto')
+    p.add_argument('--decimales', type=int, default=2, help="Decimales del motor directo (SVG)")
+    p.add_argument('--hilos', type=int, default=None, help="Capas trazadas en paralelo")
+    p.set_defaults(funcion=_capas)
+
+    p = sub.add_parser('video', help="Video o cámara: un DXF/SVG por cuadro con piezas nuevas")
+    p.add_argument('entrada', help="Archivo de video o índice de la cámara (0, 1...)")
+    p.add_argument('salida', help="Carpeta de salida")
+    p.add_argument('--formatos', nargs='+', choices=['dxf', 'svg'], default=['dxf'])
+    p.add_argument('--cambio', type=float, default=0.01,
+                   help="Fracción de píxeles de la máscara que debe cambiar para volver a trazar")
+    p.add_argument('--max-cuadros', type=int, default=None)
+    p.add_argument('--motor', choices=['directo', 'defecto'], default='directo')
+    p.set_defaults(funcion=_video)
+
+    p = sub.add_parser('contornos', help="Trazar una vez y guardar el contenedor binario .contornos")
+    p.add_argument('entrada')
+    p.add_argument('salida', help="Archivo .contornos (después sirve de entrada a dxf/svg/stl)")
+    p.add_argument('--subpixel', action='store_true', help="Contornos sub-píxel sobre el blur")
+    _argumentos_crudo(p)
+    p.set_defaults(funcion=_contornos)
+
+    p = sub.add_parser('editar', aliases=['edit'], help="Editor interactivo: elegir piezas y extruir")
+    p.add_argument('entrada')
+    p.add_argument('salida')
+    p.add_argument('--altura', type=float, default=4.0, help="Altura de extrusión en mm")
+    p.add_argument('--escala', type=float, default=0.15, help="mm por píxel")
+    p.add_argument('--sin-vista', action='store_true', help="Sin la vista previa 3D en vivo")
+    p.set_defaults(funcion=_editar)
+
+    return parser
+
+
+def _marca(ruta):
+    """Lo que cambia si alguien reescribe la ruta (None si no existe)."""
+    try:
+        info = os.stat(ruta)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size, info.st_ino
+
+
+def main(argv=None):
+    """python -m generador {dxf,svg,stl,capas,video,contornos,editar} entrada salida [opciones].
+
+    Cada subcomando importa su backend solo cuando se ejecuta: un trabajo de
+    DXF no paga el arranque de trimesh, shapely ni matplotlib.
+    """
+    args = crear_parser().parse_args(argv)
+    # En 'video' la entrada también puede ser el índice de una cámara
+    if not os.path.exists(args.entrada) and not (args.comando == 'video' and args.entrada.isdigit()):
+        print(f"Archivo no encontrado: {args.entrada}")
+        return 1
+    # Éxito solo si ESTA corrida escribió la salida: un archivo viejo con el mismo nombre no cuenta
+    antes = _marca(args.salida)
+    resultado = args.funcion(args)
+    if args.comando == 'video':
+        # La salida es una carpeta (puede quedar sin archivos si no entró ninguna pieza)
+        return 0 if resultado is not None else 1
+    return 0 if _marca(args.salida) not in (None, antes) else 1
+
+
+# --- Ejecución ---
+if __name__ == '__main__':
+    sys.exit(main())
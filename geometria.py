@@ -0,0 +1,64 @@
+import numpy as np
+import shapely
+
+
+def _rangos(desde, hasta):
+    """Concatena arange(desde[k], hasta[k]) para todo k, sin bucle de Python."""
+    desde = np.asarray(desde, dtype=np.int64)
+    largos = np.asarray(hasta, dtype=np.int64) - desde
+    total = int(largos.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    inicio_salida = np.cumsum(largos) - largos
+    return np.repeat(desde - inicio_salida, largos) + np.arange(total)
+
+
+def poligonos_en_lote(puntos, inicio, cascarones, agujeros, desde, hasta):
+    """Polígonos shapely de todas las piezas a la vez, con shapely.linearrings/polygons.
+
+    Las coordenadas del contorno i son puntos[inicio[i]:inicio[i + 1]] y la
+    pieza k es el cascarón cascarones[k] con los agujeros agujeros[desde[k]:hasta[k]].
+    Los anillos de menos de 3 puntos se descartan: un cascarón así anula su
+    pieza (queda None) y un agujero así simplemente no se usa. Los polígonos
+    inválidos se reparan con buffer(0), también en lote.
+
+    Devuelve (arreglo de polígonos alineado con 'cascarones', número de reparaciones).
+    """
+    inicio = np.asarray(inicio, dtype=np.int64)
+    cascarones = np.asarray(cascarones, dtype=np.int64)
+    agujeros = np.asarray(agujeros, dtype=np.int64)
+    desde = np.asarray(desde, dtype=np.int64)
+    hasta = np.asarray(hasta, dtype=np.int64)
+    resultado = np.full(len(cascarones), None, dtype=object)
+
+    # Anillos en el orden que espera shapely.polygons: cada cascarón seguido de sus agujeros
+    n_agujeros = hasta - desde
+    pieza = np.repeat(np.arange(len(cascarones)), n_agujeros + 1)
+    es_cascaron = np.zeros(len(pieza), dtype=bool)
+    es_cascaron[np.cumsum(n_agujeros + 1) - (n_agujeros + 1)] = True
+    contorno = np.empty(len(pieza), dtype=np.int64)
+    contorno[es_cascaron] = cascarones
+    contorno[~es_cascaron] = agujeros[_rangos(desde, hasta)]
+
+    largos = inicio[contorno + 1] - inicio[contorno]
+    cascaron_valido = np.zeros(len(cascarones), dtype=bool)
+    cascaron_valido[pieza[es_cascaron & (largos >= 3)]] = True
+    usar = (largos >= 3) & cascaron_valido[pieza]
+    if not usar.any():
+        return resultado, 0
+
+    contorno, pieza, largos = contorno[usar], pieza[usar], largos[usar]
+    coords = puntos[_rangos(inicio[contorno], inicio[contorno + 1])]
+    anillos = shapely.linearrings(coords, indices=np.repeat(np.arange(len(contorno)), largos))
+
+    # indices consecutivos desde 0 para las piezas que quedaron
+    piezas_validas, compacta = np.unique(pieza, return_inverse=True)
+    poligonos = shapely.polygons(anillos, indices=compacta)
+
+    # Validar geometría (evita cruces extraños) y reparar solo los inválidos
+    invalidos = ~shapely.is_valid(poligonos)
+    if invalidos.any():
+        poligonos[invalidos] = shapely.buffer(poligonos[invalidos], 0)
+
+    resultado[piezas_validas] = poligonos
+    return resultado, int(invalidos.sum())
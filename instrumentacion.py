@@ -0,0 +1,140 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Sumideros activos. Vacío = instrumentación apagada: tramo() y contar() salen en la primera línea
+_sumideros = ()
+_tramo_actual = ContextVar('tramo_actual', default=None)
+
+
+class SumideroJSONL:
+    """Una línea JSON por evento, p.ej. para cargarla después con pandas o jq."""
+
+    def __init__(self, ruta):
+        self._archivo = open(ruta, 'a', encoding='utf-8')
+        self._candado = threading.Lock()
+
+    def emitir(self, evento):
+        linea = json.dumps(evento, default=str) + '\n'
+        with self._candado:
+            self._archivo.write(linea)
+            self._archivo.flush()
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+class SumideroLogging:
+    """Manda cada evento al logger indicado (nivel DEBUG por defecto)."""
+
+    def __init__(self, logger='generador', nivel=logging.DEBUG):
+        self.logger = logging.getLogger(logger) if isinstance(logger, str) else logger
+        self.nivel = nivel
+
+    def emitir(self, evento):
+        if evento['tipo'] == 'tramo':
+            self.logger.log(self.nivel, "%s: %.4f s", evento['nombre'], evento['duracion_s'],
+                            extra={'metrica': evento})
+        else:
+            self.logger.log(self.nivel, "%s += %s", evento['nombre'], evento['valor'],
+                            extra={'metrica': evento})
+
+
+class SumideroCallback:
+    """Llama a una función con cada evento (dict), dentro del mismo proceso."""
+
+    def __init__(self, funcion):
+        self.funcion = funcion
+
+    def emitir(self, evento):
+        self.funcion(evento)
+
+
+def activar(*sumideros):
+    """Enciende la instrumentación. Acepta sumideros o funciones sueltas (se envuelven en SumideroCallback)."""
+    global _sumideros
+    _sumideros = tuple(s if hasattr(s, 'emitir') else SumideroCallback(s) for s in sumideros)
+
+
+def desactivar():
+    global _sumideros
+    _sumideros = ()
+
+
+def activa():
+    return bool(_sumideros)
+
+
+@contextmanager
+def activada(*sumideros):
+    """Instrumentación encendida solo dentro del bloque 'with'."""
+    global _sumideros
+    anteriores = _sumideros
+    activar(*sumideros)
+    try:
+        yield
+    finally:
+        _sumideros = anteriores
+
+
+def _emitir(evento):
+    for sumidero in _sumideros:
+        sumidero.emitir(evento)
+
+
+class _Tramo:
+    __slots__ = ('nombre', 'atributos', '_inicio', '_ficha')
+
+    def __init__(self, nombre, atributos):
+        self.nombre = nombre
+        self.atributos = atributos
+
+    def __enter__(self):
+        self._ficha = _tramo_actual.set(self.nombre)
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo_exc, exc, tb):
+        duracion = time.perf_counter() - self._inicio
+        _tramo_actual.reset(self._ficha)
+
+        evento = {'tipo': 'tramo', 'nombre': self.nombre, 'duracion_s': duracion,
+                  'padre': _tramo_actual.get(), 'ts': time.time(), **self.atributos}
+        if tipo_exc is not None:
+            evento['error'] = tipo_exc.__name__
+        _emitir(evento)
+
+
+class _TramoNulo:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_exc, exc, tb):
+        return None
+
+
+_NULO = _TramoNulo()
+
+
+def tramo(nombre, **atributos):
+    """Mide el bloque 'with' como un tramo con nombre (p.ej. 'trazado.blur').
+
+    Con la instrumentación apagada devuelve siempre el mismo objeto vacío:
+    el costo es una llamada y una comparación.
+    """
+    if not _sumideros:
+        return _NULO
+    return _Tramo(nombre, atributos)
+
+
+def contar(nombre, valor=1, **atributos):
+    """Suma 'valor' al contador 'nombre' (p.ej. 'stl.reparaciones_buffer0')."""
+    if not _sumideros:
+        return
+    _emitir({'tipo': 'contador', 'nombre': nombre, 'valor': valor,
+             'tramo': _tramo_actual.get(), 'ts': time.time(), **atributos})
@@ -1,88 +1,71 @@
-import cv2
-import numpy as np
 import ezdxf  # Librería para DXF
 import os
 
-def generar_dxf_limpio(ruta_imagen_entrada, ruta_salida_dxf):
-    print(f"Procesando y limpiando para DXF: {ruta_imagen_entrada}...")
-    
-    img = cv2.imread(ruta_imagen_entrada)
-    if img is None:
-        print("Error: No se carga la imagen.")
-        return
-
-    # 1. Preprocesamiento (Misma lógica que tu script anterior)
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    blurred = cv2.GaussianBlur(gray, (7, 7), 0)
+from trazado import Trazado
+from transformacion import transformar_contornos
+from dxf_directo import EscritorDXF
+from entrada_salida import abrir_salida, describir
+from instrumentacion import tramo, contar, activa
 
-    # Binarización Invertida
-    _, thresh = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+def generar_dxf_limpio(ruta_imagen_entrada, ruta_salida_dxf, motor='ezdxf', subpixel=False):
+    print(f"Procesando y limpiando para DXF: {describir(ruta_imagen_entrada)}...")
 
-    # 2. Encontrar contornos CON jerarquía
-    contours, hierarchy = cv2.findContours(thresh, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    trazado = Trazado.desde_archivo(ruta_imagen_entrada, subpixel=subpixel)
+    if trazado is None:
+        return
 
-    print(f"Contornos brutos detectados: {len(contours)}")
+    dxf_desde_trazado(trazado, ruta_salida_dxf, motor=motor)
 
-    if hierarchy is None:
+def dxf_desde_trazado(trazado, ruta_salida_dxf, motor='ezdxf'):
+    """motor='directo' escribe las LWPOLYLINE en streaming, sin el modelo de objetos de ezdxf."""
+    # 1-3. Preprocesamiento, contornos y FILTRO LÓGICO ya viven en el Trazado
+    # (se calculan una sola vez aunque después pidamos SVG o STL)
+    if trazado.jerarquia is None:
         print("No se encontraron contornos.")
         return
 
-    hierarchy = hierarchy[0] 
-    contornos_validos = []
-
-    # 3. FILTRO LÓGICO: Eliminar duplicados encimados
-    # (Mantenemos tu lógica intacta aquí)
-    for i, cnt in enumerate(contours):
-        area_actual = cv2.contourArea(cnt)
-        
-        if area_actual < 50: 
-            continue
-
-        padre_idx = hierarchy[i][3]
-        es_valido = True
-
-        if padre_idx != -1:
-            area_padre = cv2.contourArea(contours[padre_idx])
-            
-            if area_padre > 0:
-                ratio = area_actual / area_padre
-                # Si el hijo es casi igual al padre (>85%), es basura/doble línea
-                if ratio > 0.85: 
-                    es_valido = False
-        
-        if es_valido:
-            contornos_validos.append(cnt)
-
-    print(f"Contornos limpios finales: {len(contornos_validos)}")
+    # Suavizado inteligente (approxPolyDP cacheado en el Trazado)
+    with tramo('dxf.simplificar'):
+        aproximados = [trazado.aproximado(i, 0.001) for i in trazado.indices_validos]
+
+    # Preparamos los puntos para DXF, todos de una vez
+    # IMPORTANTE: Invertimos el eje Y porque en imágenes el (0,0) 
+    # está arriba-izquierda, y en CAD está abajo-izquierda.
+    polilineas = [p for p in transformar_contornos(aproximados, invertir_y=True) if len(p) > 2]
+    if activa():
+        contar('dxf.polilineas', len(polilineas))
+        contar('dxf.vertices_salida', sum(len(p) for p in polilineas))
+
+    if motor == 'directo':
+        with tramo('dxf.escribir', motor=motor), \
+                EscritorDXF(ruta_salida_dxf, capa='CORTE', color=1) as dxf:
+            for puntos_dxf in polilineas:
+                dxf.agregar_polilinea(puntos_dxf)
+        print(f"¡Listo! DXF limpio guardado en: {describir(ruta_salida_dxf)}")
+        return
 
     # 4. Generar DXF (Aquí está el cambio principal)
     # Creamos un documento DXF versión 2010 (muy compatible)
-    doc = ezdxf.new('R2010')
-    msp = doc.modelspace()
+    with tramo('dxf.escribir', motor=motor):
+        doc = ezdxf.new('R2010')
+        msp = doc.modelspace()
 
-    for cnt in contornos_validos:
-        # Suavizado inteligente
-        epsilon = 0.001 * cv2.arcLength(cnt, True)
-        approx = cv2.approxPolyDP(cnt, epsilon, True)
-
-        # Preparamos los puntos para DXF
-        # IMPORTANTE: Invertimos el eje Y (-pt[0][1]) porque en imágenes el (0,0) 
-        # está arriba-izquierda, y en CAD está abajo-izquierda.
-        puntos_dxf = [(float(pt[0][0]), -float(pt[0][1])) for pt in approx]
-        
-        if len(puntos_dxf) > 2:
+        for puntos_dxf in polilineas:
             # LWPOLYLINE es la entidad óptima para cortes continuos
             # close=True cierra la figura automáticamente
-            msp.add_lwpolyline(puntos_dxf, close=True, dxfattribs={'layer': 'CORTE', 'color': 1})
+            msp.add_lwpolyline(puntos_dxf.tolist(), close=True, dxfattribs={'layer': 'CORTE', 'color': 1})
 
-    doc.saveas(ruta_salida_dxf)
-    print(f"¡Listo! DXF limpio guardado en: {ruta_salida_dxf}")
+        with abrir_salida(ruta_salida_dxf, texto=True, encoding=doc.output_encoding,
+                          errors='dxfreplace') as f:
+            doc.write(f)
+    print(f"¡Listo! DXF limpio guardado en: {describir(ruta_salida_dxf)}")
 
 # --- Ejecución ---
-archivo_entrada = r'ChatGPT Image 11 dic 2025, 11_29_31.png'
-archivo_salida = 'resultado_limpio2.dxf'
-
-if os.path.exists(archivo_entrada):
-    generar_dxf_limpio(archivo_entrada, archivo_salida)
-else:
-    print(f"Archivo no encontrado: {archivo_entrada}")
\ No newline at end of file
+if __name__ == '__main__':
+    archivo_entrada = r'ChatGPT Image 11 dic 2025, 11_29_31.png'
+    archivo_salida = 'resultado_limpio2.dxf'
+
+    if os.path.exists(archivo_entrada):
+        generar_dxf_limpio(archivo_entrada, archivo_salida)
+    else:
+        print(f"Archivo no encontrado: {archivo_entrada}")
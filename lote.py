@@ -0,0 +1,145 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from trazado import Trazado
+import instrumentacion
+
+EXTENSIONES_IMAGEN = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+COLUMNAS_MANIFIESTO = ['archivo', 'estado', 'segundos', 'contornos_brutos',
+                       'contornos_validos', 'salidas', 'error']
+
+
+def buscar_imagenes(entrada):
+    """Acepta una carpeta o un patrón glob ('escaneos/*.png') y devuelve las imágenes ordenadas."""
+    if os.path.isdir(entrada):
+        rutas = [os.path.join(entrada, nombre) for nombre in os.listdir(entrada)]
+    else:
+        rutas = glob.glob(entrada, recursive=True)
+
+    return sorted(r for r in rutas
+                  if os.path.isfile(r) and r.lower().endswith(EXTENSIONES_IMAGEN))
+
+
+def _marca(ruta):
+    # Cambia si alguien reescribe el archivo; None si no existe
+    try:
+        info = os.stat(ruta)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size, info.st_ino
+
+
+def procesar_imagen(ruta_imagen, formatos=('dxf',), altura_mm=4.0, escala=0.1):
+    """Convierte una imagen y deja las salidas junto a ella. Nunca lanza: devuelve el resultado."""
+    inicio = time.perf_counter()
+    resultado = {'archivo': ruta_imagen, 'estado': 'ok', 'segundos': 0.0,
+                 'contornos_brutos': 0, 'contornos_validos': 0, 'salidas': [], 'error': ''}
+
+    try:
+        with instrumentacion.tramo('lote.imagen', archivo=ruta_imagen):
+            trazado = Trazado.desde_archivo(ruta_imagen)
+            if trazado is None:
+                raise ValueError("No se carga la imagen.")
+
+            base = os.path.splitext(ruta_imagen)[0]
+            rutas = {formato: f"{base}.{formato}" for formato in formatos}
+            antes = {ruta: _marca(ruta) for ruta in rutas.values()}
+            trazado.exportar(ruta_dxf=rutas.get('dxf'), ruta_svg=rutas.get('svg'),
+                             ruta_stl=rutas.get('stl'), altura_mm=altura_mm, escala=escala)
+
+            resultado['contornos_brutos'] = len(trazado.contornos)
+            resultado['contornos_validos'] = len(trazado.indices_validos)
+            # Solo lo que escribió ESTA conversión (no las salidas de un lote anterior)
+            resultado['salidas'] = [r for r, marca in antes.items() if _marca(r) not in (None, marca)]
+    except Exception as e:
+        # Una imagen mala no debe tumbar el lote: la anotamos y seguimos
+        resultado['estado'] = 'error'
+        resultado['error'] = f"{type(e).__name__}: {e}"
+
+    resultado['segundos'] = round(time.perf_counter() - inicio, 4)
+    return resultado
+
+
+def _activar_metricas(ruta_metricas):
+    # Cada proceso del pool agrega sus tramos y contadores al mismo .jsonl
+    instrumentacion.activar(instrumentacion.SumideroJSONL(ruta_metricas))
+
+
+def convertir_lote(entrada, formatos=('dxf',), procesos=None, altura_mm=4.0, escala=0.1,
+                   ruta_manifiesto=None, ruta_metricas=None):
+    """Reparte las imágenes de una carpeta/glob en un pool de procesos y escribe el manifiesto.
+
+    Con 'ruta_metricas' cada etapa de cada imagen queda registrada como una línea JSON.
+    """
+    imagenes = buscar_imagenes(entrada)
+    print(f"Imágenes encontradas: {len(imagenes)}")
+    if not imagenes:
+        return []
+
+    resultados = []
+    inicio = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=procesos, initargs=(ruta_metricas,),
+                             initializer=_activar_metricas if ruta_metricas else None) as pool:
+        futuros = {pool.submit(procesar_imagen, ruta, tuple(formatos), altura_mm, escala): ruta
+                   for ruta in imagenes}
+
+        for futuro in as_completed(futuros):
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                # Si el proceso hijo muere (p.ej. un crash de OpenCV) también lo anotamos
+                resultado = {'archivo': futuros[futuro], 'estado': 'error', 'segundos': 0.0,
+                             'contornos_brutos': 0, 'contornos_validos': 0, 'salidas': [],
+                             'error': f"{type(e).__name__}: {e}"}
+            resultados.append(resultado)
+            print(f"[{len(resultados)}/{len(imagenes)}] {resultado['estado']}: {resultado['archivo']}")
+
+    resultados.sort(key=lambda r: r['archivo'])
+    errores = sum(1 for r in resultados if r['estado'] != 'ok')
+    print(f"Lote terminado en {time.perf_counter() - inicio:.1f}s "
+          f"({len(resultados) - errores} ok, {errores} con error)")
+
+    if ruta_manifiesto:
+        escribir_manifiesto(resultados, ruta_manifiesto)
+
+    return resultados
+
+
+def escribir_manifiesto(resultados, ruta_manifiesto):
+    """Guarda el manifiesto en JSON o CSV según la extensión del archivo."""
+    if ruta_manifiesto.lower().endswith('.csv'):
+        with open(ruta_manifiesto, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNAS_MANIFIESTO)
+            writer.writeheader()
+            for r in resultados:
+                writer.writerow(dict(r, salidas=';'.join(r['salidas'])))
+    else:
+        with open(ruta_manifiesto, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+    print(f"Manifiesto guardado en: {ruta_manifiesto}")
+
+
+# --- Ejecución ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Conversión por lotes de imágenes a DXF/SVG/STL")
+    parser.add_argument('entrada', help="Carpeta o patrón glob, p.ej. 'escaneos/*.png'")
+    parser.add_argument('--formatos', nargs='+', default=['dxf'], choices=['dxf', 'svg', 'stl'])
+    parser.add_argument('--procesos', type=int, default=None,
+                        help="Procesos en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument('--altura', type=float, default=4.0, help="Altura de extrusión STL en mm")
+    parser.add_argument('--escala', type=float, default=0.1, help="mm por píxel para el STL")
+    parser.add_argument('--manifiesto', default='manifiesto_lote.json',
+                        help="Ruta del manifiesto (.json o .csv)")
+    parser.add_argument('--metricas', help="Registrar tiempos por etapa y contadores en este .jsonl")
+    args = parser.parse_args()
+
+    convertir_lote(args.entrada, formatos=args.formatos, procesos=args.procesos,
+                   altura_mm=args.altura, escala=args.escala, ruta_manifiesto=args.manifiesto,
+                   ruta_metricas=args.metricas)
@@ -0,0 +1,113 @@
+import cv2
+import numpy as np
+
+
+class IndiceContornos:
+    """Área, perímetro, bounding box y profundidad de TODOS los contornos, como arreglos.
+
+    Se construye una vez por imagen; el filtro anti-dobles líneas y la búsqueda
+    de agujeros consultan estos arreglos en vez de volver a llamar a
+    cv2.contourArea / cv2.arcLength por cada hijo.
+    """
+
+    def __init__(self, contornos, jerarquia=None):
+        n = len(contornos)
+        self.area = np.fromiter((cv2.contourArea(c) for c in contornos), dtype=np.float64, count=n)
+        self.perimetro = np.fromiter((cv2.arcLength(c, True) for c in contornos), dtype=np.float64, count=n)
+        # bbox = [x, y, ancho, alto] como cv2.boundingRect
+        self.bbox = np.array([cv2.boundingRect(c) for c in contornos], dtype=np.int64).reshape(n, 4)
+
+        # jerarquia = [Next, Previous, First_Child, Parent]
+        if jerarquia is None:
+            self.padre = np.full(n, -1, dtype=np.int64)
+        else:
+            self.padre = np.asarray(jerarquia)[:, 3].astype(np.int64)
+
+        self.profundidad = _profundidades(self.padre)
+
+    def __len__(self):
+        return len(self.area)
+
+    @property
+    def area_padre(self):
+        """Área del padre de cada contorno (0 si no tiene padre)."""
+        return np.where(self.padre != -1, self.area[self.padre], 0.0)
+
+    def es_doble_linea(self, ratio_max=0.85):
+        """True donde el hijo ocupa más de 'ratio_max' del área del padre (borde duplicado)."""
+        area_padre = self.area_padre
+        con_padre = area_padre > 0
+        ratio = np.divide(self.area, area_padre, out=np.zeros_like(self.area), where=con_padre)
+        return con_padre & (ratio > ratio_max)
+
+    def cuerpos(self, activo):
+        """Cascarón/agujero de cada contorno para la selección 'activo' (ver resolver_par_impar)."""
+        return resolver_par_impar(self.padre, activo)
+
+
+def resolver_par_impar(padre, activo):
+    """Cuerpo al que pertenece cada contorno ACTIVO según la regla par-impar.
+
+    Los contornos inactivos son transparentes: cada activo cuelga de su
+    ancestro activo más cercano. A nivel activo par es un cascarón y a nivel
+    impar un agujero de ese ancestro, así que una isla dentro de un agujero
+    vuelve a ser cascarón y el agujero de un padre desactivado pasa al abuelo.
+
+    Devuelve 'cuerpo': para un cascarón su propio índice, para un agujero el
+    de su cascarón y -1 para los inactivos. Se resuelve con saltos de punteros
+    sobre todos los contornos a la vez: cada pasada duplica el tramo recorrido,
+    así que un anidamiento de profundidad d cuesta log2(d) pasadas de O(n).
+    """
+    padre = np.asarray(padre, dtype=np.int64)
+    activo = np.asarray(activo, dtype=bool)
+    n = len(padre)
+
+    # Ancestro activo más cercano: se saltan los ancestros inactivos
+    ancestro = padre.copy()
+    while True:
+        saltar = np.flatnonzero(ancestro != -1)
+        saltar = saltar[~activo[ancestro[saltar]]]
+        if not len(saltar):
+            break
+        ancestro[saltar] = ancestro[ancestro[saltar]]
+
+    # Nivel entre los activos = ancestros activos por encima (ranking de listas)
+    nivel = (ancestro != -1).astype(np.int64)
+    salto = ancestro.copy()
+    while True:
+        sigue = np.flatnonzero(salto != -1)
+        if not len(sigue):
+            break
+        nivel[sigue] += nivel[salto[sigue]]
+        salto[sigue] = salto[salto[sigue]]
+
+    return np.where(~activo, -1, np.where(nivel % 2 == 0, np.arange(n), ancestro))
+
+
+def agrupar_agujeros(cuerpo):
+    """(cascarones, agujeros, inicio): los agujeros de cascarones[k] son agujeros[inicio[k]:inicio[k + 1]].
+
+    Todo en arreglos (formato CSR), en el orden de los índices de contorno.
+    """
+    cuerpo = np.asarray(cuerpo, dtype=np.int64)
+    indices = np.arange(len(cuerpo))
+    cascarones = np.flatnonzero(cuerpo == indices)
+
+    es_agujero = (cuerpo != -1) & (cuerpo != indices)
+    agujeros = np.flatnonzero(es_agujero)
+    agujeros = agujeros[np.argsort(cuerpo[agujeros], kind='stable')]
+    inicio = np.searchsorted(cuerpo[agujeros], cascarones, side='left')
+    inicio = np.append(inicio, len(agujeros))
+    return cascarones, agujeros, inicio
+
+
+def _profundidades(padre):
+    """Nivel de anidamiento de cada contorno, subiendo por los padres para todos a la vez."""
+    profundidad = np.zeros(len(padre), dtype=np.int64)
+    ancestro = padre.copy()
+    while True:
+        tiene = ancestro != -1
+        if not tiene.any():
+            return profundidad
+        profundidad += tiene
+        ancestro = np.where(tiene, padre[ancestro], -1)
@@ -0,0 +1,325 @@
+import os
+from functools import cached_property
+
+import cv2
+import numpy as np
+
+from trazado import Trazado
+from entrada_salida import cargar_imagen, describir
+from instrumentacion import tramo, contar
+
+FLT_EPSILON = np.finfo(np.float32).eps
+
+
+def umbral_otsu(histograma):
+    """Umbral de Otsu a partir de un histograma de 256 niveles (mismo cálculo que OpenCV)."""
+    histograma = np.asarray(histograma, dtype=np.float64)
+    total = histograma.sum()
+    if total == 0:
+        return 0
+
+    mu = np.dot(np.arange(256), histograma) / total
+    q1 = mu1 = 0.0
+    max_sigma = 0.0
+    umbral = 0
+
+    for i in range(256):
+        p_i = histograma[i] / total
+        mu1 *= q1
+        q1 += p_i
+        q2 = 1.0 - q1
+
+        if min(q1, q2) < FLT_EPSILON or max(q1, q2) > 1.0 - FLT_EPSILON:
+            continue
+
+        mu1 = (mu1 + i * p_i) / q1
+        mu2 = (mu - q1 * mu1) / q2
+        sigma = q1 * q2 * (mu1 - mu2) ** 2
+        if sigma > max_sigma:
+            max_sigma = sigma
+            umbral = i
+
+    return umbral
+
+
+class TrazadoMosaico(Trazado):
+    """Trazado por franjas horizontales para escaneos gigantes.
+
+    La memoria de trabajo (gris, blur, binaria, findContours) depende del alto de
+    la franja y no del tamaño de la imagen. Se hacen dos pasadas:
+
+    1. Histograma del blur franja por franja -> umbral de Otsu GLOBAL (el mismo
+       que daría cv2.threshold sobre la imagen completa).
+    2. Binarización + findContours por franja. Las piezas que no tocan una costura
+       se guardan tal cual; las que cruzan una costura se unen con Shapely y se
+       reconstruye la jerarquía RETR_TREE para que el filtro 0.85 y los
+       exportadores funcionen igual que con Trazado. Con una sola franja las
+       polilíneas son las mismas que las de generar_dxf_limpio (en otro orden).
+       Las piezas cosidas pueden diferir en unos pocos px²: en contornos
+       "pellizcados" (que se tocan en un solo píxel) Shapely los separa o
+       junta en ese punto, y los vértices de la unión se redondean a píxel.
+
+    La fuente puede ser un arreglo gris o BGR, incluido un np.memmap / .npy
+    abierto con mmap_mode='r': las franjas se leen sin copiar la imagen entera.
+    Si no es de 8 bits (crudos de 10-16 bits, float), una pasada previa busca
+    el mínimo y el máximo GLOBALES y cada franja se escala a 8 bits con ellos,
+    igual que el cv2.normalize de Trazado sobre la imagen completa.
+    """
+
+    def __init__(self, img, alto_franja=2048, kernel_blur=(7, 7), area_minima=50,
+                 ratio_doble_linea=0.85):
+        super().__init__(img, kernel_blur=kernel_blur, area_minima=area_minima,
+                         ratio_doble_linea=ratio_doble_linea)
+        self.alto_franja = alto_franja
+        # Filas extra que necesita el GaussianBlur para que los bordes de franja sean exactos
+        self._margen_blur = kernel_blur[1] // 2
+
+    @classmethod
+    def desde_archivo(cls, ruta_imagen_entrada, **parametros):
+        """Abre .npy con mmap (sin copiar) y el resto decodificado a color, como Trazado.
+
+        No se decodifica directo en gris: IMREAD_GRAYSCALE no redondea igual
+        que cvtColor(BGR2GRAY) y cambia un nivel de gris en muchos píxeles, lo
+        que mueve los bordes. Cada franja pasa a gris con el mismo cvtColor.
+        También acepta bytes codificados, un flujo binario o un arreglo (incluido un np.memmap).
+        """
+        img = cargar_imagen(ruta_imagen_entrada)
+
+        if img is None:
+            print("Error: No se carga la imagen.")
+            return None
+        return cls(img, **parametros)
+
+    @property
+    def binaria(self):
+        raise AttributeError("TrazadoMosaico no guarda la imagen binaria completa; usa franjas().")
+
+    def _franjas(self):
+        """Rangos [y0, y1) de cada franja, sin solape."""
+        for y0 in range(0, self.alto, self.alto_franja):
+            yield y0, min(y0 + self.alto_franja, self.alto)
+
+    def _gris_franja(self, a, b):
+        trozo = np.ascontiguousarray(self._img[a:b])
+        if trozo.ndim == 3:
+            trozo = cv2.cvtColor(trozo, cv2.COLOR_BGR2GRAY)
+        return trozo
+
+    @cached_property
+    def _escala_8_bits(self):
+        """(alpha, beta) que llevan el rango global [min, max] a [0, 255], o None si ya es uint8."""
+        if self._img.dtype == np.uint8:
+            return None
+        # Pasada 0: mínimo y máximo de toda la imagen, franja por franja
+        with tramo('mosaico.rango'):
+            minimo, maximo = np.inf, -np.inf
+            for y0, y1 in self._franjas():
+                trozo_min, trozo_max, _, _ = cv2.minMaxLoc(self._gris_franja(y0, y1))
+                minimo, maximo = min(minimo, trozo_min), max(maximo, trozo_max)
+        # Mismo cálculo que cv2.normalize(NORM_MINMAX) con un rango nulo
+        alpha = 255.0 / (maximo - minimo) if maximo > minimo else 0.0
+        return alpha, -minimo * alpha
+
+    def _blur_franja(self, y0, y1):
+        """Blur de las filas [y0, y1) leyendo solo esas filas más el margen del kernel."""
+        a = max(0, y0 - self._margen_blur)
+        b = min(self.alto, y1 + self._margen_blur)
+        trozo = self._gris_franja(a, b)
+        if self._escala_8_bits is not None:
+            # Otsu (histograma de 256 niveles) y findContours trabajan en 8 bits
+            alpha, beta = self._escala_8_bits
+            trozo = cv2.convertScaleAbs(trozo, alpha=alpha, beta=beta)
+
+        # En los bordes reales de la imagen el reflejo es el mismo que en la imagen completa;
+        # en las costuras usamos filas reales, así el resultado es idéntico al de una pasada.
+        blurred = cv2.GaussianBlur(trozo, self.kernel_blur, 0)
+        return blurred[y0 - a:y1 - a]
+
+    @cached_property
+    def umbral(self):
+        # Pasada 1: histograma global del blur (cada fila una sola vez)
+        with tramo('mosaico.umbral'):
+            histograma = np.zeros(256, dtype=np.int64)
+            for y0, y1 in self._franjas():
+                histograma += np.bincount(self._blur_franja(y0, y1).ravel(), minlength=256)
+            return umbral_otsu(histograma)
+
+    def franjas(self):
+        """Genera (y0, binaria_franja) con la misma binarización invertida que Trazado.
+
+        Cada franja comparte su última fila con la siguiente: así las piezas que
+        cruzan la costura tienen un borde común y la unión de Shapely las suelda.
+        """
+        for y0, y1 in self._franjas():
+            y1 = min(y1 + 1, self.alto)
+            _, thresh = cv2.threshold(self._blur_franja(y0, y1), self.umbral, 255, cv2.THRESH_BINARY_INV)
+            yield y0, thresh
+
+    @cached_property
+    def _contornos_y_jerarquia(self):
+        from shapely.geometry import Polygon
+        from shapely.ops import unary_union
+
+        anillos = []   # [(contorno, es_agujero, indice_pieza)]
+        pendientes = []  # Polígonos que cruzan una costura, se unen al final
+
+        # Pasada 2: contornos por franja
+        for y0, thresh in self.franjas():
+            with tramo('mosaico.contornos_franja', y0=y0):
+                contours, hierarchy = cv2.findContours(thresh, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+            if hierarchy is None:
+                continue
+            hierarchy = hierarchy[0]
+            ultima_fila = thresh.shape[0] - 1
+            toca_arriba = y0 > 0
+            toca_abajo = y0 + ultima_fila < self.alto - 1
+
+            for i, cnt in enumerate(contours):
+                if _profundidad(hierarchy, i) % 2:
+                    continue # Los agujeros se recogen con su contorno exterior
+
+                hijos = _hijos(hierarchy, i)
+                ys = cnt[:, 0, 1]
+                cruza = (toca_arriba and ys.min() == 0) or (toca_abajo and ys.max() == ultima_fila)
+
+                desplazamiento = np.array([0, y0], dtype=np.int32)
+                if not cruza:
+                    # Pieza completa dentro de la franja: idéntica a la de una sola pasada
+                    pieza = len(anillos)
+                    anillos.append((cnt + desplazamiento, False, pieza))
+                    for h in hijos:
+                        anillos.append((contours[h] + desplazamiento, True, pieza))
+                    continue
+
+                exterior = (cnt[:, 0] + desplazamiento).astype(np.float64)
+                agujeros = [(contours[h][:, 0] + desplazamiento).astype(np.float64)
+                            for h in hijos if len(contours[h]) >= 3]
+                poly = Polygon(exterior, agujeros) if len(exterior) >= 3 else None
+                if poly is None:
+                    continue
+                if not poly.is_valid:
+                    poly = poly.buffer(0)
+                    contar('mosaico.reparaciones_buffer0')
+                pendientes.append(poly)
+
+        # Coser las piezas partidas por las costuras
+        contar('mosaico.piezas_en_costura', len(pendientes))
+        if pendientes:
+            with tramo('mosaico.coser', piezas=len(pendientes)):
+                union = unary_union(pendientes)
+            for poly in getattr(union, 'geoms', [union]):
+                if poly.is_empty or poly.geom_type != 'Polygon':
+                    continue
+                pieza = len(anillos)
+                anillos.append((_anillo_a_contorno(poly.exterior), False, pieza))
+                for interior in poly.interiors:
+                    anillos.append((_anillo_a_contorno(interior), True, pieza))
+
+        print(f"Contornos brutos detectados: {len(anillos)}")
+        contar('trazado.contornos_brutos', len(anillos))
+        if not anillos:
+            return [], None
+
+        contornos = [a[0] for a in anillos]
+        with tramo('mosaico.jerarquia'):
+            return contornos, _jerarquia_desde_anillos(anillos)
+
+
+def _profundidad(hierarchy, i):
+    profundidad = 0
+    padre = hierarchy[i][3]
+    while padre != -1:
+        profundidad += 1
+        padre = hierarchy[padre][3]
+    return profundidad
+
+
+def _hijos(hierarchy, i):
+    hijos = []
+    h = hierarchy[i][2]
+    while h != -1:
+        hijos.append(h)
+        h = hierarchy[h][0]
+    return hijos
+
+
+def _anillo_a_contorno(anillo):
+    # Shapely repite el primer punto al cerrar; OpenCV no
+    coords = np.asarray(anillo.coords)[:-1]
+    return np.rint(coords).astype(np.int32).reshape(-1, 1, 2)
+
+
+def _jerarquia_desde_anillos(anillos):
+    """Reconstruye [Next, Previous, First_Child, Parent] al estilo RETR_TREE.
+
+    Los agujeros cuelgan de su contorno exterior; cada contorno exterior cuelga del
+    agujero más pequeño que lo contiene (islas dentro de huecos), o de nadie.
+    """
+    import shapely
+    from shapely.strtree import STRtree
+
+    n = len(anillos)
+    padres = np.full(n, -1, dtype=np.int32)
+    exterior_de_pieza = {}
+    for idx, (_, es_agujero, pieza) in enumerate(anillos):
+        if es_agujero:
+            padres[idx] = exterior_de_pieza[pieza]
+        else:
+            exterior_de_pieza[pieza] = idx
+
+    idx_agujeros = np.array([i for i, a in enumerate(anillos) if a[1]], dtype=np.intp)
+    idx_exteriores = np.array([i for i, a in enumerate(anillos) if not a[1]], dtype=np.intp)
+
+    if len(idx_agujeros) and len(idx_exteriores):
+        huecos = [shapely.Polygon(anillos[i][0].reshape(-1, 2)) if len(anillos[i][0]) >= 3
+                  else shapely.Point(anillos[i][0][0, 0]) for i in idx_agujeros]
+        areas = shapely.area(huecos)
+        arbol = STRtree(huecos)
+        puntos = shapely.points([anillos[i][0][0, 0] for i in idx_exteriores])
+        pares = arbol.query(puntos, predicate='within')
+
+        # Para cada contorno exterior nos quedamos con el hueco contenedor más pequeño
+        mejor_area = np.full(len(idx_exteriores), np.inf)
+        for e, h in zip(*pares):
+            if areas[h] < mejor_area[e]:
+                mejor_area[e] = areas[h]
+                padres[idx_exteriores[e]] = idx_agujeros[h]
+
+    jerarquia = np.full((n, 4), -1, dtype=np.int32)
+    jerarquia[:, 3] = padres
+    ultimo_hijo = {}
+    for idx in range(n):
+        padre = int(padres[idx])
+        anterior = ultimo_hijo.get(padre)
+        if anterior is None:
+            if padre != -1:
+                jerarquia[padre, 2] = idx
+        else:
+            jerarquia[anterior, 0] = idx
+            jerarquia[idx, 1] = anterior
+        ultimo_hijo[padre] = idx
+
+    return jerarquia
+
+
+def generar_dxf_por_franjas(ruta_imagen_entrada, ruta_salida_dxf, alto_franja=2048, motor='directo'):
+    """Equivalente a generar_dxf_limpio con memoria acotada por el alto de la franja."""
+    from limpiodxf import dxf_desde_trazado
+
+    print(f"Procesando por franjas de {alto_franja}px: {describir(ruta_imagen_entrada)}...")
+    trazado = TrazadoMosaico.desde_archivo(ruta_imagen_entrada, alto_franja=alto_franja)
+    if trazado is None:
+        return
+
+    dxf_desde_trazado(trazado, ruta_salida_dxf, motor=motor)
+
+
+# --- Ejecución ---
+if __name__ == '__main__':
+    archivo_entrada = r'ChatGPT Image 11 dic 2025, 11_29_31.png'
+    archivo_salida = 'resultado_franjas.dxf'
+
+    if os.path.exists(archivo_entrada):
+        generar_dxf_por_franjas(archivo_entrada, archivo_salida, alto_franja=256)
+    else:
+        print(f"Archivo no encontrado: {archivo_entrada}")
@@ -0,0 +1,273 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import socketserver
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as TiempoAgotado
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TIPOS_CONTENIDO = {
+    'dxf': 'application/dxf',
+    'svg': 'image/svg+xml',
+    'stl': 'model/stl',
+}
+
+
+class ErrorConversion(Exception):
+    """Error del pedido (imagen ilegible, sin contornos...): se responde con 4xx."""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+    def __reduce__(self):
+        # Viaja del proceso trabajador al servidor: hay que poder reconstruirla con ambos argumentos
+        return type(self), (self.estado, str(self))
+
+
+def _precalentar():
+    # Se ejecuta una vez por proceso: las librerías pesadas quedan importadas para todos los pedidos
+    import cv2, ezdxf, svgwrite, shapely, trimesh  # noqa: F401
+    import asincrono, limpiodxf, limpieza, stl  # noqa: F401
+
+
+def _ping():
+    return os.getpid()
+
+
+def convertir_bytes(datos, formato, altura_mm=4.0, escala=0.1, motor=None):
+    """Imagen codificada (PNG/JPG...) -> bytes del DXF/SVG/STL, con la misma lógica que los scripts."""
+    from asincrono import convertir_en_memoria
+
+    # Los prints de los scripts no deben ensuciar la consola del servidor
+    # (cada trabajador es un proceso de un solo hilo, así que redirigir stdout es seguro)
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            salidas = convertir_en_memoria(datos, (formato,), altura_mm, escala,
+                                           motores={formato: motor} if motor else None)
+        except ValueError as e:
+            raise ErrorConversion(400, str(e))
+
+    if formato not in salidas:
+        raise ErrorConversion(422, "No se encontraron contornos válidos.")
+    return salidas[formato]
+
+
+class ServicioConversion:
+    """Pool de procesos precalentado con cola acotada.
+
+    Como mucho 'trabajadores' conversiones corren a la vez y 'max_en_cola' esperan;
+    si llega un pedido más, convertir() devuelve None en vez de encolarlo (backpressure).
+    """
+
+    def __init__(self, trabajadores=None, max_en_cola=16, tiempo_max_s=120):
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.max_en_cola = max_en_cola
+        self.tiempo_max_s = tiempo_max_s
+        self._cupos = threading.BoundedSemaphore(self.trabajadores + max_en_cola)
+        self._candado = threading.Lock()
+        self.en_curso = 0
+        self.atendidos = 0
+        self.fallidos = 0
+        self.agotados = 0
+        self.rechazados = 0
+        self._pool = self._crear_pool()
+
+    def _crear_pool(self):
+        pool = ProcessPoolExecutor(max_workers=self.trabajadores, initializer=_precalentar)
+        # Levantamos todos los procesos ya, para que el primer pedido no pague los imports
+        for futuro in [pool.submit(_ping) for _ in range(self.trabajadores)]:
+            futuro.result()
+        return pool
+
+    def convertir(self, datos, formato, **parametros):
+        """Bytes de salida, o None si la cola está llena. Propaga ErrorConversion y TimeoutError.
+
+        El cupo se libera cuando el trabajo TERMINA en el proceso, no cuando se
+        deja de esperarlo: una conversión que pasó el tiempo máximo sigue
+        corriendo y sigue ocupando su lugar en la cola.
+        """
+        if not self._cupos.acquire(blocking=False):
+            with self._candado:
+                self.rechazados += 1
+            return None
+
+        with self._candado:
+            self.en_curso += 1
+        pool = self._pool
+        try:
+            futuro = pool.submit(convertir_bytes, datos, formato, **parametros)
+        except BaseException:
+            self._terminado(None)
+            raise
+        futuro.add_done_callback(self._terminado)
+
+        try:
+            salida = futuro.result(timeout=self.tiempo_max_s)
+        except TiempoAgotado:
+            with self._candado:
+                self.agotados += 1
+            raise
+        except BrokenProcessPool:
+            # Un trabajador murió (p.ej. un crash nativo de OpenCV): reponemos el pool para los siguientes
+            with self._candado:
+                self.fallidos += 1
+                if self._pool is pool:
+                    self._pool = self._crear_pool()
+            raise
+        except BaseException:
+            with self._candado:
+                self.fallidos += 1
+            raise
+        with self._candado:
+            self.atendidos += 1
+        return salida
+
+    def _terminado(self, futuro):
+        with self._candado:
+            self.en_curso -= 1
+        self._cupos.release()
+
+    def estado(self):
+        with self._candado:
+            return {
+                'trabajadores': self.trabajadores,
+                'max_en_cola': self.max_en_cola,
+                'en_curso': self.en_curso,
+                'atendidos': self.atendidos,
+                'fallidos': self.fallidos,
+                'agotados': self.agotados,
+                'rechazados': self.rechazados,
+            }
+
+    def cerrar(self):
+        self._pool.shutdown(cancel_futures=True)
+
+
+class ManejadorConversion(BaseHTTPRequestHandler):
+    """POST /convertir?formato=dxf|svg|stl[&altura_mm=4&escala=0.1&motor=directo] con la imagen en el cuerpo."""
+
+    servicio = None
+    max_bytes = 64 * 1024 * 1024
+    protocol_version = 'HTTP/1.1'
+
+    def address_string(self):
+        # En un socket Unix client_address es una cadena vacía
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def _responder(self, estado, cuerpo, tipo='application/json', encabezados=()):
+        if isinstance(cuerpo, dict):
+            cuerpo = json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(estado)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        for nombre, valor in encabezados:
+            self.send_header(nombre, valor)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def do_GET(self):
+        if urlparse(self.path).path == '/estado':
+            self._responder(200, self.servicio.estado())
+        else:
+            self._responder(404, {'error': 'Ruta desconocida.'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/convertir':
+            self.close_connection = True
+            self._responder(404, {'error': 'Ruta desconocida.'})
+            return
+
+        try:
+            longitud = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            # Sin un largo válido no sabemos dónde termina el cuerpo: la conexión no se reutiliza
+            self.close_connection = True
+            self._responder(400, {'error': 'Content-Length inválido.'})
+            return
+        if longitud <= 0:
+            self._responder(400, {'error': 'Falta la imagen en el cuerpo del pedido.'})
+            return
+        if longitud > self.max_bytes:
+            # No leemos el cuerpo: la conexión no se puede reutilizar
+            self.close_connection = True
+            self._responder(413, {'error': f"La imagen supera {self.max_bytes} bytes."})
+            return
+        datos = self.rfile.read(longitud)
+
+        consulta = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        formato = consulta.get('formato', 'dxf').lower()
+        if formato not in TIPOS_CONTENIDO:
+            self._responder(400, {'error': f"Formato no soportado: {formato}"})
+            return
+
+        try:
+            parametros = {'altura_mm': float(consulta.get('altura_mm', 4.0)),
+                          'escala': float(consulta.get('escala', 0.1)),
+                          'motor': consulta.get('motor')}
+        except ValueError as e:
+            self._responder(400, {'error': str(e)})
+            return
+
+        try:
+            salida = self.servicio.convertir(datos, formato, **parametros)
+        except ErrorConversion as e:
+            self._responder(e.estado, {'error': str(e)})
+            return
+        except TiempoAgotado:
+            self._responder(504, {'error': 'La conversión tardó demasiado.'})
+            return
+        except Exception as e:
+            self._responder(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+
+        if salida is None:
+            # Cola llena: el cliente debe reintentar más tarde
+            self._responder(503, {'error': 'Servidor ocupado, reintenta.'}, encabezados=[('Retry-After', '1')])
+            return
+
+        self._responder(200, salida, tipo=TIPOS_CONTENIDO[formato])
+
+
+class ServidorUnix(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def crear_servidor(servicio, host='127.0.0.1', puerto=8765, socket_unix=None):
+    """Servidor HTTP (TCP o socket Unix) que atiende cada conexión en un hilo."""
+    manejador = type('Manejador', (ManejadorConversion,), {'servicio': servicio})
+    if socket_unix:
+        if os.path.exists(socket_unix):
+            os.remove(socket_unix)
+        return ServidorUnix(socket_unix, manejador)
+    return ThreadingHTTPServer((host, puerto), manejador)
+
+
+# --- Ejecución ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servidor de conversión imagen -> DXF/SVG/STL con procesos precalentados")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--socket', help="Escuchar en este socket Unix en vez de TCP")
+    parser.add_argument('--trabajadores', type=int, default=None, help="Procesos (por defecto, uno por núcleo)")
+    parser.add_argument('--cola', type=int, default=16, help="Pedidos en espera antes de responder 503")
+    parser.add_argument('--tiempo-max', type=float, default=120, help="Segundos por conversión antes de 504")
+    args = parser.parse_args()
+
+    servicio = ServicioConversion(args.trabajadores, args.cola, args.tiempo_max)
+    servidor = crear_servidor(servicio, args.host, args.puerto, args.socket)
+    print(f"Servidor listo en {args.socket or f'http://{args.host}:{args.puerto}'} "
+          f"({servicio.trabajadores} procesos, cola de {args.cola})")
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        servicio.cerrar()
@@ -1,130 +1,128 @@
-import cv2
 import numpy as np
-import trimesh
-from shapely.geometry import Polygon
 import os
 
-def generar_stl_extruido(ruta_imagen_entrada, ruta_salida_stl, altura_mm=4.0, escala=0.1):
-    print(f"Generando modelo 3D desde: {ruta_imagen_entrada}...")
-    
-    img = cv2.imread(ruta_imagen_entrada)
-    if img is None:
-        print("Error: No se carga la imagen.")
+from trazado import Trazado
+from transformacion import transformar_contornos
+from extrusion import extruir_piezas, ensamblar_malla
+from geometria import poligonos_en_lote
+from metricas import agrupar_agujeros
+from stl_directo import EscritorSTL
+from entrada_salida import abrir_salida, describir
+from instrumentacion import tramo, contar
+
+def generar_stl_extruido(ruta_imagen_entrada, ruta_salida_stl, altura_mm=4.0, escala=0.1, motor='trimesh',
+                         subpixel=False, trabajadores=1):
+    print(f"Generando modelo 3D desde: {describir(ruta_imagen_entrada)}...")
+
+    trazado = Trazado.desde_archivo(ruta_imagen_entrada, subpixel=subpixel)
+    if trazado is None:
         return
 
-    # 1. Preprocesamiento (Tu lógica de limpieza probada)
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    blurred = cv2.GaussianBlur(gray, (7, 7), 0)
-    _, thresh = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    stl_desde_trazado(trazado, ruta_salida_stl, altura_mm=altura_mm, escala=escala, motor=motor,
+                      trabajadores=trabajadores)
 
-    # 2. Contornos con Jerarquía
-    contours, hierarchy = cv2.findContours(thresh, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+def poligonos_desde_trazado(trazado, escala):
+    """Reconstruye los sólidos con sus agujeros (Shapely) a partir del trazado compartido."""
+    indice = trazado.indice
 
-    if hierarchy is None:
+    # 3. Reconstrucción de Geometría (Sólidos vs Agujeros)
+    # Primero decidimos qué contorno es cascarón y cuáles son sus agujeros;
+    # las coordenadas se transforman después, todas de una vez.
+
+    # Cascarones: contornos que NO tienen padre (bordes exteriores) y pasan el filtro de ruido
+    es_shell = (indice.padre == -1) & (indice.area >= 500)
+
+    # --- B. Agujeros (Holes) ---
+    # Hijos directos de un cascarón, sin ruido y que NO sean un borde duplicado
+    # (tu lógica de ratio: si el hijo es casi del tamaño del padre, NO es un agujero)
+    es_agujero = (indice.padre != -1) & (indice.area > trazado.area_minima)
+    es_agujero &= ~indice.es_doble_linea(trazado.ratio_doble_linea)
+    es_agujero[es_agujero] &= es_shell[indice.padre[es_agujero]]
+
+    # Cada agujero pertenece al cascarón que es su padre: se agrupan en arreglos (CSR)
+    cuerpo = np.full(len(indice), -1, dtype=np.int64)
+    cuerpo[es_shell] = np.flatnonzero(es_shell)
+    cuerpo[es_agujero] = indice.padre[es_agujero]
+    cascarones, agujeros, inicio_agujeros = agrupar_agujeros(cuerpo)
+
+    # --- A. Suavizado y coordenadas ---
+    # Escala e inversión del eje vertical (x, -y) sobre todos los contornos a la vez,
+    # en un solo arreglo: las coordenadas del contorno i son puntos[inicio[i]:inicio[i + 1]]
+    usados = np.flatnonzero(cuerpo != -1)
+    with tramo('stl.simplificar'):
+        aproximados = [trazado.aproximado(i, 0.001) for i in usados.tolist()]
+    longitudes = np.zeros(len(indice), dtype=np.int64)
+    longitudes[usados] = [len(a) for a in aproximados]
+    inicio = np.concatenate([[0], np.cumsum(longitudes)])
+    coords = transformar_contornos(aproximados, escala=escala)
+    puntos = np.concatenate(coords) if coords else np.empty((0, 2))
+
+    # --- C. Crear Polígonos Shapely ---
+    # Shapely maneja la matemática de "Sólido menos Agujeros"; todos se arman y validan
+    # en lote (los auto-intersectados se arreglan con buffer(0))
+    with tramo('stl.construir_poligonos', piezas=len(cascarones)):
+        poligonos, reparados = poligonos_en_lote(puntos, inicio, cascarones, agujeros,
+                                                 inicio_agujeros[:-1], inicio_agujeros[1:])
+    if reparados:
+        contar('stl.reparaciones_buffer0', reparados)
+
+    return [poly for poly in poligonos if poly is not None]
+
+def malla_desde_poligonos(poligonos_shapely, altura_mm, trabajadores=1):
+    # 4. Extrusión con Trimesh ('trabajadores' > 1 reparte la triangulación entre procesos)
+    with tramo('stl.extruir', poligonos=len(poligonos_shapely)):
+        piezas = list(extruir_piezas(poligonos_shapely, altura_mm, trabajadores))
+
+    # Combinar todas las piezas en una sola malla (arreglos preasignados)
+    with tramo('stl.ensamblar'):
+        return ensamblar_malla(piezas)
+
+def stl_desde_trazado(trazado, ruta_salida_stl, altura_mm=4.0, escala=0.1, motor='trimesh', trabajadores=1):
+    """motor='directo' escribe el STL binario pieza por pieza (memoria de la pieza más grande).
+
+    'trabajadores' lo fija el punto de entrada (None = un proceso por núcleo);
+    por defecto se extruye en el mismo proceso.
+    """
+    if trazado.jerarquia is None:
         print("No se detectaron formas.")
         return
 
-    hierarchy = hierarchy[0]
-    # hierarchy = [Next, Previous, First_Child, Parent]
-
-    poligonos_shapely = []
-
-    # 3. Reconstrucción de Geometría (Sólidos vs Agujeros)
-    # Recorremos solo los contornos que NO tienen padre (Son los bordes exteriores)
-    for i, cnt in enumerate(contours):
-        
-        # Si tiene padre (hierarchy[i][3] != -1), es un contorno interno o basura, 
-        # lo procesaremos cuando encontremos a su padre.
-        if hierarchy[i][3] != -1:
-            continue
-            
-        # Filtro de ruido para el contorno exterior
-        if cv2.contourArea(cnt) < 500:
-            continue
-
-        # --- A. Definir el Cascarón (Shell) ---
-        epsilon = 0.001 * cv2.arcLength(cnt, True)
-        approx = cv2.approxPolyDP(cnt, epsilon, True)
-        
-        # Convertir a lista de tuplas (x, -y) para invertir eje vertical y aplicar escala
-        shell_coords = [(pt[0][0] * escala, -pt[0][1] * escala) for pt in approx]
-        
-        if len(shell_coords) < 3: continue
-
-        # --- B. Buscar Agujeros (Holes) ---
-        # Buscamos en la lista de contornos aquellos cuyo PADRE sea 'i' (el actual)
-        agujeros_coords = []
-        
-        # Iteramos buscando hijos directos
-        # (Nota: Esto es O(N^2) en el peor caso, pero rápido para imágenes simples)
-        idx_hijo = hierarchy[i][2] # Primer hijo
-        
-        while idx_hijo != -1:
-            cnt_hijo = contours[idx_hijo]
-            
-            # Filtro lógico anti-dobles líneas (tu lógica de ratio)
-            area_hijo = cv2.contourArea(cnt_hijo)
-            area_padre = cv2.contourArea(cnt)
-            
-            es_agujero_real = True
-            
-            if area_padre > 0:
-                ratio = area_hijo / area_padre
-                # Si el hijo es casi del tamaño del padre, es un borde duplicado, NO un agujero.
-                if ratio > 0.85: 
-                    es_agujero_real = False
-            
-            if es_agujero_real and area_hijo > 50:
-                epsilon_h = 0.001 * cv2.arcLength(cnt_hijo, True)
-                approx_h = cv2.approxPolyDP(cnt_hijo, epsilon_h, True)
-                h_coords = [(pt[0][0] * escala, -pt[0][1] * escala) for pt in approx_h]
-                
-                if len(h_coords) >= 3:
-                    agujeros_coords.append(h_coords)
-            
-            # Moverse al siguiente hermano del hijo
-            idx_hijo = hierarchy[idx_hijo][0]
-
-        # --- C. Crear Polígono Shapely ---
-        # Shapely maneja la matemática de "Sólido menos Agujeros"
-        poly = Polygon(shell=shell_coords, holes=agujeros_coords)
-        
-        # Validar geometría (evita cruces extraños)
-        if not poly.is_valid:
-            poly = poly.buffer(0) # Truco sucio para arreglar polígonos auto-intersectados
-            
-        poligonos_shapely.append(poly)
-
+    with tramo('stl.poligonos'):
+        poligonos_shapely = poligonos_desde_trazado(trazado, escala)
     print(f"Polígonos procesados para extrusión: {len(poligonos_shapely)}")
 
     if not poligonos_shapely:
         print("No se generaron polígonos válidos.")
         return
 
-    # 4. Extrusión con Trimesh
-    mallas = []
-    for poly in poligonos_shapely:
-        # Extrude polygon crea un objeto Mesh tridimensional
-        mesh = trimesh.creation.extrude_polygon(poly, height=altura_mm)
-        mallas.append(mesh)
-
-    # Combinar todas las mallas en una sola escena
-    mesh_final = trimesh.util.concatenate(mallas)
-
-    # 5. Exportar
-    mesh_final.export(ruta_salida_stl)
-    print(f"¡Éxito! Archivo STL generado en: {ruta_salida_stl}")
+    if motor == 'directo':
+        # 4-5. Extrusión y exportación en streaming: cada pieza se escribe y se libera
+        with tramo('stl.extruir_y_escribir', motor=motor), EscritorSTL(ruta_salida_stl) as stl:
+            for vertices, caras in extruir_piezas(poligonos_shapely, altura_mm, trabajadores):
+                stl.agregar_malla(vertices, caras)
+        contar('stl.triangulos_salida', stl.triangulos_escritos)
+    else:
+        mesh_final = malla_desde_poligonos(poligonos_shapely, altura_mm, trabajadores)
+
+        # 5. Exportar
+        with tramo('stl.escribir', motor=motor):
+            with abrir_salida(ruta_salida_stl) as f:
+                mesh_final.export(file_obj=f, file_type='stl')
+        contar('stl.triangulos_salida', len(mesh_final.faces))
+
+    print(f"¡Éxito! Archivo STL generado en: {describir(ruta_salida_stl)}")
     print(f"Altura de extrusión: {altura_mm}mm")
 
 # --- Ejecución ---
-archivo_entrada = r'ChatGPT Image 11 dic 2025, 11_43_56.png'
-archivo_salida = 'modelo_3d.stl'
-
-# Ajusta la 'escala' según el tamaño en píxeles de tu imagen.
-# Si tu imagen mide 1000px y quieres que mida 100mm, la escala es 0.1
-if os.path.exists(archivo_entrada):
-    generar_stl_extruido(archivo_entrada, archivo_salida, altura_mm=4.0, escala=0.15)
-else:
-    print(f"No encuentro el archivo: {archivo_entrada}")
-
-    #C:\Users\jaqueline.tinoco\Documents\generador de contornos\stl.py
\ No newline at end of file
+if __name__ == '__main__':
+    archivo_entrada = r'ChatGPT Image 11 dic 2025, 11_43_56.png'
+    archivo_salida = 'modelo_3d.stl'
+
+    # Ajusta la 'escala' según el tamaño en píxeles de tu imagen.
+    # Si tu imagen mide 1000px y quieres que mida 100mm, la escala es 0.1
+    if os.path.exists(archivo_entrada):
+        generar_stl_extruido(archivo_entrada, archivo_salida, altura_mm=4.0, escala=0.15)
+    else:
+        print(f"No encuentro el archivo: {archivo_entrada}")
+
+    #C:\Users\jaqueline.tinoco\Documents\generador de contornos\stl.py
@@ -0,0 +1,84 @@
+import io
+import os
+import struct
+from contextlib import ExitStack
+
+import numpy as np
+from trimesh.triangles import normals as normales_triangulos
+
+from entrada_salida import abrir_salida
+
+# Mismo formato binario que trimesh: cabecera de 80 bytes + uint32 con el número de triángulos
+_STL_DTYPE = np.dtype([('normals', '<f4', (3,)), ('vertices', '<f4', (3, 3)), ('attributes', '<u2')])
+_TAM_CABECERA = 80
+
+
+class EscritorSTL:
+    """Escribe un STL binario pieza por pieza, sin juntar toda la placa en una malla.
+
+    El número de triángulos de la cabecera se deja en 0 y se corrige al cerrar,
+    así la memoria pico depende de la pieza más grande y no de la placa entera.
+    El destino puede ser una ruta o un flujo binario; si el flujo no permite
+    seek (un socket, un pipe) se arma en memoria y se copia al cerrar. Si se
+    sale por una excepción no queda nada escrito (la ruta se borra):
+
+        with EscritorSTL('placa.stl') as stl:
+            for vertices, caras in extruir_piezas(poligonos, altura_mm):
+                stl.agregar_malla(vertices, caras)
+    """
+
+    def __init__(self, ruta_salida_stl):
+        self.ruta_salida_stl = ruta_salida_stl
+        self.triangulos_escritos = 0
+        self._archivo = None
+        self._destino = None
+        self._pila = None
+
+    def __enter__(self):
+        self._pila = ExitStack()
+        self._destino = self._pila.enter_context(abrir_salida(self.ruta_salida_stl))
+        seekable = getattr(self._destino, 'seekable', lambda: False)()
+        self._archivo = self._destino if seekable else io.BytesIO()
+        self._inicio = self._archivo.tell()
+        self._archivo.write(bytes(_TAM_CABECERA))
+        self._archivo.write(struct.pack('<I', 0))
+        return self
+
+    def agregar_malla(self, vertices, caras):
+        """Escribe los triángulos de una pieza (vertices (N, 3), caras (M, 3))."""
+        triangulos = np.asarray(vertices, dtype=np.float64)[np.asarray(caras)]
+        normales, validas = normales_triangulos(triangulos)
+
+        empaquetado = np.zeros(len(triangulos), dtype=_STL_DTYPE)
+        # Las caras degeneradas quedan con normal (0, 0, 0), igual que en trimesh
+        empaquetado['normals'][validas] = normales
+        empaquetado['vertices'] = triangulos
+
+        self._archivo.write(empaquetado.tobytes())
+        self.triangulos_escritos += len(triangulos)
+
+    def __exit__(self, tipo_exc, exc, tb):
+        if tipo_exc is not None:
+            self._descartar()
+            return
+
+        # Parchear el contador de triángulos de la cabecera
+        final = self._archivo.tell()
+        self._archivo.seek(self._inicio + _TAM_CABECERA)
+        self._archivo.write(struct.pack('<I', self.triangulos_escritos))
+        self._archivo.seek(final)
+
+        if self._archivo is not self._destino:
+            self._destino.write(self._archivo.getvalue())
+        self._pila.close()
+        self._archivo = self._destino = self._pila = None
+
+    def _descartar(self):
+        # Si la extrusión falló no debe quedar un STL truncado con pinta de válido
+        if self._archivo is self._destino:
+            self._archivo.seek(self._inicio)
+            self._archivo.truncate()
+        self._pila.close()
+        self._archivo = self._destino = self._pila = None
+        if isinstance(self.ruta_salida_stl, (str, os.PathLike)):
+            os.remove(self.ruta_salida_stl)
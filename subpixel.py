@@ -0,0 +1,72 @@
+import numpy as np
+
+# Posiciones (en píxeles, a lo largo del gradiente) donde se busca el cruce del nivel
+_MUESTRAS = np.array([-1.0, -0.5, 0.0, 0.5, 1.0, 1.5], dtype=np.float32)
+
+
+def _bilineal(img, x, y):
+    """Valor interpolado de img (2D) en coordenadas reales x, y (bordes replicados)."""
+    alto, ancho = img.shape
+    x = np.clip(x, 0, ancho - 1)
+    y = np.clip(y, 0, alto - 1)
+    x0 = np.minimum(x.astype(np.int64), ancho - 2) if ancho > 1 else np.zeros(x.shape, np.int64)
+    y0 = np.minimum(y.astype(np.int64), alto - 2) if alto > 1 else np.zeros(y.shape, np.int64)
+    fx, fy = x - x0, y - y0
+    x1, y1 = np.minimum(x0 + 1, ancho - 1), np.minimum(y0 + 1, alto - 1)
+    arriba = img[y0, x0] * (1 - fx) + img[y0, x1] * fx
+    abajo = img[y1, x0] * (1 - fx) + img[y1, x1] * fx
+    return arriba * (1 - fy) + abajo * fy
+
+
+def refinar_contornos(contornos, suavizada, nivel):
+    """Lleva cada punto de los contornos al cruce sub-píxel de 'nivel' en la imagen suavizada.
+
+    findContours devuelve centros de píxel del borde de la binaria; el borde
+    real está donde la imagen suavizada (la misma que se binarizó) vale
+    'nivel'. Para cada punto se muestrea la imagen a lo largo del gradiente y
+    se interpola linealmente el cruce más cercano al medio píxel hacia afuera,
+    como en marching squares pero sin rehacer el trazado: el orden de los
+    puntos y la jerarquía de findContours no cambian.
+
+    Trabaja sobre todos los puntos de todos los contornos a la vez y devuelve
+    contornos float32 (N, 1, 2). Un punto sin cruce cerca (zona plana) se deja donde estaba.
+    """
+    if len(contornos) == 0:
+        return contornos
+
+    largos = [len(c) for c in contornos]
+    puntos = np.concatenate([c.reshape(-1, 2) for c in contornos]).astype(np.int64)
+    x, y = puntos[:, 0], puntos[:, 1]
+    alto, ancho = suavizada.shape
+
+    # Gradiente por diferencias centrales solo en los puntos del contorno (no en toda la imagen)
+    gx = (suavizada[y, np.minimum(x + 1, ancho - 1)].astype(np.float32)
+          - suavizada[y, np.maximum(x - 1, 0)]) * 0.5
+    gy = (suavizada[np.minimum(y + 1, alto - 1), x].astype(np.float32)
+          - suavizada[np.maximum(y - 1, 0), x]) * 0.5
+    norma = np.hypot(gx, gy)
+    plano = norma < 1e-3
+    norma[plano] = 1.0
+    nx, ny = gx / norma, gy / norma
+
+    # Perfil de intensidad a lo largo del gradiente: (puntos, muestras)
+    xs = x[:, None] + nx[:, None] * _MUESTRAS
+    ys = y[:, None] + ny[:, None] * _MUESTRAS
+    perfil = _bilineal(suavizada, xs, ys).astype(np.float32) - nivel
+
+    # Tramos donde el perfil cruza el nivel; nos quedamos con el más cercano a +0.5 px
+    cruza = (perfil[:, :-1] <= 0) & (perfil[:, 1:] > 0)
+    centros = (_MUESTRAS[:-1] + _MUESTRAS[1:]) * 0.5
+    distancia = np.where(cruza, np.abs(centros - 0.5), np.inf)
+    k = np.argmin(distancia, axis=1)
+    filas = np.arange(len(k))
+    valido = np.isfinite(distancia[filas, k]) & ~plano
+
+    a, b = perfil[filas, k], perfil[filas, k + 1]
+    t = np.divide(-a, b - a, out=np.zeros_like(a), where=b != a)
+    desplazamiento = np.where(valido, _MUESTRAS[k] + t * (_MUESTRAS[k + 1] - _MUESTRAS[k]), 0.0)
+
+    refinados = np.empty((len(puntos), 2), dtype=np.float32)
+    refinados[:, 0] = x + nx * desplazamiento
+    refinados[:, 1] = y + ny * desplazamiento
+    return [c.reshape(-1, 1, 2) for c in np.split(refinados, np.cumsum(largos)[:-1])]
@@ -0,0 +1,157 @@
+import re
+from contextlib import ExitStack
+
+import numpy as np
+
+from entrada_salida import abrir_salida, posicion_salida, descartar_salida
+
+# Quita ceros sobrantes de "12.500" -> "12.5" y "3.000" -> "3"
+# (sin \b: entre el último cero y la 'z' que cierra el path no hay frontera de palabra)
+_CEROS_SOBRANTES = re.compile(r'(\.\d*?)0+(?!\d)')
+
+
+def datos_path_relativos(puntos, decimales=2):
+    """Atributo 'd' compacto: M absoluto + 'l' relativos redondeados a 'decimales'.
+
+    Los deltas se calculan sobre las coordenadas YA redondeadas, así el error de
+    redondeo no se acumula a lo largo del contorno.
+    """
+    factor = 10 ** decimales
+    q = np.rint(np.asarray(puntos, dtype=np.float64).reshape(-1, 2) * factor).astype(np.int64)
+    deltas = np.diff(q, axis=0)
+
+    if decimales == 0:
+        formato = "%d,%d"
+        valores = [*q[0].tolist(), *deltas.ravel().tolist()]
+    else:
+        formato = f"%.{decimales}f,%.{decimales}f"
+        valores = [*(q[0] / factor).tolist(), *(deltas.ravel() / factor).tolist()]
+
+    plantilla = "M" + formato + " l" + " ".join([formato] * len(deltas)) + "z"
+    d = plantilla % tuple(valores)
+    if decimales:
+        d = _CEROS_SOBRANTES.sub(lambda m: '' if m.group(1) == '.' else m.group(1), d)
+    return d
+
+
+def _numero(valor, decimales):
+    texto = f"%.{decimales}f" % float(valor)
+    return _CEROS_SOBRANTES.sub(lambda m: '' if m.group(1) == '.' else m.group(1), texto) if decimales else texto
+
+
+def datos_path_arcos(vertices, bulges, decimales=2):
+    """Atributo 'd' de un contorno cerrado con arcos: 'l' para las rectas y 'a' para los bulges.
+
+    Mismo esquema que datos_path_relativos (deltas sobre coordenadas ya
+    redondeadas); el sentido de cada arco sale del signo del bulge.
+    """
+    from arcos import arco_de_bulge
+
+    factor = 10 ** decimales
+    q = np.rint(np.asarray(vertices, dtype=np.float64).reshape(-1, 2) * factor).astype(np.int64)
+    cerrado = np.vstack([q, q[:1]])
+    deltas = (np.diff(cerrado, axis=0) / factor).tolist()
+    numero = f"%.{decimales}f"
+    par = f"{numero},{numero}"
+
+    partes = ["M" + par % tuple((q[0] / factor).tolist())]
+    for k, bulge in enumerate(np.asarray(bulges, dtype=np.float64).tolist()):
+        if bulge:
+            radio, grande, positivo = arco_de_bulge(cerrado[k] / factor, cerrado[k + 1] / factor, bulge)
+            partes.append(f"a{numero % radio},{numero % radio} 0 {int(grande)},{int(positivo)} "
+                          + par % tuple(deltas[k]))
+        elif k < len(deltas) - 1:
+            # La última recta la cierra la 'z'
+            partes.append("l" + par % tuple(deltas[k]))
+    d = " ".join(partes)
+    if decimales:
+        d = _CEROS_SOBRANTES.sub(lambda m: '' if m.group(1) == '.' else m.group(1), d)
+    return d + "z"
+
+
+class EscritorSVG:
+    """Escribe cada <path> directo al disco en cuanto se produce, sin el árbol DOM de svgwrite.
+
+    La memoria no crece con el número de contornos: solo vive el path actual.
+    El destino puede ser una ruta o un flujo ya abierto (p.ej. io.BytesIO).
+    Si se sale por una excepción no queda nada escrito (la ruta se borra).
+    Se usa como context manager:
+
+        with EscritorSVG('salida.svg', ancho, alto, stroke='red') as svg:
+            for puntos in contornos:
+                svg.agregar_contorno(puntos)
+    """
+
+    def __init__(self, ruta_salida_svg, ancho, alto, stroke="black", stroke_width=1, decimales=2):
+        self.ruta_salida_svg = ruta_salida_svg
+        self.ancho = ancho
+        self.alto = alto
+        self.stroke = stroke
+        self.stroke_width = stroke_width
+        self.decimales = decimales
+        self.paths_escritos = 0
+        self._archivo = None
+        self._pila = None
+        self._inicio = None
+        self._grupo_abierto = False
+
+    def __enter__(self):
+        self._pila = ExitStack()
+        self._inicio = posicion_salida(self.ruta_salida_svg)
+        self._archivo = self._pila.enter_context(abrir_salida(self.ruta_salida_svg, texto=True))
+        self._archivo.write(
+            '<?xml version="1.0" encoding="utf-8" ?>\n'
+            f'<svg baseProfile="full" height="{self.alto}" version="1.1" width="{self.ancho}" '
+            'xmlns="http://www.w3.org/2000/svg" xmlns:ev="http://www.w3.org/2001/xml-events" '
+            'xmlns:xlink="http://www.w3.org/1999/xlink"><defs />'
+        )
+        self._grupo_abierto = False
+        return self
+
+    def _abrir_grupo(self, stroke, nombre=None):
+        atributo_id = f' id="{nombre}"' if nombre else ''
+        cierre = '</g>\n' if self._grupo_abierto else ''
+        self._archivo.write(f'{cierre}<g{atributo_id} fill="none" stroke="{stroke}" '
+                            f'stroke-width="{self.stroke_width}">\n')
+        self._grupo_abierto = True
+
+    def _en_grupo(self):
+        # El <g> por defecto se abre con el primer path: si antes llega nuevo_grupo, no queda un <g> vacío
+        if not self._grupo_abierto:
+            self._abrir_grupo(self.stroke)
+
+    def nuevo_grupo(self, stroke, nombre=None):
+        """Cierra el <g> actual (si hay) y abre otro con su propio color (una capa por grupo)."""
+        self._abrir_grupo(stroke, nombre)
+
+    def agregar_contorno(self, puntos):
+        """Escribe un contorno cerrado (N, 2) o (N, 1, 2). Ignora los de menos de 3 puntos."""
+        if len(puntos) <= 2:
+            return
+        self._en_grupo()
+        self._archivo.write(f'<path d="{datos_path_relativos(puntos, self.decimales)}" />\n')
+        self.paths_escritos += 1
+
+    def agregar_arcos(self, vertices, bulges):
+        """Escribe un contorno cerrado de rectas y arcos (ver arcos.ajustar_arcos)."""
+        if len(vertices) < 2:
+            return
+        self._en_grupo()
+        self._archivo.write(f'<path d="{datos_path_arcos(vertices, bulges, self.decimales)}" />\n')
+        self.paths_escritos += 1
+
+    def agregar_circulo(self, centro, radio):
+        """Escribe un <circle> (un contorno que resultó ser un círculo completo)."""
+        self._en_grupo()
+        self._archivo.write('<circle cx="%s" cy="%s" r="%s" />\n' % tuple(
+            _numero(v, self.decimales) for v in (*centro, radio)))
+        self.paths_escritos += 1
+
+    def __exit__(self, tipo_exc, exc, tb):
+        if tipo_exc is None:
+            self._archivo.write('</g></svg>\n' if self._grupo_abierto else '</svg>\n')
+        self._pila.close()
+        self._archivo = self._pila = None
+        if tipo_exc is not None:
+            # Cerrado con </svg> un documento a medias parecería válido: no debe quedar nada
+            descartar_salida(self.ruta_salida_svg, self._inicio)
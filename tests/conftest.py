@@ -0,0 +1,34 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+# Los módulos del proyecto viven en la raíz del repositorio, sin paquete
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# Escaneo real incluido en el repositorio
+MUESTRA = os.path.join(RAIZ, 'ChatGPT Image 11 dic 2025, 11_29_31.png')
+
+
+@pytest.fixture
+def muestra():
+    """Ruta del escaneo de muestra (se salta la prueba si no está)."""
+    if not os.path.exists(MUESTRA):
+        pytest.skip("sin la imagen de muestra")
+    return MUESTRA
+
+
+@pytest.fixture
+def imagen_piezas():
+    """Placa blanca con piezas negras, algunas con agujero (BGR, como la daría cv2.imread)."""
+    img = np.full((600, 800, 3), 255, dtype=np.uint8)
+    cv2.rectangle(img, (40, 40), (240, 200), (0, 0, 0), -1)
+    cv2.circle(img, (140, 120), 40, (255, 255, 255), -1)
+    cv2.circle(img, (450, 150), 90, (0, 0, 0), -1)
+    cv2.ellipse(img, (650, 420), (110, 60), 30, 0, 360, (0, 0, 0), -1)
+    cv2.fillPoly(img, [np.array([[100, 350], [300, 330], [260, 540], [80, 500]])], (0, 0, 0))
+    cv2.rectangle(img, (150, 400), (200, 460), (255, 255, 255), -1)
+    return img
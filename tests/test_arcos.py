@@ -0,0 +1,23 @@
+import contextlib
+import io
+import os
+
+import ezdxf
+import pytest
+
+from dxf import imagen_a_dxf
+
+
+def _vertices(ruta):
+    msp = ezdxf.readfile(str(ruta)).modelspace()
+    return sum(len(e) for e in msp.query('LWPOLYLINE')) + len(msp.query('CIRCLE'))
+
+
+@pytest.mark.parametrize('tolerancia', [0.5, 1.0])
+def test_arcos_no_agrandan_un_escaneo_real(tmp_path, muestra, tolerancia):
+    with contextlib.redirect_stdout(io.StringIO()):
+        imagen_a_dxf(muestra, tmp_path / 'polilineas.dxf', motor='directo')
+        imagen_a_dxf(muestra, tmp_path / 'arcos.dxf', motor='directo', tolerancia_arcos=tolerancia)
+
+    assert _vertices(tmp_path / 'arcos.dxf') <= _vertices(tmp_path / 'polilineas.dxf')
+    assert os.path.getsize(tmp_path / 'arcos.dxf') <= os.path.getsize(tmp_path / 'polilineas.dxf')
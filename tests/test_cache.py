@@ -0,0 +1,32 @@
+import contextlib
+import io
+
+import cv2
+import numpy as np
+
+from cache import CacheResultados
+
+
+def _convertir(cache, *argumentos, **opciones):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return cache.convertir(*argumentos, **opciones)
+
+
+def test_no_guarda_un_archivo_viejo_del_destino(tmp_path, imagen_piezas):
+    cache = CacheResultados(str(tmp_path / 'cache'))
+    blanca, pieza = tmp_path / 'blanca.png', tmp_path / 'pieza.png'
+    cv2.imwrite(str(blanca), np.full((100, 100), 255, dtype=np.uint8))
+    cv2.imwrite(str(pieza), imagen_piezas)
+    destino = tmp_path / 'salida.dxf'
+    destino.write_text('de otra corrida')
+
+    # Sin contornos no se exporta nada: ni se cachea lo que había ni se informa éxito
+    assert _convertir(cache, str(blanca), ruta_dxf=str(destino)) is False
+    assert _convertir(cache, str(blanca), ruta_dxf=str(destino)) is False
+    assert destino.read_text() == 'de otra corrida'
+
+    assert _convertir(cache, str(pieza), ruta_dxf=str(destino)) is True
+    escrito = destino.read_bytes()
+    otro = tmp_path / 'otra.dxf'
+    assert _convertir(cache, str(pieza), ruta_dxf=str(otro)) is True
+    assert otro.read_bytes() == escrito
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from capas import Banda, dxf_por_capas, generar_por_capas, svg_por_capas
+
+
+def test_sin_bandas(tmp_path):
+    with pytest.raises(ValueError, match="al menos una banda"):
+        generar_por_capas(tmp_path / 'no_hace_falta.png', [], ruta_dxf=tmp_path / 'capas.dxf')
+    with pytest.raises(ValueError, match="al menos una banda"):
+        dxf_por_capas([], tmp_path / 'capas.dxf', motor='directo')
+    assert not (tmp_path / 'capas.dxf').exists()
+
+
+@pytest.mark.parametrize('motor', ['ezdxf', 'directo'])
+def test_nombres_repetidos(tmp_path, motor):
+    cuadrado = [np.array([[[0, 0]], [[10, 0]], [[10, 10]], [[0, 10]]], dtype=np.int32)]
+    capas = [(Banda('CORTE', 1, 0, 90), cuadrado), (Banda('CORTE', 5, 91, 200), cuadrado)]
+    with pytest.raises(ValueError, match="'CORTE'"):
+        dxf_por_capas(capas, tmp_path / 'capas.dxf', motor=motor)
+    with pytest.raises(ValueError, match="'CORTE'"):
+        svg_por_capas(capas, tmp_path / 'capas.svg', 100, 100)
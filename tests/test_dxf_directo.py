@@ -0,0 +1,50 @@
+import io
+
+import ezdxf
+import numpy as np
+import pytest
+
+from dxf_directo import EscritorDXF
+from limpiodxf import dxf_desde_trazado
+from trazado import Trazado
+
+
+def _polilineas(ruta):
+    doc = ezdxf.readfile(str(ruta))
+    return doc, list(doc.modelspace().query('LWPOLYLINE'))
+
+
+def test_escritor_dxf_se_relee_igual_que_ezdxf(tmp_path, imagen_piezas):
+    trazado = Trazado.desde_archivo(imagen_piezas)
+    dxf_desde_trazado(trazado, tmp_path / 'ezdxf.dxf', motor='ezdxf')
+    dxf_desde_trazado(trazado, tmp_path / 'directo.dxf', motor='directo')
+
+    _, esperadas = _polilineas(tmp_path / 'ezdxf.dxf')
+    doc, leidas = _polilineas(tmp_path / 'directo.dxf')
+
+    assert not doc.audit().has_errors
+    assert len(esperadas) > 0
+    assert len(leidas) == len(esperadas)
+    for directa, referencia in zip(leidas, esperadas):
+        assert directa.closed
+        assert directa.dxf.layer == referencia.dxf.layer == 'CORTE'
+        np.testing.assert_array_equal(np.array(directa.get_points('xy')), np.array(referencia.get_points('xy')))
+
+
+def test_falla_a_mitad_no_deja_dxf(tmp_path):
+    ruta = tmp_path / 'corte.dxf'
+    with pytest.raises(RuntimeError):
+        with EscritorDXF(ruta) as dxf:
+            dxf.agregar_polilinea(np.array([[0, 0], [10, 0], [10, 10]]))
+            raise RuntimeError("falló la exportación")
+    assert not ruta.exists()
+
+
+def test_falla_a_mitad_no_escribe_en_el_flujo():
+    flujo = io.BytesIO(b'previo')
+    flujo.seek(0, io.SEEK_END)
+    with pytest.raises(RuntimeError):
+        with EscritorDXF(flujo) as dxf:
+            dxf.agregar_polilinea(np.array([[0, 0], [10, 0], [10, 10]]))
+            raise RuntimeError("falló la exportación")
+    assert flujo.getvalue() == b'previo'
@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+
+import cv2
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Ejecuta generador.py como 'python generador.py ...' y deja en stderr los módulos pesados que quedaron cargados
+_SONDA = ("import sys, json, runpy; sys.argv = ['generador.py'] + sys.argv[1:]\n"
+          "try:\n    runpy.run_path('generador.py', run_name='__main__')\n"
+          "except SystemExit as e:\n    codigo = e.code\n"
+          "print(json.dumps([m for m in ('trimesh', 'shapely', 'matplotlib') if m in sys.modules]), file=sys.stderr)\n"
+          "sys.exit(codigo)")
+
+
+def _generador(*argumentos):
+    return subprocess.run([sys.executable, '-c', _SONDA, *map(str, argumentos)], cwd=RAIZ,
+                          capture_output=True, text=True)
+
+
+def test_dxf_no_importa_trimesh_shapely_ni_matplotlib(tmp_path, imagen_piezas):
+    entrada, salida = tmp_path / 'pieza.png', tmp_path / 'pieza.dxf'
+    cv2.imwrite(str(entrada), imagen_piezas)
+
+    proceso = _generador('dxf', entrada, salida)
+
+    assert proceso.returncode == 0, proceso.stderr
+    assert salida.exists()
+    assert json.loads(proceso.stderr.strip().splitlines()[-1]) == []
+
+
+def test_salida_vieja_no_cuenta_como_exito(tmp_path):
+    entrada, salida = tmp_path / 'blanca.png', tmp_path / 'blanca.dxf'
+    cv2.imwrite(str(entrada), np.full((100, 100), 255, dtype=np.uint8))
+    salida.write_text('de una corrida anterior')
+    os.utime(salida, ns=(0, 0))
+
+    # Sin contornos no se escribe nada: el código de salida no debe fiarse del archivo que ya estaba
+    proceso = _generador('dxf', entrada, salida)
+
+    assert proceso.returncode == 1
+    assert salida.read_text() == 'de una corrida anterior'
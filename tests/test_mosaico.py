@@ -0,0 +1,37 @@
+import contextlib
+import io
+
+import ezdxf
+import numpy as np
+import pytest
+
+from limpiodxf import generar_dxf_limpio
+from mosaico import TrazadoMosaico, generar_dxf_por_franjas
+from trazado import Trazado
+
+
+def test_franjas_de_16_bits_igual_que_imagen_completa(imagen_piezas):
+    gris = imagen_piezas[:, :, 0].astype(np.uint16) * 180 + 900
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        completo = Trazado(gris)
+        por_franjas = TrazadoMosaico(gris, alto_franja=128)
+        validos, validos_franjas = completo.indices_validos, por_franjas.indices_validos
+
+    assert len(validos_franjas) == len(validos) > 0
+    np.testing.assert_array_equal(np.sort(por_franjas.indice.area[validos_franjas]),
+                                  np.sort(completo.indice.area[validos]))
+
+
+
+def test_desde_ruta_igual_que_generar_dxf_limpio(tmp_path, muestra):
+    # Desde una ruta la decodificación tiene que ser la de Trazado (color + cvtColor, no IMREAD_GRAYSCALE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        generar_dxf_limpio(muestra, tmp_path / 'limpio.dxf', motor='directo')
+        generar_dxf_por_franjas(muestra, tmp_path / 'franjas.dxf', alto_franja=4096)
+
+    def polilineas(ruta):
+        msp = ezdxf.readfile(str(ruta)).modelspace()
+        return sorted(np.array(e.get_points('xy')).tobytes() for e in msp.query('LWPOLYLINE'))
+
+    assert polilineas(tmp_path / 'franjas.dxf') == polilineas(tmp_path / 'limpio.dxf')
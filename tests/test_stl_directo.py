@@ -0,0 +1,38 @@
+import io
+
+import numpy as np
+import pytest
+
+from stl_directo import EscritorSTL
+
+_VERTICES = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.float64)
+_CARAS = np.array([[0, 1, 2]])
+
+
+def test_falla_a_mitad_no_deja_archivo(tmp_path):
+    ruta = tmp_path / 'placa.stl'
+    with pytest.raises(RuntimeError):
+        with EscritorSTL(ruta) as stl:
+            stl.agregar_malla(_VERTICES, _CARAS)
+            raise RuntimeError("falló la extrusión")
+    assert not ruta.exists()
+
+
+def test_falla_a_mitad_no_escribe_en_el_flujo():
+    flujo = io.BytesIO(b'previo')
+    flujo.seek(0, io.SEEK_END)
+    with pytest.raises(RuntimeError):
+        with EscritorSTL(flujo) as stl:
+            stl.agregar_malla(_VERTICES, _CARAS)
+            raise RuntimeError("falló la extrusión")
+    assert flujo.getvalue() == b'previo'
+
+
+def test_cabecera_con_el_numero_de_triangulos(tmp_path):
+    ruta = tmp_path / 'placa.stl'
+    with EscritorSTL(ruta) as stl:
+        stl.agregar_malla(_VERTICES, _CARAS)
+        stl.agregar_malla(_VERTICES + 2, _CARAS)
+    datos = ruta.read_bytes()
+    assert int.from_bytes(datos[80:84], 'little') == 2
+    assert len(datos) == 84 + 2 * 50
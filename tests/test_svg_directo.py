@@ -0,0 +1,56 @@
+import io
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pytest
+
+from svg_directo import EscritorSVG, datos_path_arcos, datos_path_relativos
+
+
+def test_datos_path_relativos_sin_ceros_sobrantes():
+    puntos = np.array([[10.0, 20.5], [12.25, 20.5], [14.0, 17.5], [10.0, 17.0]])
+    assert datos_path_relativos(puntos, decimales=2) == "M10,20.5 l2.25,0 1.75,-3 -4,-0.5z"
+
+
+def test_ultima_coordenada_antes_de_la_z():
+    # El último delta va pegado a la 'z': también pierde los ceros
+    d = datos_path_relativos(np.array([[0, 0], [17, 0], [17, -17]]), decimales=2)
+    assert d == "M0,0 l17,0 0,-17z"
+    assert datos_path_relativos(np.array([[0, 0], [5, 5], [0, 100]]), decimales=3).endswith(" -5,95z")
+
+
+def test_datos_path_arcos_sin_ceros_sobrantes():
+    d = datos_path_arcos(np.array([[0, 0], [10, 0], [10, 10]]), [0, 0, 0], decimales=2)
+    assert d == "M0,0 l10,0 l0,10z"
+
+
+def test_capas_sin_grupo_vacio():
+    salida = io.StringIO()
+    cuadrado = np.array([[0, 0], [10, 0], [10, 10], [0, 10]])
+    with EscritorSVG(salida, 100, 100) as svg:
+        for nombre, color in (('CORTE', 'red'), ('GRABADO', 'blue')):
+            svg.nuevo_grupo(color, nombre)
+            svg.agregar_contorno(cuadrado)
+
+    grupos = ET.fromstring(salida.getvalue()).findall('{http://www.w3.org/2000/svg}g')
+    assert [g.get('id') for g in grupos] == ['CORTE', 'GRABADO']
+    assert all(len(g) == 1 for g in grupos)
+
+
+def test_falla_a_mitad_no_deja_svg(tmp_path):
+    ruta = tmp_path / 'corte.svg'
+    with pytest.raises(RuntimeError):
+        with EscritorSVG(ruta, 100, 100) as svg:
+            svg.agregar_contorno(np.array([[0, 0], [10, 0], [10, 10]]))
+            raise RuntimeError("falló la exportación")
+    assert not ruta.exists()
+
+
+def test_falla_a_mitad_no_escribe_en_el_flujo():
+    flujo = io.StringIO('previo')
+    flujo.seek(0, io.SEEK_END)
+    with pytest.raises(RuntimeError):
+        with EscritorSVG(flujo, 100, 100) as svg:
+            svg.agregar_contorno(np.array([[0, 0], [10, 0], [10, 10]]))
+            raise RuntimeError("falló la exportación")
+    assert flujo.getvalue() == 'previo'
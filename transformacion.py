@@ -0,0 +1,40 @@
+import numpy as np
+
+
+def matriz_transformacion(escala=1.0, invertir_y=True, rotacion_grados=0.0):
+    """Matriz 2x2 que aplica escala, inversión de Y (imagen -> CAD) y rotación, en ese orden."""
+    signo_y = -1.0 if invertir_y else 1.0
+    matriz = np.diag([escala, escala * signo_y])
+
+    if rotacion_grados:
+        theta = np.radians(rotacion_grados)
+        c, s = np.cos(theta), np.sin(theta)
+        matriz = np.array([[c, -s], [s, c]]) @ matriz
+
+    return matriz
+
+
+def transformar_contornos(contornos, escala=1.0, invertir_y=True, desplazamiento=(0.0, 0.0),
+                          rotacion_grados=0.0):
+    """Transforma TODOS los contornos de una vez sobre un único arreglo de puntos.
+
+    Acepta los contornos tal como salen de OpenCV (N, 1, 2) o ya planos (N, 2) y
+    devuelve una lista de arreglos float64 (N, 2) listos para los escritores
+    DXF/SVG/STL: ezdxf, svg y shapely los aceptan directamente.
+    """
+    if len(contornos) == 0:
+        return []
+
+    longitudes = np.fromiter((len(c) for c in contornos), dtype=np.intp, count=len(contornos))
+    puntos = np.concatenate([np.asarray(c).reshape(-1, 2) for c in contornos]).astype(np.float64)
+
+    if rotacion_grados:
+        puntos = puntos @ matriz_transformacion(escala, invertir_y, rotacion_grados).T
+    else:
+        # Sin rotación la matriz es diagonal: basta un producto elemento a elemento
+        puntos *= np.array([escala, -escala if invertir_y else escala])
+
+    if desplazamiento[0] or desplazamiento[1]:
+        puntos += np.asarray(desplazamiento, dtype=np.float64)
+
+    return np.split(puntos, np.cumsum(longitudes)[:-1])
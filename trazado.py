@@ -0,0 +1,181 @@
+import cv2
+import numpy as np
+from functools import cached_property
+
+from metricas import IndiceContornos
+from entrada_salida import cargar_imagen
+from contenedor import es_contenedor, cargar_contornos
+from instrumentacion import tramo, contar
+
+
+class Trazado:
+    """Traza una imagen UNA sola vez y guarda cada etapa para todos los exportadores.
+
+    La lectura, el blur, la binarización Otsu y el findContours(RETR_TREE) se
+    hacen en el primer acceso y se reutilizan después, así que un mismo pedido
+    puede sacar DXF, SVG y STL sin volver a procesar la imagen.
+
+    Con subpixel=True los contornos salen en float32, refinados sobre el blur
+    (ver subpixel.refinar_contornos), con la misma jerarquía y los mismos filtros.
+    """
+
+    def __init__(self, img, kernel_blur=(7, 7), area_minima=50, ratio_doble_linea=0.85, subpixel=False):
+        self._img = img
+        self.alto, self.ancho = img.shape[:2]
+        self.kernel_blur = kernel_blur
+        self.area_minima = area_minima
+        self.ratio_doble_linea = ratio_doble_linea
+        self.subpixel = subpixel
+        self._suavizada = None
+        self._aproximados = {}
+
+    @classmethod
+    def desde_archivo(cls, ruta_imagen_entrada, **parametros):
+        """Lee la imagen (ruta, .npy, bytes codificados, flujo binario o arreglo). Devuelve None si no se puede cargar.
+
+        Un contenedor .contornos (ver contenedor.py) se abre con mmap y se
+        usa tal cual, sin volver a trazar.
+        """
+        if es_contenedor(ruta_imagen_entrada):
+            with tramo('trazado.cargar_contornos'):
+                return cargar_contornos(ruta_imagen_entrada).trazado(**parametros)
+
+        with tramo('trazado.decodificar'):
+            img = cargar_imagen(ruta_imagen_entrada)
+        if img is None:
+            print("Error: No se carga la imagen.")
+            return None
+        return cls(img, **parametros)
+
+    @classmethod
+    def desde_bytes(cls, datos, **parametros):
+        """Decodifica una imagen que ya está en memoria (PNG, JPG...) con cv2.imdecode."""
+        with tramo('trazado.decodificar', bytes=len(datos)):
+            img = cargar_imagen(memoryview(datos))
+        if img is None:
+            print("Error: No se carga la imagen.")
+            return None
+        return cls(img, **parametros)
+
+    @classmethod
+    def desde_contornos(cls, contornos, jerarquia, alto, ancho, **parametros):
+        """Trazado ya resuelto (p.ej. leído de la caché): no hace falta la imagen."""
+        trazado = cls.__new__(cls)
+        Trazado.__init__(trazado, np.empty((alto, ancho, 0), dtype=np.uint8), **parametros)
+        trazado._img = None
+        trazado.__dict__['_contornos_y_jerarquia'] = (contornos, jerarquia)
+        return trazado
+
+    @classmethod
+    def desde_binaria(cls, binaria, **parametros):
+        """Trazado de una máscara ya binarizada (objeto en 255): se salta el blur y el umbral."""
+        trazado = cls.__new__(cls)
+        Trazado.__init__(trazado, np.empty((*binaria.shape[:2], 0), dtype=np.uint8), **parametros)
+        trazado._img = None
+        trazado.__dict__['binaria'] = binaria
+        return trazado
+
+    @cached_property
+    def binaria(self):
+        # 1. Preprocesamiento (Binarización invertida: objeto blanco, fondo negro)
+        with tramo('trazado.blur', ancho=self.ancho, alto=self.alto):
+            # Un arreglo en gris (2D) se usa tal cual
+            gray = self._img if self._img.ndim == 2 else cv2.cvtColor(self._img, cv2.COLOR_BGR2GRAY)
+            if gray.dtype != np.uint8:
+                # Buffers crudos de 10-16 bits (o float): Otsu y findContours trabajan en 8 bits
+                gray = cv2.normalize(gray, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+            blurred = cv2.GaussianBlur(gray, self.kernel_blur, 0)
+        with tramo('trazado.umbral'):
+            umbral, thresh = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+
+        # Ya no necesitamos la imagen a color, liberamos la memoria
+        self._img = None
+        if self.subpixel:
+            # El refinamiento sub-píxel busca el borde en el mismo blur que se binarizó
+            self._suavizada, self._umbral = blurred, umbral
+        return thresh
+
+    @cached_property
+    def _contornos_y_jerarquia(self):
+        # 2. Encontrar contornos CON jerarquía
+        binaria = self.binaria
+        # En modo sub-píxel cada punto se refina por separado: no se comprimen los tramos rectos
+        metodo = cv2.CHAIN_APPROX_NONE if self.subpixel else cv2.CHAIN_APPROX_SIMPLE
+        with tramo('trazado.contornos'):
+            contours, hierarchy = cv2.findContours(binaria, cv2.RETR_TREE, metodo)
+        print(f"Contornos brutos detectados: {len(contours)}")
+        contar('trazado.contornos_brutos', len(contours))
+
+        if self._suavizada is not None:
+            from subpixel import refinar_contornos
+            with tramo('trazado.subpixel', puntos=sum(len(c) for c in contours)):
+                # Binaria = blur <= umbral, así que en el blur sin redondear el borde está a medio nivel
+                contours = refinar_contornos(contours, self._suavizada, self._umbral + 0.5)
+            self._suavizada = None
+
+        if hierarchy is None:
+            return contours, None
+
+        # La jerarquía viene en formato: [Next, Previous, First_Child, Parent]
+        return contours, hierarchy[0]
+
+    @property
+    def contornos(self):
+        return self._contornos_y_jerarquia[0]
+
+    @property
+    def jerarquia(self):
+        return self._contornos_y_jerarquia[1]
+
+    @cached_property
+    def indice(self):
+        """Área, perímetro, bbox y profundidad de cada contorno, calculados una sola vez."""
+        return IndiceContornos(self.contornos, self.jerarquia)
+
+    @cached_property
+    def indices_validos(self):
+        """Índices de los contornos que sobreviven al filtro anti-dobles líneas."""
+        if self.jerarquia is None:
+            return []
+
+        with tramo('trazado.filtrar'):
+            indice = self.indice
+
+            # Filtro 1: Eliminar ruido minúsculo
+            # Filtro 2: Si el hijo es casi igual al padre (>85%), es basura/doble línea
+            grandes = indice.area >= self.area_minima
+            dobles = indice.es_doble_linea(self.ratio_doble_linea)
+            validos = np.flatnonzero(grandes & ~dobles).tolist()
+
+        print(f"Contornos limpios finales: {len(validos)}")
+        contar('trazado.descartados_area', int((~grandes).sum()))
+        contar('trazado.descartados_doble_linea', int((grandes & dobles).sum()))
+        return validos
+
+    @property
+    def contornos_validos(self):
+        return [self.contornos[i] for i in self.indices_validos]
+
+    def aproximado(self, i, factor_epsilon=0.001):
+        """approxPolyDP del contorno i, calculado una vez por (índice, factor)."""
+        clave = (i, factor_epsilon)
+        approx = self._aproximados.get(clave)
+        if approx is None:
+            epsilon = factor_epsilon * self.indice.perimetro[i]
+            approx = cv2.approxPolyDP(self.contornos[i], epsilon, True)
+            self._aproximados[clave] = approx
+        return approx
+
+    def exportar(self, ruta_dxf=None, ruta_svg=None, ruta_stl=None, altura_mm=4.0, escala=0.1,
+                 motor_dxf='ezdxf', motor_svg='svgwrite', motor_stl='trimesh'):
+        """Genera en una sola llamada todos los formatos pedidos desde el mismo trazado."""
+        # Importamos aquí para que un pedido de solo DXF no cargue trimesh/shapely
+        if ruta_dxf:
+            from limpiodxf import dxf_desde_trazado
+            dxf_desde_trazado(self, ruta_dxf, motor=motor_dxf)
+        if ruta_svg:
+            from limpieza import svg_desde_trazado
+            svg_desde_trazado(self, ruta_svg, motor=motor_svg)
+        if ruta_stl:
+            from stl import stl_desde_trazado
+            stl_desde_trazado(self, ruta_stl, altura_mm=altura_mm, escala=escala, motor=motor_stl)
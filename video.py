@@ -0,0 +1,198 @@
+import argparse
+import contextlib
+import io
+import os
+import time
+
+import cv2
+import numpy as np
+
+from trazado import Trazado
+from instrumentacion import tramo, contar
+
+# Cada cuántos segundos se imprime el ritmo sostenido
+INTERVALO_REPORTE_S = 2.0
+# Dos piezas completas de cuadros distintos son "la misma" si sus áreas difieren menos que esto
+TOLERANCIA_AREA = 0.05
+
+
+def _areas_piezas_completas(trazado):
+    """Áreas (ordenadas) de las piezas exteriores válidas que no tocan el borde del cuadro."""
+    indice = trazado.indice
+    validos = np.asarray(trazado.indices_validos, dtype=np.int64)
+    if not len(validos):
+        return np.empty(0)
+    x, y, ancho, alto = indice.bbox[validos].T
+    completa = ((indice.padre[validos] == -1) & (x > 0) & (y > 0)
+                & (x + ancho < trazado.ancho) & (y + alto < trazado.alto))
+    return np.sort(indice.area[validos[completa]])
+
+
+def _contar_nuevas(areas, anteriores):
+    """Cuántas de 'areas' no tienen pareja (misma área a TOLERANCIA_AREA) en 'anteriores'."""
+    libres = list(anteriores)
+    nuevas = 0
+    for area in areas.tolist():
+        pareja = next((k for k, a in enumerate(libres) if abs(a - area) <= TOLERANCIA_AREA * area), None)
+        if pareja is None:
+            nuevas += 1
+        else:
+            del libres[pareja]
+    return nuevas
+
+
+def abrir_fuente(fuente):
+    """cv2.VideoCapture de un archivo de video o de un dispositivo ('0', '1'... o un int)."""
+    if isinstance(fuente, str) and fuente.isdigit():
+        fuente = int(fuente)
+    captura = cv2.VideoCapture(fuente)
+    if not captura.isOpened():
+        return None
+    return captura
+
+
+class TrazadorVideo:
+    """Binariza cada cuadro en buffers reutilizados y solo traza los que cambiaron.
+
+    La máscara de cada cuadro se compara con la del último cuadro TRAZADO: si
+    cambió menos de 'umbral_cambio' (fracción de píxeles) se reutilizan sus
+    contornos sin volver a llamar a findContours. Los buffers (cuadro, gris,
+    blur, máscara, diferencia) se asignan con el primer cuadro y se reescriben
+    en todos los demás con dst=, así que el bucle no pide memoria nueva.
+
+    Tras cada trazado, 'nuevas' cuenta las piezas completas (sin tocar el
+    borde) que no estaban en el trazado anterior, comparando áreas: una pieza
+    que avanza por la cinta conserva su área y no vuelve a contar.
+    """
+
+    def __init__(self, umbral_cambio=0.01, kernel_blur=(7, 7), **parametros_trazado):
+        self.umbral_cambio = umbral_cambio
+        self.kernel_blur = kernel_blur
+        self.parametros_trazado = parametros_trazado
+        self.cuadro = None
+        self.trazado = None
+        self.nuevas = 0
+        self._areas = np.empty(0)
+        self._gris = self._suave = self._mascara = self._referencia = self._diferencia = None
+
+    def _buffers(self, cuadro):
+        alto, ancho = cuadro.shape[:2]
+        if self._gris is None or self._gris.shape != (alto, ancho):
+            self._gris, self._suave, self._mascara, self._referencia, self._diferencia = (
+                np.empty((alto, ancho), dtype=np.uint8) for _ in range(5))
+            self.trazado = None
+
+    def leer(self, captura):
+        """Siguiente cuadro en el buffer reutilizado (None al terminar el video)."""
+        ok, cuadro = captura.read(self.cuadro)
+        if not ok:
+            return None
+        self.cuadro = cuadro
+        return cuadro
+
+    def procesar(self, cuadro):
+        """Binariza el cuadro; devuelve True si cambió lo suficiente y se volvió a trazar."""
+        self._buffers(cuadro)
+        with tramo('video.binarizar'):
+            gris = cuadro if cuadro.ndim == 2 else cv2.cvtColor(cuadro, cv2.COLOR_BGR2GRAY, dst=self._gris)
+            cv2.GaussianBlur(gris, self.kernel_blur, 0, dst=self._suave)
+            cv2.threshold(self._suave, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU, dst=self._mascara)
+
+        if self.trazado is not None:
+            cv2.absdiff(self._mascara, self._referencia, dst=self._diferencia)
+            cambio = cv2.countNonZero(self._diferencia) / self._mascara.size
+            if cambio < self.umbral_cambio:
+                contar('video.cuadros_reutilizados')
+                return False
+
+        # La máscara pasa a ser la referencia; el Trazado la usa directamente
+        self._mascara, self._referencia = self._referencia, self._mascara
+        with tramo('video.trazar'), contextlib.redirect_stdout(io.StringIO()):
+            self.trazado = Trazado.desde_binaria(self._referencia, kernel_blur=self.kernel_blur,
+                                                 **self.parametros_trazado)
+            areas = _areas_piezas_completas(self.trazado)
+        self.nuevas = _contar_nuevas(areas, self._areas)
+        self._areas = areas
+        contar('video.cuadros_trazados')
+        return True
+
+
+def trazar_video(fuente, carpeta_salida, formatos=('dxf',), umbral_cambio=0.01, max_cuadros=None,
+                 motor='directo', decimales=2):
+    """Traza un video o cámara y escribe un DXF/SVG por cada cuadro con piezas nuevas (ver TrazadorVideo).
+
+    Los archivos se llaman cuadro_000123.dxf (número del cuadro). Devuelve un
+    resumen con cuadros leídos, trazados, exportados y el ritmo sostenido (fps).
+    Con una cámara corre hasta Ctrl+C o hasta 'max_cuadros'. motor='directo'
+    usa los escritores en streaming; cualquier otro valor, ezdxf/svgwrite.
+    """
+    from limpiodxf import dxf_desde_trazado
+    from limpieza import svg_desde_trazado
+
+    captura = abrir_fuente(fuente)
+    if captura is None:
+        print(f"Error: No se puede abrir la fuente de video: {fuente}")
+        return None
+    os.makedirs(carpeta_salida, exist_ok=True)
+    print(f"Trazando video: {fuente}...")
+
+    trazador = TrazadorVideo(umbral_cambio)
+    leidos = trazados = exportados = 0
+    inicio = ultimo_reporte = time.perf_counter()
+    try:
+        while max_cuadros is None or leidos < max_cuadros:
+            cuadro = trazador.leer(captura)
+            if cuadro is None:
+                break
+            leidos += 1
+
+            if trazador.procesar(cuadro):
+                trazados += 1
+                # Solo se exporta si entró alguna pieza (una pieza que avanza también "cambia")
+                if trazador.nuevas:
+                    base = os.path.join(carpeta_salida, f"cuadro_{leidos - 1:06d}")
+                    with tramo('video.exportar'), contextlib.redirect_stdout(io.StringIO()):
+                        if 'dxf' in formatos:
+                            dxf_desde_trazado(trazador.trazado, base + '.dxf',
+                                              motor='directo' if motor == 'directo' else 'ezdxf')
+                        if 'svg' in formatos:
+                            svg_desde_trazado(trazador.trazado, base + '.svg', decimales=decimales,
+                                              motor='directo' if motor == 'directo' else 'svgwrite')
+                    exportados += 1
+
+            ahora = time.perf_counter()
+            if ahora - ultimo_reporte >= INTERVALO_REPORTE_S:
+                print(f"  {leidos} cuadros, {leidos / (ahora - inicio):.1f} fps, "
+                      f"{trazados} trazados, {exportados} exportados")
+                ultimo_reporte = ahora
+    except KeyboardInterrupt:
+        pass
+    finally:
+        captura.release()
+
+    duracion = time.perf_counter() - inicio
+    resumen = {
+        'cuadros': leidos,
+        'trazados': trazados,
+        'reutilizados': leidos - trazados,
+        'exportados': exportados,
+        'segundos': round(duracion, 3),
+        'fps': round(leidos / duracion, 1) if duracion else 0.0,
+    }
+    print(f"¡Listo! {leidos} cuadros a {resumen['fps']} fps: {trazados} trazados, "
+          f"{exportados} exportados en: {carpeta_salida}")
+    return resumen
+
+
+# --- Ejecución ---
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Traza piezas desde un video o una cámara (índice de dispositivo)")
+    parser.add_argument('fuente', help="Archivo de video o índice de la cámara (0, 1...)")
+    parser.add_argument('carpeta', help="Carpeta donde dejar un DXF/SVG por cuadro con piezas nuevas")
+    parser.add_argument('--formatos', nargs='+', choices=['dxf', 'svg'], default=['dxf'])
+    parser.add_argument('--cambio', type=float, default=0.01,
+                        help="Fracción de píxeles de la máscara que debe cambiar para volver a trazar")
+    parser.add_argument('--max-cuadros', type=int, default=None)
+    args = parser.parse_args()
+
+    trazar_video(args.fuente, args.carpeta, tuple(args.formatos), args.cambio, args.max_cuadros)